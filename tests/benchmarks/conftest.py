@@ -0,0 +1,207 @@
+"""
+基准测试套件
+
+    pytest tests/benchmarks --benchmark-only                        # 与基线比较，超过阈值的测试失败
+    pytest tests/benchmarks --benchmark-only --bench-save-baseline  # 记录新的基线
+    pytest tests/benchmarks --benchmark-only --bench-large          # 加上 10 万和 100 万条目的目录
+
+基线按测试保存耗时中位数和每条目内存，文件默认在 .benchmarks/ 下，只对记录它的机器有意义
+"""
+import json
+import os
+import random
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+import pytest
+
+FLAT_SIZES = {"1k": 1_000, "100k": 100_000, "1M": 1_000_000}
+LARGE_SIZES = ("100k", "1M")
+# 每 DIR_EVERY 个条目中有一个是目录
+DIR_EVERY = 20
+EXTENSIONS = (".txt", ".py", ".png", ".log", ".tar.gz", "")
+# 宽树：每个目录 TREE_FANOUT 个子目录、TREE_FILES 个文件，共 TREE_DEPTH 层
+TREE_FANOUT = 4
+TREE_DEPTH = 5
+TREE_FILES = 8
+# 深树：一条 DEEP_LEVELS 层的目录链，每层 DEEP_FILES 个文件
+DEEP_LEVELS = 200
+DEEP_FILES = 5
+SYMLINK_TARGETS = 500
+MIXED_FILES = 2_000
+IMAGE_FILES = 60
+
+
+class Baseline:
+    """
+    保存在 JSON 文件中的基线；比较时超过基线 (1 + threshold) 倍的指标使测试失败
+    tolerance 是额外允许的绝对差值，用于基线本身很小或噪声以固定量出现的指标（如常驻内存）
+    """
+
+    def __init__(self, path: Path, threshold: float, save: bool):
+        self.path = path
+        self.threshold = threshold
+        self.save = save
+        self.values: Dict[str, float] = {}
+        if path.exists():
+            self.values = json.loads(path.read_text())
+
+    def check(self, key: str, value: float, tolerance: float = 0):
+        if self.save:
+            self.values[key] = value
+            return
+        expected = self.values.get(key)
+        if expected is not None and value > expected * (1 + self.threshold) + tolerance:
+            pytest.fail(f"{key}: {value:.4g} is more than {self.threshold:.0%} (+{tolerance:.4g}) "
+                        f"over the baseline {expected:.4g}")
+
+    def write(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.values, indent=2, sort_keys=True))
+
+
+@pytest.fixture(scope="session")
+def baseline(request):
+    config = request.config
+    store = Baseline(Path(config.getoption("--bench-baseline")), config.getoption("--bench-threshold"),
+                     config.getoption("--bench-save-baseline"))
+    yield store
+    if store.save:
+        store.write()
+
+
+@pytest.fixture
+def bench(benchmark, baseline, request):
+    """pytest-benchmark 的 benchmark，测试结束后用耗时中位数检查基线"""
+    yield benchmark
+    if benchmark.enabled and benchmark.stats is not None:
+        baseline.check(f"{request.node.nodeid}::median", benchmark.stats.stats.median)
+
+
+@pytest.fixture
+def measure_memory() -> Callable[[Callable[[], object]], Tuple[object, int]]:
+    return _measure_memory
+
+
+def _measure_memory(build: Callable[[], object]) -> Tuple[object, int]:
+    """用 tracemalloc 测量 build() 返回的对象占用的内存（调用结束时仍在使用的字节数）"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, after - before
+
+
+def _touch(path: str, size: int = 0):
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        if size:
+            os.ftruncate(fd, size)  # 稀疏文件，不占磁盘空间
+    finally:
+        os.close(fd)
+
+
+def _build_flat(root: Path, count: int):
+    """count 个条目，大小按对数分布（0 到 16 MiB）的稀疏文件，使按大小排序有实际要比较的值"""
+    rng = random.Random(count)
+    for i in range(count):
+        path = os.path.join(root, f"file_{i}{rng.choice(EXTENSIONS)}")
+        if i % DIR_EVERY == 0:
+            os.mkdir(path)
+        else:
+            _touch(path, int(2 ** rng.uniform(0, 24)))
+        if i % 1000 == 0:
+            mtime = rng.uniform(1e9, 1.7e9)
+            os.utime(path, (mtime, mtime))
+
+
+def _build_tree(root: Path, depth: int = TREE_DEPTH):
+    for i in range(TREE_FILES):
+        _touch(os.path.join(root, f"file_{i}{EXTENSIONS[i % len(EXTENSIONS)]}"), i * 100)
+    if depth == 0:
+        return
+    for i in range(TREE_FANOUT):
+        child = root / f"dir_{i}"
+        child.mkdir()
+        _build_tree(child, depth - 1)
+
+
+@pytest.fixture(scope="session")
+def flat_dir(request, tmp_path_factory):
+    """按 request.param（"1k"、"100k"、"1M"）生成的平铺目录；大目录需要 --bench-large"""
+    size = request.param
+    if size in LARGE_SIZES and not request.config.getoption("--bench-large"):
+        pytest.skip("large directories need --bench-large")
+    root = tmp_path_factory.mktemp(f"flat-{size}")
+    _build_flat(root, FLAT_SIZES[size])
+    return root
+
+
+def pytest_generate_tests(metafunc):
+    if "flat_dir" in metafunc.fixturenames:
+        metafunc.parametrize("flat_dir", list(FLAT_SIZES), indirect=True, scope="session")
+
+
+@pytest.fixture(scope="session")
+def wide_tree(tmp_path_factory):
+    root = tmp_path_factory.mktemp("wide-tree")
+    _build_tree(root)
+    return root
+
+
+@pytest.fixture(scope="session")
+def deep_tree(tmp_path_factory):
+    root = tmp_path_factory.mktemp("deep-tree")
+    current = root
+    for level in range(DEEP_LEVELS):
+        for i in range(DEEP_FILES):
+            _touch(os.path.join(current, f"level_{level}_{i}.txt"), level)
+        current = current / f"d{level}"
+        current.mkdir()
+    return root
+
+
+@pytest.fixture(scope="session")
+def symlink_farm(tmp_path_factory):
+    """文件和目录各有指向它们的符号链接，另有断开的链接"""
+    root = tmp_path_factory.mktemp("symlink-farm")
+    targets = root / "targets"
+    targets.mkdir()
+    links = root / "links"
+    links.mkdir()
+    for i in range(SYMLINK_TARGETS):
+        _touch(os.path.join(targets, f"target_{i}.dat"), i)
+        os.symlink(os.path.join(targets, f"target_{i}.dat"), os.path.join(links, f"link_{i}.dat"))
+        if i % 10 == 0:
+            os.symlink(targets, os.path.join(links, f"dirlink_{i}"))
+            os.symlink(os.path.join(root, "missing", str(i)), os.path.join(links, f"broken_{i}"))
+    return links
+
+
+@pytest.fixture(scope="session")
+def image_dir(tmp_path_factory):
+    """可以解码的 PNG、JPEG 和 GIF，尺寸和颜色各不相同，用于缩略图"""
+    from PIL import Image
+
+    root = tmp_path_factory.mktemp("images")
+    rng = random.Random(0)
+    for i in range(IMAGE_FILES):
+        size = (rng.randrange(64, 1024), rng.randrange(64, 1024))
+        image = Image.new("RGB", size, tuple(rng.randrange(256) for _ in range(3)))
+        extension = (".png", ".jpg", ".gif")[i % 3]
+        image.save(root / f"image_{i}{extension}")
+    return root
+
+
+@pytest.fixture(scope="session")
+def mixed_sizes(tmp_path_factory):
+    """大小按对数分布（0 到 1 GiB）的稀疏文件"""
+    root = tmp_path_factory.mktemp("mixed-sizes")
+    rng = random.Random(0)
+    for i in range(MIXED_FILES):
+        _touch(os.path.join(root, f"blob_{i}.bin"), int(2 ** rng.uniform(0, 30)))
+    return root
@@ -0,0 +1,24 @@
+import pytest
+
+from tkinter_file_manager.core.dir_size import DirSizeCache, DirSizeEngine
+
+pytestmark = pytest.mark.benchmark(group="dir_size", min_rounds=3, max_time=0.5)
+
+
+@pytest.fixture(params=["wide", "deep", "mixed"])
+def tree(request, wide_tree, deep_tree, mixed_sizes):
+    return {"wide": wide_tree, "deep": deep_tree, "mixed": mixed_sizes}[request.param]
+
+
+def test_subtree_size_cold(bench, tree):
+    """没有缓存：读取每个目录并 stat 每个文件"""
+    size = bench.pedantic(lambda engine: engine.subtree_size(tree),
+                          setup=lambda: ((DirSizeEngine(max_workers=1, cache=DirSizeCache()),), {}), rounds=3)
+    assert size > 0
+
+
+def test_subtree_size_warm(bench, tree):
+    """目录未变化：每个目录一次 stat"""
+    engine = DirSizeEngine(max_workers=1, cache=DirSizeCache())
+    expected = engine.subtree_size(tree)
+    assert bench(engine.subtree_size, tree) == expected
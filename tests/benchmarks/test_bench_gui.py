@@ -0,0 +1,130 @@
+"""
+界面刷新基准：在 Xvfb（或已有的显示）中运行 MainWindow，通过 signal_path_change 导航到生成的目录，
+测量到事件循环重新空闲的时间、控件数量和常驻内存增长，并检查反复导航不会泄漏控件和图片。
+没有显示环境和 Xvfb 时跳过
+"""
+import os
+import sys
+import time
+
+import pytest
+
+from tkinter_file_manager.utils import startup
+
+pytestmark = [
+    pytest.mark.benchmark(group="gui", min_rounds=3, max_time=1.0),
+    pytest.mark.skipif(not sys.platform.startswith("linux"), reason="RSS is read from /proc"),
+]
+
+# 等待事件循环空闲的最长时间（秒）
+IDLE_TIMEOUT = 60
+LEAK_ROUNDS = 5
+# 常驻内存以页和分配器的区块为单位增长，在相对阈值之外再允许的绝对差值（字节）
+RSS_TOLERANCE = 16 * 1024 * 1024
+
+
+def _rss() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _count_widgets(widget) -> int:
+    return 1 + sum(_count_widgets(child) for child in widget.winfo_children())
+
+
+def _count_images(app) -> int:
+    return len(app.tk.call("image", "names"))
+
+
+@pytest.fixture(scope="module")
+def app():
+    with startup.display() as env:
+        if env is None:
+            pytest.skip("no display or Xvfb available")
+        previous = os.environ.get("DISPLAY")
+        os.environ["DISPLAY"] = env.get("DISPLAY", "")
+        try:
+            import tkinter
+            from tkinter_file_manager.gui.main_window import MainWindow
+            try:
+                window = MainWindow()
+            except tkinter.TclError as e:
+                pytest.skip(f"cannot open a window: {e}")
+            window.update()
+            yield window
+            window.destroy()
+        finally:
+            if previous is None:
+                os.environ.pop("DISPLAY", None)
+            else:
+                os.environ["DISPLAY"] = previous
+
+
+@pytest.fixture(scope="module")
+def empty_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp("empty")
+
+
+def _wait_idle(app):
+    """
+    处理事件直到扫描结束、文件夹大小和缩略图都已算完、没有排队的回调，且 Tk 的空闲任务都已执行
+    工作线程先回调再减少计数，所以计数为零之后再检查事件队列就不会漏掉它们的结果
+    """
+    from tkinter_file_manager.core.dir_size import dir_size_engine
+    from tkinter_file_manager.core.thumbnails import thumbnail_service
+    from tkinter_file_manager.gui.event_bus import ui_events
+
+    deadline = time.perf_counter() + IDLE_TIMEOUT
+    while time.perf_counter() < deadline:
+        app.update()
+        if (not app.file_list._loading and app.file_list._pending_sort is None
+                and not dir_size_engine.outstanding and not thumbnail_service.outstanding
+                and ui_events.empty()):
+            app.update_idletasks()
+            return
+        time.sleep(0.001)
+    pytest.fail("event loop did not become idle")
+
+
+def _navigate(app, path):
+    from tkinter_file_manager.gui.event_bus import signal_path_change
+
+    started = time.perf_counter()
+    signal_path_change.send(path)
+    _wait_idle(app)
+    return time.perf_counter() - started
+
+
+def test_refresh_latency(bench, baseline, request, app, empty_dir, flat_dir):
+    """从空目录导航到平铺目录，直到界面重新空闲"""
+    from tkinter_file_manager.core.dir_cache import listing_cache
+
+    def setup():
+        _navigate(app, empty_dir)
+        listing_cache.clear()  # 每一轮都重新扫描，而不是命中目录缓存
+
+    _navigate(app, empty_dir)
+    rss_before = _rss()
+    bench.pedantic(_navigate, (app, flat_dir), setup=setup, rounds=3)
+    assert len(app.file_list.files) > 0
+
+    widgets = _count_widgets(app)
+    rss_growth = _rss() - rss_before
+    bench.extra_info.update(widgets=widgets, images=_count_images(app), rss_growth=rss_growth)
+    baseline.check(f"{request.node.nodeid}::widgets", widgets)
+    baseline.check(f"{request.node.nodeid}::rss_growth", max(rss_growth, 0), tolerance=RSS_TOLERANCE)
+
+
+def test_repeated_navigation_does_not_leak(bench, app, wide_tree, deep_tree, symlink_farm, mixed_sizes, image_dir):
+    """反复在几个目录之间导航后，控件和图片数量不再增长；image_dir 中的缩略图会真正解码"""
+    paths = [wide_tree, deep_tree, symlink_farm, mixed_sizes, image_dir]
+
+    def tour():
+        for path in paths:
+            _navigate(app, path)
+
+    tour()  # 第一轮创建行控件、加载图标
+    widgets, images = _count_widgets(app), _count_images(app)
+    bench.pedantic(tour, rounds=LEAK_ROUNDS)
+    assert _count_widgets(app) == widgets
+    assert _count_images(app) == images
@@ -0,0 +1,32 @@
+import pytest
+
+from tkinter_file_manager.core.file_operations import list_dir, list_subdirs
+
+pytestmark = pytest.mark.benchmark(group="listing", min_rounds=3, max_time=0.5)
+
+
+def test_list_dir(bench, flat_dir):
+    """完整扫描（每个条目 stat）并排序"""
+    listing = bench(list_dir, flat_dir)
+    assert len(listing)
+
+
+def test_list_dir_fast(bench, flat_dir):
+    """快速扫描：只用 scandir 返回的类型，不做 stat"""
+    listing = bench(list_dir, flat_dir, fast=True)
+    assert listing.is_pending(len(listing) - 1)
+
+
+def test_list_subdirs(bench, flat_dir):
+    """导航树展开时的只列子目录扫描"""
+    assert bench(list_subdirs, flat_dir)
+
+
+def test_list_symlink_farm(bench, symlink_farm):
+    listing = bench(list_dir, symlink_farm)
+    assert any(listing.is_symlink(i) for i in range(len(listing)))
+
+
+def test_list_mixed_sizes(bench, mixed_sizes):
+    listing = bench(list_dir, mixed_sizes)
+    assert max(listing.sizes) > 1024 * 1024
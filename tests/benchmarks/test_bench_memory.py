@@ -0,0 +1,45 @@
+import pytest
+
+from tkinter_file_manager.core.dir_size import DirSizeCache, DirSizeEngine
+from tkinter_file_manager.core.file_operations import get_dir_content, list_dir
+from tkinter_file_manager.core.sorting import SortSpec, Sorter, SORT_SIZE
+
+pytestmark = pytest.mark.benchmark(group="memory", min_rounds=1, max_time=0.1)
+
+
+def _check(bench, baseline, request, key, value):
+    bench.extra_info[key] = value
+    baseline.check(f"{request.node.nodeid}::{key}", value)
+
+
+def test_listing_memory(bench, baseline, request, measure_memory, flat_dir):
+    """DirListing 每个条目占用的内存"""
+    listing, used = measure_memory(lambda: list_dir(flat_dir))
+    per_entry = used / len(listing)
+    _check(bench, baseline, request, "bytes_per_entry", per_entry)
+    bench.pedantic(list_dir, (flat_dir,), rounds=1)
+
+
+def test_dict_listing_memory(bench, baseline, request, measure_memory, flat_dir):
+    """对照：字典列表每个条目占用的内存"""
+    contents, used = measure_memory(lambda: get_dir_content(flat_dir))
+    _check(bench, baseline, request, "bytes_per_entry", used / len(contents))
+    bench.pedantic(get_dir_content, (flat_dir,), rounds=1)
+
+
+def test_sort_rank_memory(bench, baseline, request, measure_memory, flat_dir):
+    """Sorter 缓存的名次每个条目占用的内存"""
+    listing = list_dir(flat_dir)
+    sorter = Sorter()
+    _, used = measure_memory(lambda: sorter.sort(listing, SortSpec(SORT_SIZE)))
+    _check(bench, baseline, request, "bytes_per_entry", used / len(listing))
+    bench.pedantic(sorter.sort, (listing, SortSpec(SORT_SIZE)), rounds=1)
+
+
+def test_dir_size_cache_memory(bench, baseline, request, measure_memory, wide_tree):
+    """DirSizeCache 每个目录记录占用的内存"""
+    cache = DirSizeCache()
+    engine = DirSizeEngine(max_workers=1, cache=cache)
+    _, used = measure_memory(lambda: engine.subtree_size(wide_tree))
+    _check(bench, baseline, request, "bytes_per_dir", used / len(cache._records))
+    bench.pedantic(engine.subtree_size, (wide_tree,), rounds=1)
@@ -0,0 +1,27 @@
+import pytest
+
+from tkinter_file_manager.core.search import SearchEngine, SearchQuery
+
+pytestmark = pytest.mark.benchmark(group="search", min_rounds=3, max_time=0.5)
+
+QUERIES = {"substring": "file_1", "glob": "*.log", "regex": r"re:^file_[0-3]\.", "size": "size>500"}
+
+
+def _search(root, text):
+    results = []
+    task = SearchEngine().search(root, SearchQuery.parse(text, max_results=None), results.append)
+    task.wait()
+    return sum(len(batch) for batch in results)
+
+
+@pytest.mark.parametrize("query", list(QUERIES))
+def test_search_wide_tree(bench, wide_tree, query):
+    assert bench(_search, wide_tree, QUERIES[query])
+
+
+def test_search_deep_tree(bench, deep_tree):
+    assert bench(_search, deep_tree, "level_1") > 0
+
+
+def test_search_flat(bench, flat_dir):
+    assert bench(_search, flat_dir, "file_9")
@@ -0,0 +1,62 @@
+import pytest
+
+from tkinter_file_manager.core.file_operations import list_dir
+from tkinter_file_manager.core.filtering import ListingFilter
+from tkinter_file_manager.core.sorting import SortSpec, Sorter, SORT_NAME, SORT_SIZE, SORT_MTIME, SORT_EXTENSION
+
+pytestmark = pytest.mark.benchmark(group="sorting", min_rounds=3, max_time=0.5)
+
+SPECS = {
+    "name": SortSpec(SORT_NAME),
+    "natural": SortSpec(SORT_NAME, natural=True),
+    "size": SortSpec(SORT_SIZE),
+    "mtime": SortSpec(SORT_MTIME, descending=True),
+    "extension": SortSpec(SORT_EXTENSION),
+}
+
+
+@pytest.fixture(scope="module")
+def listings():
+    """每个目录只扫描一次"""
+    cache = {}
+
+    def get(path):
+        if path not in cache:
+            cache[path] = list_dir(path)
+        return cache[path]
+
+    return get
+
+
+@pytest.mark.parametrize("spec", list(SPECS))
+def test_sort_cold(bench, flat_dir, listings, spec):
+    """没有缓存名次时的排序"""
+    listing = listings(flat_dir)
+    result = bench.pedantic(lambda sorter: sorter.sort(listing, SPECS[spec]),
+                            setup=lambda: ((Sorter(),), {}), rounds=3)
+    assert len(result) == len(listing)
+
+
+def test_resort_cached(bench, flat_dir, listings):
+    """已缓存名次时切换排序方向"""
+    sorter = Sorter()
+    listing = sorter.sort(listings(flat_dir), SortSpec(SORT_SIZE))
+    state = {"listing": listing, "descending": False}
+
+    def toggle():
+        state["descending"] = not state["descending"]
+        state["listing"] = sorter.sort(state["listing"], SortSpec(SORT_SIZE, descending=state["descending"]))
+
+    bench(toggle)
+
+
+def test_filter_keystrokes(bench, flat_dir, listings):
+    """逐字输入过滤文字，第一次按键包含计算名称的 casefold 形式"""
+    listing = listings(flat_dir)
+
+    def type_query():
+        f = ListingFilter()
+        for i in range(1, len("file_12") + 1):
+            f.apply(listing, "file_12"[:i])
+
+    bench(type_query)
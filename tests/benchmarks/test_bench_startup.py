@@ -0,0 +1,31 @@
+"""
+启动耗时：入口模块的导入时间和主窗口的第一帧绘制时间，每轮都在新的解释器中测量
+与基线比较，不对墙钟时间断言固定预算；IMPORT_BUDGET 和 FIRST_PAINT_BUDGET 随结果记录在 extra_info 中，
+也可以用 tfm profile 查看
+"""
+import pytest
+
+from tkinter_file_manager.utils import startup
+
+pytestmark = pytest.mark.benchmark(group="startup", min_rounds=3, max_time=1.0)
+
+
+def test_import_time(bench, baseline, request):
+    """入口模块在 -X importtime 中的累计时间，取三次中最快的一次"""
+    times = []
+    bench.pedantic(lambda: times.append(startup.import_time()), rounds=3)
+    best = min(times)
+    bench.extra_info.update(import_time=best, budget=startup.IMPORT_BUDGET)
+    baseline.check(f"{request.node.nodeid}::import_time", best)
+
+
+def test_first_paint(bench, baseline, request):
+    """主窗口到第一帧绘制完成的时间；没有显示环境和 Xvfb 时跳过"""
+    with startup.display() as env:
+        if env is None:
+            pytest.skip("no display or Xvfb available")
+        times = []
+        bench.pedantic(lambda: times.append(startup.first_paint(env)["first_paint"]), rounds=3)
+    best = min(times)
+    bench.extra_info.update(first_paint=best, budget=startup.FIRST_PAINT_BUDGET)
+    baseline.check(f"{request.node.nodeid}::first_paint", best)
@@ -0,0 +1,27 @@
+"""
+计时装饰器的开销：关闭时被装饰的函数应与直接调用相差无几，开启时包含读取时钟和写入环形缓冲区
+"""
+import pytest
+
+from tkinter_file_manager.utils.logging import Tracer
+
+pytestmark = pytest.mark.benchmark(group="tracing", min_rounds=3, max_time=0.5)
+
+CALLS = 100_000
+
+
+def plain():
+    return None
+
+
+@pytest.mark.parametrize("mode", ["plain", "disabled", "enabled"])
+def test_traced_calls(bench, mode):
+    """连续调用 10 万次：未装饰、关闭计时、开启计时"""
+    t = Tracer(enabled=mode == "enabled")
+    func = plain if mode == "plain" else t.traced()(plain)
+
+    def run():
+        for _ in range(CALLS):
+            func()
+
+    bench(run)
@@ -0,0 +1,11 @@
+def pytest_addoption(parser):
+    """基准测试套件（tests/benchmarks）的选项"""
+    group = parser.getgroup("tfm-benchmarks")
+    group.addoption("--bench-large", action="store_true", default=False,
+                    help="also run benchmarks on flat directories of 100k and 1M entries")
+    group.addoption("--bench-baseline", default=".benchmarks/tfm-baseline.json",
+                    help="baseline file for benchmark regression checks")
+    group.addoption("--bench-save-baseline", action="store_true", default=False,
+                    help="record the measured values as the new baseline instead of comparing")
+    group.addoption("--bench-threshold", type=float, default=0.25,
+                    help="allowed slowdown or memory growth over the baseline (0.25 = 25%%)")
@@ -0,0 +1,148 @@
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+import pytest
+
+from tkinter_file_manager.core import file_operations
+from tkinter_file_manager.core.file_operations import DeleteEngine
+
+
+@pytest.fixture
+def engine():
+    engine = DeleteEngine(max_workers=4)
+    yield engine
+    engine.shutdown()
+
+
+@pytest.fixture
+def root():
+    with TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        tree = root / "tree"
+        for i in range(5):
+            for j in range(5):
+                sub = tree / f"d{i}" / f"e{j}"
+                sub.mkdir(parents=True)
+                for k in range(10):
+                    (sub / f"f{k}").touch()
+        (root / "outside").mkdir()
+        (root / "outside" / "keep.txt").write_text("keep")
+        (tree / "link").symlink_to(root / "outside")
+        (root / "single.txt").write_text("single")
+        yield root
+
+
+def _run(task):
+    assert task.wait(10)
+    return task
+
+
+def test_delete_tree(engine, root):
+    """测试删除整棵目录树，不跟随其中的符号链接"""
+    task = _run(engine.delete([root / "tree", root / "single.txt"]))
+
+    assert task.errors == []
+    assert not (root / "tree").exists()
+    assert not (root / "single.txt").exists()
+    assert (root / "outside" / "keep.txt").read_text() == "keep"
+    # 250 个文件 + 1 个链接 + 31 个目录 + 1 个单独的文件
+    assert task.progress().done_files == 283
+
+
+def test_failure_keeps_parents(engine, root):
+    """测试子树中有条目删不掉时只报告该条目，父目录保留"""
+    real_unlink = os.unlink
+
+    def unlink(path, *args, **kwargs):
+        if path == "f3":
+            raise PermissionError(13, "Permission denied", path)
+        return real_unlink(path, *args, **kwargs)
+
+    with mock.patch.object(file_operations.os, "unlink", unlink):
+        task = _run(engine.delete([root / "tree"]))
+
+    assert len(task.errors) == 25
+    assert all(path.endswith("f3") for path, _ in task.errors)
+    assert sorted(p.name for p in (root / "tree" / "d0" / "e0").iterdir()) == ["f3"]
+
+
+def test_cancel_stops(engine, root):
+    """测试取消后不再继续删除"""
+    real_unlink = os.unlink
+    tasks = []
+
+    def unlink(path, *args, **kwargs):
+        tasks[0].cancel()
+        return real_unlink(path, *args, **kwargs)
+
+    with mock.patch.object(file_operations.os, "unlink", unlink):
+        tasks.append(engine.delete([root / "tree"]))
+        task = _run(tasks[0])
+
+    assert task.cancelled
+    assert (root / "tree").exists()
+
+
+@pytest.mark.skipif(not file_operations._RMDIR_DIR_FD_SUPPORTED, reason="rmdir does not support dir_fd")
+def test_directories_removed_relative_to_parent_fd(engine, root):
+    """测试目录以父目录的 fd 为基准删除，而不是按绝对路径"""
+    real_rmdir = os.rmdir
+    calls = []
+
+    def rmdir(path, *args, **kwargs):
+        calls.append((path, kwargs.get("dir_fd")))
+        return real_rmdir(path, *args, **kwargs)
+
+    with mock.patch.object(file_operations.os, "rmdir", rmdir):
+        task = _run(engine.delete([root / "tree"]))
+
+    assert task.errors == []
+    assert not (root / "tree").exists()
+    assert len(calls) == 31
+    assert all(dir_fd is not None and os.sep not in path for path, dir_fd in calls)
+
+
+@pytest.mark.skipif(not file_operations._RMDIR_DIR_FD_SUPPORTED, reason="rmdir does not support dir_fd")
+def test_swapped_ancestor_not_followed(root):
+    """测试扫描之后上级目录被换成符号链接时，rmdir 不会删到链接指向的目录"""
+    parent = root / "tree" / "d0"
+    node = file_operations._DeleteNode(str(parent / "e0"), None, os.lstat(parent / "e0"), os.stat(parent))
+    (root / "outside" / "e0").mkdir()
+    parent.rename(root / "moved")
+    parent.symlink_to(root / "outside")
+
+    with pytest.raises(OSError):
+        file_operations._remove_dir(node)
+    assert (root / "outside" / "e0").is_dir()
+
+
+def test_remove_dir_fallback_without_dir_fd(root):
+    """测试平台不支持 dir_fd 时按路径删除目录"""
+    empty = root / "empty"
+    empty.mkdir()
+    node = file_operations._DeleteNode(str(empty), None, os.lstat(empty), os.stat(root))
+    with mock.patch.object(file_operations, "_RMDIR_DIR_FD_SUPPORTED", False):
+        file_operations._remove_dir(node)
+    assert not empty.exists()
+
+
+def test_trash_renames_and_writes_info(engine, root):
+    """测试移到回收站是一次 rename，并写入 .trashinfo；重名时自动改名"""
+    trash = root / "Trash"
+    (root / "other").mkdir()
+    (root / "other" / "single.txt").write_text("other")
+    inode = (root / "tree").stat().st_ino
+
+    with mock.patch.object(file_operations, "TRASH_DIR", str(trash)):
+        task = _run(engine.trash([root / "tree", root / "single.txt", root / "other" / "single.txt"]))
+
+    assert task.errors == []
+    assert not (root / "tree").exists()
+    assert (trash / "files" / "tree").stat().st_ino == inode
+    assert (trash / "files" / "single.txt").read_text() == "single"
+    assert (trash / "files" / "single.txt.2").read_text() == "other"
+    info = (trash / "info" / "single.txt.2.trashinfo").read_text()
+    assert info.startswith("[Trash Info]\n")
+    assert f"Path={root / 'other' / 'single.txt'}\n" in info
@@ -0,0 +1,85 @@
+import os
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from tkinter_file_manager.core.dir_cache import DirListingCache
+from tkinter_file_manager.core.file_operations import list_dir
+
+
+def _age(path: Path, seconds: float = 60):
+    """把目录 mtime 调到过去，避开缓存的时间戳竞争窗口"""
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+    return os.stat(path).st_mtime_ns
+
+
+@pytest.fixture
+def test_dir():
+    with TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        for name in ("a.txt", "b.txt"):
+            (root / name).write_text(name)
+        yield root
+
+
+def test_hit_after_put(test_dir):
+    """测试目录未变化时命中缓存"""
+    cache = DirListingCache()
+    mtime_ns = _age(test_dir)
+    cache.put(test_dir, list_dir(test_dir), mtime_ns)
+
+    cached = cache.get(test_dir)
+
+    assert cached.names == ["a.txt", "b.txt"]
+    assert cached.is_pending(0)
+    assert cache.stats()["hits"] == 1
+
+
+def test_miss_after_directory_change(test_dir):
+    """测试目录 mtime 变化后缓存失效"""
+    cache = DirListingCache()
+    cache.put(test_dir, list_dir(test_dir), _age(test_dir))
+
+    (test_dir / "c.txt").touch()
+
+    assert cache.get(test_dir) is None
+    assert cache.stats() == {"hits": 0, "misses": 1, "evictions": 0, "entries": 0, "bytes": 0}
+
+
+def test_recently_modified_directory_not_cached(test_dir):
+    """测试刚修改过的目录不进入缓存"""
+    cache = DirListingCache()
+    cache.put(test_dir, list_dir(test_dir), os.stat(test_dir).st_mtime_ns)
+
+    assert cache.stats()["entries"] == 0
+
+
+def test_lru_eviction(test_dir):
+    """测试超出条目上限时淘汰最久未使用的列表"""
+    cache = DirListingCache(max_entries=2)
+    dirs = []
+    for name in ("x", "y", "z"):
+        sub = test_dir / name
+        sub.mkdir()
+        dirs.append((sub, _age(sub)))
+
+    cache.put(dirs[0][0], list_dir(dirs[0][0]), dirs[0][1])
+    cache.put(dirs[1][0], list_dir(dirs[1][0]), dirs[1][1])
+    cache.get(dirs[0][0])
+    cache.put(dirs[2][0], list_dir(dirs[2][0]), dirs[2][1])
+
+    assert cache.get(dirs[1][0]) is None
+    assert cache.get(dirs[0][0]) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_memory_bound(test_dir):
+    """测试超过内存上限的列表不会被缓存"""
+    listing = list_dir(test_dir)
+    cache = DirListingCache(max_bytes=listing.nbytes() - 1)
+    cache.put(test_dir, listing, _age(test_dir))
+
+    assert cache.stats()["entries"] == 0
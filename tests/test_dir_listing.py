@@ -0,0 +1,108 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from tkinter_file_manager.core.dir_listing import DirListing, FLAG_DIR, FLAG_HIDDEN
+from tkinter_file_manager.core.file_operations import get_dir_content, list_dir, list_entries
+
+
+@pytest.fixture
+def test_dir():
+    with TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        (root / "b.txt").write_text("bb")
+        (root / "A.py").write_text("a")
+        (root / ".hidden").touch()
+        (root / "sub").mkdir()
+        yield root
+
+
+def test_list_dir_matches_dict_view(test_dir):
+    """测试 DirListing 的字典视图与 get_dir_content 一致"""
+    assert list_dir(test_dir).to_dicts() == get_dir_content(test_dir)
+
+
+def test_columns(test_dir):
+    """测试列式存储的字段"""
+    listing = list_dir(test_dir)
+
+    assert listing.names == ["sub", ".hidden", "A.py", "b.txt"]
+    assert listing.is_dir(0) and listing.extension(0) == "folder"
+    assert listing.sizes[0] == 0
+    assert listing.is_hidden(1)
+    assert listing.extension(2) == ".py"
+    assert listing.sizes[3] == 2
+    assert listing.path(3) == test_dir / "b.txt"
+
+
+def test_add_and_index():
+    """测试手动添加条目与下标访问"""
+    listing = DirListing(Path("/data"))
+    listing.add("x", 0, 0.0, FLAG_DIR | FLAG_HIDDEN)
+    listing.add("y.TXT", 10, 0.0, 0)
+
+    assert len(listing) == 2
+    assert listing[-1]["extension"] == ".txt"
+    assert listing[0]["is_hidden"] is True
+    with pytest.raises(IndexError):
+        listing[2]
+
+
+def test_take_reorders_all_columns():
+    """测试按下标重排时各列保持对应"""
+    listing = DirListing(Path("/data"))
+    for i in range(3):
+        listing.add(f"f{i}", i, float(i), 0)
+
+    reordered = listing.take([2, 0])
+
+    assert reordered.names == ["f2", "f0"]
+    assert list(reordered.sizes) == [2, 0]
+    assert list(reordered.mtimes) == [2.0, 0.0]
+
+
+def test_fast_listing_defers_stat(test_dir):
+    """测试快速模式只在 hydrate 时读取元数据"""
+    listing = list_dir(test_dir, fast=True)
+
+    assert listing.names == ["sub", ".hidden", "A.py", "b.txt"]
+    assert listing.is_dir(0) and listing.is_hidden(1)
+    assert all(listing.is_pending(i) for i in range(len(listing)))
+    assert listing.sizes[3] == 0
+
+    assert listing.hydrate([3]) == 1
+    assert listing.sizes[3] == 2
+    assert not listing.is_pending(3)
+    assert listing.is_pending(2)
+    assert listing.hydrate([3]) == 0
+
+
+def test_fast_listing_dict_view_hydrates(test_dir):
+    """测试快速模式的字典视图与完整扫描一致"""
+    assert list_dir(test_dir, fast=True).to_dicts() == get_dir_content(test_dir)
+
+
+def test_upsert_keeps_default_order(test_dir):
+    """测试增量插入保持目录优先、名称排序"""
+    listing = list_dir(test_dir)
+    (test_dir / "c.txt").write_text("ccc")
+    (test_dir / "b.txt").write_text("bbbb")
+    (test_dir / "asub").mkdir()
+
+    listing.upsert_sorted(list_entries(test_dir, ["c.txt", "b.txt", "asub"]))
+    listing.remove_names([".hidden", "missing"])
+
+    assert listing.names == ["asub", "sub", "A.py", "b.txt", "c.txt"]
+    assert listing.sizes[3] == 4
+
+
+def test_remove_names_returns_original_indices():
+    """测试一次删除多个条目，返回的是它们在删除前的下标"""
+    listing = DirListing(Path("/root"))
+    for i in range(10):
+        listing.add(f"f{i}", i, 0.0, 0)
+    assert listing.remove_names(["f7", "f2", "missing", "f3"]) == [2, 3, 7]
+    assert listing.names == ["f0", "f1", "f4", "f5", "f6", "f8", "f9"]
+    assert list(listing.sizes) == [0, 1, 4, 5, 6, 8, 9]
+    assert listing.remove_names([]) == []
@@ -0,0 +1,100 @@
+import os
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from tkinter_file_manager.core.dir_size import DirSizeCache, DirSizeEngine
+
+
+@pytest.fixture
+def test_dir():
+    with TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        (root / "a").mkdir()
+        (root / "a" / "one.bin").write_bytes(b"x" * 100)
+        (root / "a" / "nested").mkdir()
+        (root / "a" / "nested" / "two.bin").write_bytes(b"x" * 50)
+        (root / "b").mkdir()
+        (root / "b" / "three.bin").write_bytes(b"x" * 7)
+        yield root
+
+
+@pytest.fixture
+def engine():
+    engine = DirSizeEngine(max_workers=2)
+    yield engine
+    engine.shutdown()
+
+
+def test_subtree_size(engine, test_dir):
+    """测试递归大小"""
+    assert engine.subtree_size(test_dir / "a") == 150
+    assert engine.subtree_size(test_dir) == 157
+
+
+@pytest.mark.skipif(not hasattr(os, "link"), reason="需要硬链接")
+def test_hard_links_counted_once(engine, test_dir):
+    """测试同一子树中的硬链接只计算一次"""
+    os.link(test_dir / "a" / "one.bin", test_dir / "a" / "nested" / "same.bin")
+    assert engine.subtree_size(test_dir / "a") == 150
+
+
+def test_symlinked_directories_not_followed(engine, test_dir):
+    """测试不进入符号链接指向的目录"""
+    os.symlink(test_dir / "a", test_dir / "b" / "link_to_a")
+    assert engine.subtree_size(test_dir / "b") < 150
+
+
+def test_compute_reports_each_child(engine, test_dir):
+    """测试按子文件夹逐个报告大小，全部报告后 outstanding 归零"""
+    results = []
+    engine.compute(test_dir, ["a", "b"], results.append)
+    deadline = time.monotonic() + 5
+    while engine.outstanding and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert engine.outstanding == 0
+    assert sorted(results) == [("a", 150), ("b", 7)]
+
+
+def test_unchanged_directories_not_reread(test_dir):
+    """测试 mtime 未变化的目录直接使用缓存"""
+    cache = DirSizeCache()
+    engine = DirSizeEngine(cache=cache)
+    try:
+        assert engine.subtree_size(test_dir / "a") == 150
+        # 目录 mtime 不变时修改文件大小不会被发现，说明没有重新读取
+        (test_dir / "a" / "nested" / "two.bin").write_bytes(b"x" * 60)
+        assert engine.subtree_size(test_dir / "a") == 150
+
+        (test_dir / "a" / "nested" / "new.bin").write_bytes(b"x" * 5)
+        assert engine.subtree_size(test_dir / "a") == 165
+    finally:
+        engine.shutdown()
+
+
+def test_other_devices_not_entered(engine, test_dir, monkeypatch):
+    """测试不进入挂载在其他设备上的目录（du -x），子文件夹本身是挂载点时不报告大小"""
+    mount = os.fspath(test_dir / "a" / "nested")
+    real_stat = os.stat
+
+    def fake_stat(path, *args, **kwargs):
+        st = real_stat(path, *args, **kwargs)
+        if os.fspath(path) == mount:
+            return SimpleNamespace(st_dev=st.st_dev + 1, st_mtime_ns=st.st_mtime_ns)
+        return st
+
+    monkeypatch.setattr(os, "stat", fake_stat)
+    assert engine.subtree_size(test_dir / "a") == 100
+    assert engine.subtree_size(test_dir) == 107
+    assert engine.subtree_size(mount, device=real_stat(test_dir).st_dev) is None
+
+    results = []
+    engine.compute(test_dir / "a", ["nested"], results.append)
+    deadline = time.monotonic() + 5
+    while engine.outstanding and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert results == []
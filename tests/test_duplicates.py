@@ -0,0 +1,92 @@
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+import pytest
+
+from tkinter_file_manager.core import duplicates
+from tkinter_file_manager.core.duplicates import DuplicateFinder, HashCache
+
+
+@pytest.fixture
+def finder():
+    finder = DuplicateFinder(max_workers=2)
+    yield finder
+    finder.shutdown()
+
+
+@pytest.fixture
+def root():
+    with TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        (root / "a").mkdir()
+        (root / "b").mkdir()
+        big = os.urandom(100_000)
+        (root / "a" / "big1.bin").write_bytes(big)
+        (root / "b" / "big2.bin").write_bytes(big)
+        # 大小相同、开头结尾相同，只有中间不同
+        (root / "b" / "big3.bin").write_bytes(big[:50_000] + b"x" + big[50_001:])
+        (root / "a" / "small1.txt").write_text("same")
+        (root / "b" / "small2.txt").write_text("same")
+        (root / "a" / "other.txt").write_text("diff")
+        (root / "a" / "empty1").touch()
+        (root / "b" / "empty2").touch()
+        os.link(root / "a" / "big1.bin", root / "a" / "hardlink.bin")
+        (root / "b" / "symlink.bin").symlink_to(root / "a" / "big1.bin")
+        yield root
+
+
+def _find(finder, root, **kwargs):
+    groups = []
+    task = finder.find([root], groups.append, **kwargs)
+    assert task.wait(30)
+    return task, {tuple(os.path.relpath(p, root) for p in group.paths) for group in groups}
+
+
+def test_finds_duplicate_groups(finder, root):
+    """测试找到内容相同的文件；中间不同、硬链接、符号链接和空文件都不算重复"""
+    task, groups = _find(finder, root)
+
+    big = {("a/big1.bin", "b/big2.bin"), ("a/hardlink.bin", "b/big2.bin")}
+    assert len(groups) == 2
+    assert ("a/small1.txt", "b/small2.txt") in groups
+    assert len(groups & big) == 1
+    assert task.wasted == 100_000 + 4
+
+
+def test_rerun_uses_cache(finder, root):
+    """测试树未变化时重新查找不再读取文件"""
+    _find(finder, root)
+    with mock.patch.object(duplicates, "_digest", side_effect=AssertionError):
+        _, groups = _find(finder, root)
+
+    assert len(groups) == 2
+
+
+def test_process_pool_hashing(root):
+    """测试文件较多时在进程池中计算哈希"""
+    for i in range(40):
+        (root / "a" / f"copy_{i}.dat").write_bytes(b"payload" * 2000)
+    finder = DuplicateFinder(max_workers=2, cache=HashCache())
+    try:
+        _, groups = _find(finder, root)
+        assert finder._pool is not None
+    finally:
+        finder.shutdown()
+
+    assert any(len(group) == 40 for group in groups)
+
+
+def test_cancel(finder, root):
+    """测试查重可以取消"""
+    groups = []
+    task = finder.find([root], groups.append)
+    task.cancel()
+    assert task.wait(10)
+    assert task.cancelled
+
+
+def test_not_a_directory(finder):
+    with pytest.raises(NotADirectoryError):
+        finder.find([Path("/nonexistent/path")], lambda group: None)
@@ -0,0 +1,79 @@
+import threading
+
+from blinker import signal
+
+from tkinter_file_manager.gui.event_bus import EventBus
+
+
+def test_events_run_on_draining_thread():
+    """测试任意线程投递的回调只在调用 drain 的线程中按顺序执行"""
+    bus = EventBus(coalesce=())
+    calls = []
+    callback = bus.wrap(lambda payload, tag: calls.append((payload, tag, threading.current_thread())), "tag")
+    threads = [threading.Thread(target=callback, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+        t.join()
+    assert calls == []
+    assert bus.drain() == 4
+    assert [payload for payload, _, _ in calls] == [0, 1, 2, 3]
+    assert all(tag == "tag" and thread is threading.current_thread() for _, tag, thread in calls)
+
+
+def test_coalesced_signals_keep_latest():
+    """测试合并的信号只派发最后一次，其他事件保持原来的顺序"""
+    path_signal = signal("test path")
+    status_signal = signal("test status")
+    bus = EventBus(coalesce=(path_signal, status_signal))
+    received = []
+
+    def on_path(path):
+        received.append(("path", path))
+
+    def on_status(text):
+        received.append(("status", text))
+
+    path_signal.connect(on_path)
+    status_signal.connect(on_status)
+    for i in range(1000):
+        bus.post(status_signal, f"{i} items")
+    bus.post(path_signal, "/a")
+    bus.call(lambda payload: received.append(("call", payload)), 1)
+    bus.post(path_signal, "/b")
+    assert bus.drain() == 3
+    assert received == [("status", "999 items"), ("call", 1), ("path", "/b")]
+
+    bus.post(path_signal, "/c")
+    assert bus.drain() == 1
+    assert received[-1] == ("path", "/c")
+
+
+def test_drain_respects_budget():
+    """测试超过时间预算的事件留到下一次 drain"""
+    bus = EventBus(coalesce=())
+    calls = []
+    for i in range(10):
+        bus.call(calls.append, i)
+    assert bus.drain(budget=0) == 1
+    assert bus.drain() == 9
+    assert calls == list(range(10))
+
+
+def test_call_latest_runs_once_per_drain():
+    """测试 call_latest 投递的同一回调在一次 drain 中只执行最后一次，其他事件保持顺序"""
+    bus = EventBus(coalesce=())
+    calls = []
+
+    def render(payload):
+        calls.append(("render", payload))
+
+    for i in range(100):
+        bus.call_latest(render, i)
+        if i == 50:
+            bus.call(calls.append, i)
+    assert bus.drain() == 2
+    assert calls == [50, ("render", 99)]
+
+    bus.call_latest(render, "again")
+    assert bus.drain() == 1
+    assert calls[-1] == ("render", "again")
@@ -4,7 +4,7 @@ from tempfile import TemporaryDirectory
 from pathlib import Path
 import pytest
 
-from tkinter_file_manager.core.file_operations import get_dir_content
+from tkinter_file_manager.core.file_operations import get_dir_content, iter_dir_content
 
 
 @pytest.fixture
@@ -133,6 +133,24 @@ def test_case_insensitive_sort(test_dir):
     assert names.index("a.txt") < names.index("Z.txt")
 
 
+def test_iter_dir_content_batches(test_dir):
+    """测试分批扫描"""
+    for i in range(10):
+        (test_dir / f"batch_{i}.txt").touch()
+
+    batches = list(iter_dir_content(test_dir, batch_size=4))
+
+    assert all(0 < len(batch) <= 4 for batch in batches)
+    names = sorted(item["name"] for batch in batches for item in batch)
+    assert names == sorted(item["name"] for item in get_dir_content(test_dir))
+
+
+def test_iter_dir_content_nonexistent_directory():
+    """测试分批扫描在调用时就检查路径"""
+    with pytest.raises(NotADirectoryError):
+        iter_dir_content(Path("/nonexistent/path"))
+
+
 def test_large_directory_performance(benchmark, test_dir):
     """基准测试（需要pytest-benchmark）"""
     # 创建1000个测试文件
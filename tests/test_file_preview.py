@@ -0,0 +1,99 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from tkinter_file_manager.core.file_preview import (
+    MAX_LINE_BYTES, MappedFile, TextDocument, hex_lines, highlight
+)
+
+
+@pytest.fixture
+def root():
+    with TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        (root / "log.txt").write_bytes(b"".join(b"line %d\n" % i for i in range(1000)))
+        (root / "long.txt").write_bytes(b"a" * (MAX_LINE_BYTES * 2 + 10) + b"\nend\n")
+        (root / "offset_long.txt").write_bytes(b"short\n" + b"b" * (MAX_LINE_BYTES * 2 + 100) + b"\nend\n")
+        (root / "data.bin").write_bytes(bytes(range(256)))
+        (root / "empty.txt").touch()
+        yield root
+
+
+def test_lines_from_start_build_index(root):
+    """测试从开头读取行，并顺带建立行号索引"""
+    with MappedFile(root / "log.txt") as mapped:
+        doc = TextDocument(mapped)
+        lines = doc.lines(0, 3)
+        assert [text for _, text in lines] == ["line 0", "line 1", "line 2"]
+        assert doc.line_number(lines[2][0]) == 2
+
+        offset = doc.scroll(0, 10)
+        assert doc.lines(offset, 1)[0][1] == "line 10"
+        assert doc.line_number(offset) is None  # 跳过的行还没有索引
+
+
+def test_jump_to_middle(root):
+    """测试跳到任意字节位置时对齐到行首，并可以向上滚动"""
+    with MappedFile(root / "log.txt") as mapped:
+        doc = TextDocument(mapped)
+        start = doc.line_start(mapped.size // 2)
+        text = doc.lines(start, 1)[0][1]
+        previous = doc.lines(doc.scroll(start, -1), 1)[0][1]
+        assert int(previous.split()[1]) == int(text.split()[1]) - 1
+
+        last = doc.scroll(start, 10_000)
+        assert doc.lines(last, 5) == [(last, "line 999")]
+        assert doc.scroll(0, -5) == 0
+
+
+def test_long_lines_are_split(root):
+    """测试超长的行被切成 MAX_LINE_BYTES 的片段"""
+    with MappedFile(root / "long.txt") as mapped:
+        doc = TextDocument(mapped)
+        lines = doc.lines(0, 5)
+        assert [len(text) for _, text in lines] == [MAX_LINE_BYTES, MAX_LINE_BYTES, 10, 3]
+        assert doc.line_start(MAX_LINE_BYTES + 5) == MAX_LINE_BYTES
+
+
+def test_long_line_split_from_real_line_start(root):
+    """测试不从片段边界开始的超长行（超过 8 KiB）向下和向上切出的片段一致"""
+    with MappedFile(root / "offset_long.txt") as mapped:
+        doc = TextDocument(mapped)
+        lines = doc.lines(0, 10)
+        starts = [offset for offset, _ in lines]
+        assert starts == [0, 6, 6 + MAX_LINE_BYTES, 6 + 2 * MAX_LINE_BYTES, 6 + 2 * MAX_LINE_BYTES + 101]
+        assert [len(text) for _, text in lines] == [5, MAX_LINE_BYTES, MAX_LINE_BYTES, 100, 3]
+        for start in starts[1:]:
+            assert doc.line_start(start + 2) == start
+
+        doc = TextDocument(mapped)
+        offset = doc.line_start(mapped.size - 1)
+        upward = [offset]
+        while offset > 0:
+            offset = doc.scroll(offset, -1)
+            upward.append(offset)
+        assert upward[::-1] == starts
+
+
+def test_hex_and_binary_detection(root):
+    with MappedFile(root / "data.bin") as mapped:
+        assert mapped.is_binary()
+        lines = hex_lines(mapped, 64, 2)
+    assert lines[0] == "00000040  40 41 42 43 44 45 46 47 48 49 4a 4b 4c 4d 4e 4f  @ABCDEFGHIJKLMNO"
+    assert len(lines) == 2
+
+
+def test_empty_file(root):
+    with MappedFile(root / "empty.txt") as mapped:
+        assert not mapped.is_binary()
+        assert TextDocument(mapped).lines(0, 10) == []
+        assert hex_lines(mapped, 0, 10) == []
+
+
+def test_highlight():
+    """测试单行高亮"""
+    spans = highlight('def f(x): return "a" + 1  # note', ".py")
+    tags = {tag for tag, _, _ in spans}
+    assert tags == {"keyword", "string", "number", "comment"}
+    assert highlight("def f(): pass", ".txt") == []
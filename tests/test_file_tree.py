@@ -0,0 +1,69 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from tkinter_file_manager.core.file_operations import has_subdirs, list_subdirs
+from tkinter_file_manager.gui.components.file_tree import TreeModel
+
+
+@pytest.fixture
+def test_dir():
+    with TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        for sub in ("b", "A/x", "A/y", ".git"):
+            (root / sub).mkdir(parents=True)
+        (root / "file.txt").touch()
+        (root / "b" / "only_file.txt").touch()
+        yield root
+
+
+def test_list_subdirs(test_dir):
+    """测试只列出子目录，按名称不区分大小写排序"""
+    assert list_subdirs(test_dir) == [".git", "A", "b"]
+    assert list_subdirs(test_dir, include_hidden=False) == ["A", "b"]
+
+
+def test_has_subdirs(test_dir):
+    """测试子目录检查；只有文件、不存在的目录都视为没有"""
+    assert has_subdirs(test_dir)
+    assert not has_subdirs(test_dir / "b")
+    assert not has_subdirs(test_dir / "missing")
+    assert not has_subdirs(test_dir / "A" / "x")
+
+
+def test_expand_and_collapse(test_dir):
+    """测试展开、折叠只改动 visible 中节点下方的一段，重新展开时保留子节点的展开状态"""
+    model = TreeModel([str(test_dir)])
+    root = model.roots[0]
+    assert not model.expand(root)  # 子目录还没读取
+    model.set_children(root, list_subdirs(test_dir, include_hidden=False))
+    assert [node.name for node in model.visible] == [test_dir.name, "A", "b"]
+    assert root.has_children
+
+    a = model.find(str(test_dir / "A"))
+    model.expand(a)
+    model.set_children(a, list_subdirs(test_dir / "A"))
+    assert [node.name for node in model.visible] == [test_dir.name, "A", "x", "y", "b"]
+    assert model.visible[2].depth == 2
+
+    model.collapse(root)
+    assert model.visible == [root]
+    assert model.index(a) == -1
+    assert model.expand(root)
+    assert [node.name for node in model.visible] == [test_dir.name, "A", "x", "y", "b"]
+
+    model.collapse(a)
+    assert [node.name for node in model.visible] == [test_dir.name, "A", "b"]
+
+
+def test_children_loaded_while_collapsed(test_dir):
+    """测试读取完成前节点已被折叠时，子节点不插入 visible"""
+    model = TreeModel([str(test_dir)])
+    root = model.roots[0]
+    model.expand(root)
+    model.collapse(root)
+    model.set_children(root, ["A", "b"])
+    assert model.visible == [root]
+    assert model.expand(root)
+    assert len(model.visible) == 3
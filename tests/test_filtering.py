@@ -0,0 +1,68 @@
+from pathlib import Path
+
+import pytest
+
+from tkinter_file_manager.core.dir_listing import DirListing
+from tkinter_file_manager.core.filtering import ListingFilter
+
+
+@pytest.fixture
+def listing():
+    listing = DirListing(Path("/root"))
+    for name in ("Report.pdf", "report_old.pdf", "photo.png", "notes.txt", "REPORTS"):
+        listing.add(name, 0, 0.0, 0)
+    return listing
+
+
+def test_filter_case_insensitive(listing):
+    """测试不区分大小写的子串匹配，结果保持原顺序"""
+    f = ListingFilter()
+    assert f.apply(listing, "") is None
+    assert f.apply(listing, "rep") == [0, 1, 4]
+    assert f.apply(listing, "REPORT.") == [0]
+    assert f.apply(listing, "xyz") == []
+
+
+def test_filter_narrows_previous_result(listing):
+    """测试查询变长时只在上一次结果中筛选，删除字符时退回已有结果"""
+    f = ListingFilter()
+    first = f.apply(listing, "rep")
+    listing.names[2] = "reportage.png"  # 不在上一次结果里的行不会被重新检查
+    assert f.apply(listing, "repo") == [0, 1, 4]
+    assert f.apply(listing, "rep") is first
+
+
+def test_filter_follows_appended_rows(listing):
+    """测试追加条目后各级结果自动补全，原地修改后需要 invalidate"""
+    f = ListingFilter()
+    f.apply(listing, "re")
+    assert f.apply(listing, "rep") == [0, 1, 4]
+    listing.add("rep2.txt", 0, 0.0, 0)
+    assert f.apply(listing, "rep") == [0, 1, 4, 5]
+    assert f.apply(listing, "re") == [0, 1, 4, 5]
+
+    listing.delete(0)
+    f.invalidate()
+    assert f.apply(listing, "rep") == [0, 3, 4]
+
+
+def test_keystroke_rescans_only_previous_matches():
+    """测试继续输入时只在上一次的结果里筛选，不重新扫描整个列表"""
+    listing = DirListing(Path("/root"))
+    for i in range(20_000):
+        listing.add(f"file_{i:05d}.txt", 0, 0.0, 0)
+    f = ListingFilter()
+    assert len(f.apply(listing, "file_1")) == 10_000
+
+    class CountingKeys(list):
+        reads = 0
+
+        def __getitem__(self, index):
+            CountingKeys.reads += 1
+            return super().__getitem__(index)
+
+    f._keys = CountingKeys(f._keys)
+    assert f.apply(listing, "file_12") == list(range(12_000, 13_000))
+    assert CountingKeys.reads == 10_000
+    assert f.apply(listing, "file_123") == list(range(12_300, 12_400))
+    assert CountingKeys.reads == 11_000
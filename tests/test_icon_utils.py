@@ -0,0 +1,38 @@
+import subprocess
+import sys
+from unittest import mock
+
+from PIL import Image
+
+from tkinter_file_manager.gui.utils.icon_infos import ICON_SIZES
+from tkinter_file_manager.gui.utils.icon_utils import IconUtils
+
+
+def test_import_is_cheap():
+    """测试导入图标模块不会导入 Pillow 和 customtkinter"""
+    code = ("import sys; import tkinter_file_manager.gui.utils.icon_utils; "
+            "print('PIL' in sys.modules, 'customtkinter' in sys.modules)")
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.split() == ["False", "False"]
+
+
+def test_each_png_decoded_once():
+    """测试同一个 PNG 在不同扩展名和尺寸之间只解码一次"""
+    with mock.patch.object(Image, "open", wraps=Image.open) as image_open:
+        icons = IconUtils()
+        assert image_open.call_count == 0
+
+        small = icons.get_icon_by_ext(".js")
+        assert icons.get_icon_by_ext(".cpp") is small  # 两者都使用 code.png
+        medium = icons.get_icon_by_ext(".JS", "medium")
+        assert image_open.call_count == 1
+
+    assert small is not medium
+    assert medium.cget("size") == ICON_SIZES["medium"]
+
+
+def test_missing_icon_falls_back_to_file():
+    """测试没有对应图片的图标使用 file.png，并与 file 图标共享缓存"""
+    icons = IconUtils()
+    assert icons.get_icon_by_ext(".unknown-ext") is icons.get_icon_by_name("file")
+    assert icons.get_icon_by_name("no-such-icon") is icons.get_icon_by_name("file")
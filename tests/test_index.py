@@ -0,0 +1,109 @@
+import os
+import threading
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from tkinter_file_manager.core.index import FileIndex
+from tkinter_file_manager.core.search import SearchQuery
+
+
+@pytest.fixture
+def test_dir():
+    with TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir) / "data"
+        root.mkdir()
+        (root / "report.txt").write_text("x" * 10)
+        (root / "docs").mkdir()
+        (root / "docs" / "Report_2024.pdf").write_text("pdf")
+        (root / "docs" / "notes.md").write_text("notes")
+        yield root
+
+
+@pytest.fixture
+def file_index(test_dir):
+    index = FileIndex(test_dir.parent / "index.sqlite3")
+    yield index
+    index.close()
+
+
+def _names(index, root, text):
+    return sorted(index.query(root, SearchQuery.parse(text)).names)
+
+
+def test_build_and_query(file_index, test_dir):
+    """测试构建后按子串查询"""
+    assert file_index.build(test_dir) == 2
+    assert file_index.covers(test_dir / "docs")
+
+    assert _names(file_index, test_dir, "report") == [os.path.join("docs", "Report_2024.pdf"), "report.txt"]
+    assert _names(file_index, test_dir / "docs", "report") == ["Report_2024.pdf"]
+    assert _names(file_index, test_dir, "md") == [os.path.join("docs", "notes.md")]
+    assert _names(file_index, test_dir, "report size>5") == ["report.txt"]
+    assert _names(file_index, test_dir, "doc type:dir") == ["docs"]
+
+
+def test_rebuild_skips_unchanged_directories(file_index, test_dir):
+    """测试 mtime 未变化的目录不会重新读取"""
+    file_index.build(test_dir)
+    assert file_index.build(test_dir) == 0
+
+    (test_dir / "docs" / "new_report.txt").touch()
+    assert file_index.build(test_dir) == 1
+    assert os.path.join("docs", "new_report.txt") in _names(file_index, test_dir, "new_")
+
+
+def test_revisit_updates_changed_directory(file_index, test_dir):
+    """测试再次访问目录时增量更新，包括删除的子目录"""
+    file_index.build(test_dir)
+    (test_dir / "docs" / "notes.md").unlink()
+    (test_dir / "docs" / "Report_2024.pdf").unlink()
+    (test_dir / "docs").rmdir()
+    (test_dir / "fresh").mkdir()
+    (test_dir / "fresh" / "report_new.txt").touch()
+
+    assert file_index.revisit(test_dir)
+    file_index.flush(timeout=10)  # 新子目录在索引的工作线程中补全
+    assert _names(file_index, test_dir, "report") == [os.path.join("fresh", "report_new.txt"), "report.txt"]
+    assert not file_index.revisit(test_dir)
+
+
+def test_revisit_subtree_cancellable(file_index, test_dir):
+    """测试再次访问时的新子树补全可以取消，之后的 build 补全其余部分"""
+    file_index.build(test_dir)
+    deep = test_dir / "fresh"
+    for level in range(3):
+        deep = deep / f"level{level}"
+        deep.mkdir(parents=True)
+        (deep / f"report_{level}.txt").touch()
+
+    cancel = threading.Event()
+    cancel.set()
+    assert file_index.revisit(test_dir, cancel)
+    file_index.flush(timeout=10)
+    assert not any("level" in name for name in _names(file_index, test_dir, "report_"))
+
+    assert not file_index.build_subtree(str(test_dir / "fresh"), cancel)
+    assert file_index.build_subtree(str(test_dir / "fresh"))
+    assert sum("level" in name for name in _names(file_index, test_dir, "report_")) == 3
+
+
+def test_status(file_index, test_dir):
+    """测试索引状态"""
+    file_index.build(test_dir)
+    status = file_index.status()
+
+    assert status["dirs"] == 2
+    assert status["files"] == 4
+    assert status["roots"][0]["path"] == os.path.realpath(test_dir)
+    assert status["roots"][0]["built_at"] <= time.time()
+
+
+def test_unsupported_query(file_index, test_dir):
+    """测试 glob 查询需要遍历磁盘"""
+    query = SearchQuery.parse("*.txt")
+    assert not file_index.supports(query)
+    with pytest.raises(ValueError):
+        file_index.query(test_dir, query)
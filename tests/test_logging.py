@@ -0,0 +1,102 @@
+import io
+import json
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from tkinter_file_manager.core.scanner import ScanExecutor
+from tkinter_file_manager.utils.logging import Tracer, format_summary, tracer
+
+
+def test_disabled_records_nothing():
+    """测试关闭时 span 和装饰器都不记录，装饰的函数照常返回"""
+    t = Tracer()
+    with t.span("scan"):
+        pass
+
+    @t.traced()
+    def add(a, b):
+        return a + b
+
+    assert add(1, 2) == 3
+    assert t.spans() == []
+
+
+def test_spans_and_ring_buffer():
+    """测试 span 记录名称、参数和耗时，缓冲区写满后丢弃最早的记录"""
+    t = Tracer(capacity=3, enabled=True)
+    with t.span("scan", "io", path="/tmp"):
+        time.sleep(0.01)
+
+    @t.traced("sort")
+    def work():
+        return "done"
+
+    assert work() == "done"
+    first = t.spans()[0]
+    assert (first.name, first.category, first.args) == ("scan", "io", {"path": "/tmp"})
+    assert first.duration >= 0.01
+    for _ in range(3):
+        work()
+    assert [span.name for span in t.spans()] == ["sort"] * 3
+
+
+def test_summary_since_mark():
+    """测试按名称汇总某个时间点之后的耗时"""
+    t = Tracer(enabled=True)
+    t.record("scan", "io", 0.0, 5.0)
+    t.mark("navigation")
+    start = time.perf_counter()
+    t.record("scan", "io", start, 0.004)
+    t.record("render", "app", start, 0.010)
+    t.record("scan", "io", start, 0.002)
+    summary = t.summary("navigation")
+    assert list(summary) == ["render", "scan"]
+    assert abs(summary["scan"] - 0.006) < 1e-9
+    assert format_summary(summary) == "render 10.0 ms · scan 6.0 ms"
+
+
+def test_chrome_trace_export():
+    """测试导出的 JSON 符合 Chrome trace 的完整事件格式（微秒）"""
+    t = Tracer(enabled=True)
+    t.record("scan", "io", 1.5, 0.25, {"path": Path("/tmp")})
+    out = io.StringIO()
+    t.export_chrome(out)
+    event = json.loads(out.getvalue())["traceEvents"][0]
+    assert event["ph"] == "X" and event["name"] == "scan" and event["cat"] == "io"
+    assert event["ts"] == 1.5e6 and event["dur"] == 0.25e6
+    assert event["args"] == {"path": "/tmp"}
+
+
+def test_disabled_skips_timing(monkeypatch):
+    """测试关闭时装饰器直接调用原函数，不读取时钟也不记录"""
+    t = Tracer()
+    calls = []
+    monkeypatch.setattr("tkinter_file_manager.utils.logging.time.perf_counter",
+                        lambda: calls.append("clock") or 0.0)
+    monkeypatch.setattr(t, "record", lambda *args, **kwargs: calls.append("record"))
+
+    wrapped = t.traced()(lambda x: x * 2)
+    assert [wrapped(i) for i in range(1000)] == [i * 2 for i in range(1000)]
+    assert calls == []
+
+
+def test_scan_is_traced():
+    """测试开启计时后后台扫描和回调派发都留下记录"""
+    tracer.enable()
+    tracer.clear()
+    executor = ScanExecutor()
+    try:
+        with TemporaryDirectory() as tmpdir:
+            done = []
+            executor.submit(Path(tmpdir), on_done=done.append)
+            deadline = time.monotonic() + 5
+            while not done and time.monotonic() < deadline:
+                executor.drain()
+                time.sleep(0.01)
+        names = {span.name for span in tracer.spans()}
+        assert {"scan", "sort", "dispatch"} <= names
+    finally:
+        tracer.disable()
+        tracer.clear()
+        executor.shutdown()
@@ -0,0 +1,123 @@
+import os
+import threading
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from tkinter_file_manager.core.dir_cache import DirListingCache
+from tkinter_file_manager.core.scanner import ScanExecutor
+from tkinter_file_manager.gui.event_bus import EventBus
+
+
+@pytest.fixture
+def executor():
+    executor = ScanExecutor(max_workers=2, batch_size=4)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.fixture
+def test_dir():
+    with TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        for i in range(10):
+            (root / f"file_{i}.txt").touch()
+        (root / "sub").mkdir()
+        yield root
+
+
+def _drain_until(executor, predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise TimeoutError
+        executor.drain()
+        time.sleep(0.005)
+
+
+def test_results_delivered_on_draining_thread(executor, test_dir):
+    """测试回调在调用 drain 的线程中执行"""
+    batches, done, threads = [], [], set()
+
+    def on_batch(batch):
+        threads.add(threading.get_ident())
+        batches.append(batch)
+
+    def on_done(files):
+        threads.add(threading.get_ident())
+        done.append(files)
+
+    executor.submit(test_dir, on_batch=on_batch, on_done=on_done)
+    _drain_until(executor, lambda: done)
+
+    assert threads == {threading.get_ident()}
+    assert sum(len(batch) for batch in batches) == 11
+    assert done[0][0]["name"] == "sub"
+
+
+def test_attached_results_go_through_event_bus(executor, test_dir):
+    """测试 attach 之后结果由事件总线派发，投递后才取消的扫描结果被丢弃"""
+    bus = EventBus(coalesce=())
+    executor.attach(bus.call)
+    done = []
+    executor.submit(test_dir, on_done=done.append)
+    deadline = time.monotonic() + 5
+    while not done and time.monotonic() < deadline:
+        bus.drain()
+        time.sleep(0.005)
+    assert len(done[0]) == 11
+    assert executor.drain() == 0  # 自己的队列不再使用
+
+    cancelled = []
+    task = executor.submit(test_dir, on_done=cancelled.append)
+    deadline = time.monotonic() + 5
+    while bus.empty() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    task.cancel()
+    bus.drain()
+    assert cancelled == []
+
+
+def test_newer_scan_supersedes_older(executor, test_dir):
+    """测试同一 key 的新扫描会丢弃旧扫描的结果"""
+    done = []
+
+    first = executor.submit(test_dir, on_done=lambda files: done.append("first"), key="list")
+    time.sleep(0.1)  # 让旧扫描完成，结果停留在队列中
+    executor.submit(test_dir / "sub", on_done=lambda files: done.append("second"), key="list")
+    _drain_until(executor, lambda: done)
+    time.sleep(0.05)
+    executor.drain()
+
+    assert first.cancelled
+    assert done == ["second"]
+
+
+def test_scan_error_reported(executor):
+    """测试扫描错误通过 on_error 回调返回"""
+    errors = []
+    executor.submit(Path("/nonexistent/path"), on_error=errors.append)
+    _drain_until(executor, lambda: errors)
+
+    assert isinstance(errors[0], NotADirectoryError)
+
+
+def test_cached_listing_reused(test_dir):
+    """测试目录未变化时第二次扫描直接使用缓存"""
+    past = time.time() - 60
+    os.utime(test_dir, (past, past))
+    cache = DirListingCache()
+    executor = ScanExecutor(cache=cache)
+    try:
+        for _ in range(2):
+            batches, done = [], []
+            executor.submit(test_dir, on_batch=batches.append, on_done=done.append)
+            _drain_until(executor, lambda: done)
+    finally:
+        executor.shutdown()
+
+    assert batches == []
+    assert len(done[0]) == 11
+    assert cache.stats()["hits"] == 1
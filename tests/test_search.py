@@ -0,0 +1,95 @@
+import os
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from tkinter_file_manager.core.search import SearchEngine, SearchQuery, MODE_GLOB, MODE_REGEX
+
+
+@pytest.fixture
+def test_dir():
+    with TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        (root / "report.txt").write_text("x" * 100)
+        (root / "docs").mkdir()
+        (root / "docs" / "Report_2024.PDF").write_text("pdf")
+        (root / "docs" / "deep").mkdir()
+        (root / "docs" / "deep" / "report_old.txt").write_text("old")
+        (root / "docs" / "deep" / "notes.md").write_text("notes")
+        (root / "reports").mkdir()
+        yield root
+
+
+def _search(root, query, max_workers=4):
+    batches = []
+    task = SearchEngine(max_workers=max_workers).search(root, query, batches.append)
+    assert task.wait(5)
+    names = sorted(name for batch in batches for name in batch.names)
+    return task, names
+
+
+def test_substring_case_insensitive(test_dir):
+    """测试子串匹配默认不区分大小写"""
+    _task, names = _search(test_dir, SearchQuery("report"))
+    assert names == sorted([
+        "report.txt",
+        os.path.join("docs", "Report_2024.PDF"),
+        os.path.join("docs", "deep", "report_old.txt"),
+        "reports",
+    ])
+
+
+def test_glob_and_regex(test_dir):
+    """测试 glob 与正则匹配"""
+    _task, names = _search(test_dir, SearchQuery("*.txt", mode=MODE_GLOB))
+    assert names == sorted(["report.txt", os.path.join("docs", "deep", "report_old.txt")])
+
+    _task, names = _search(test_dir, SearchQuery(r"_\d{4}\.", mode=MODE_REGEX))
+    assert names == [os.path.join("docs", "Report_2024.PDF")]
+
+
+def test_filters(test_dir):
+    """测试类型和大小过滤"""
+    _task, names = _search(test_dir, SearchQuery("report", kind="dir"))
+    assert names == ["reports"]
+
+    _task, names = _search(test_dir, SearchQuery("report", min_size=10))
+    assert names == ["report.txt"]
+
+
+def test_max_depth(test_dir):
+    """测试深度限制"""
+    _task, names = _search(test_dir, SearchQuery("report", max_depth=0))
+    assert names == ["report.txt", "reports"]
+
+
+def test_max_results(test_dir):
+    """测试结果数量限制"""
+    task, names = _search(test_dir, SearchQuery("", max_results=3), max_workers=1)
+    assert len(names) == 3
+    assert task.truncated and task.count == 3
+
+
+def test_cancel(test_dir):
+    """测试取消后搜索尽快结束"""
+    for i in range(200):
+        (test_dir / f"dir_{i}").mkdir()
+    engine = SearchEngine(max_workers=2)
+    task = engine.search(test_dir, SearchQuery("dir"), lambda batch: time.sleep(0.01))
+    task.cancel()
+    assert task.wait(5)
+    assert task.cancelled
+
+
+def test_parse_query():
+    """测试搜索框语法"""
+    query = SearchQuery.parse("*.log size>1.5K type:file after:2024-01-01")
+    assert query.mode == MODE_GLOB
+    assert query.pattern == "*.log"
+    assert query.min_size == 1536
+    assert query.kind == "file"
+    assert query.modified_after is not None
+
+    assert SearchQuery.parse("re:^a.+b$").mode == MODE_REGEX
@@ -0,0 +1,121 @@
+import random
+from pathlib import Path
+
+import pytest
+
+from tkinter_file_manager.core.dir_listing import DirListing, FLAG_DIR
+from tkinter_file_manager.core.sorting import (
+    SortSpec, Sorter, natural_key, SORT_NAME, SORT_SIZE, SORT_MTIME, SORT_EXTENSION, SORT_TYPE
+)
+
+
+@pytest.fixture
+def listing():
+    listing = DirListing(Path("/root"))
+    listing.add("file10.txt", 300, 3.0, 0)
+    listing.add("File2.txt", 100, 1.0, 0)
+    listing.add("b.png", 200, 2.0, 0)
+    listing.add("a.png", 200, 5.0, 0)
+    listing.add("docs", 0, 4.0, FLAG_DIR)
+    listing.add("Apps", 0, 6.0, FLAG_DIR)
+    listing.add("c.jpg", 50, 0.5, 0)
+    return listing
+
+
+def test_sort_by_name(listing):
+    """测试按名称排序，目录始终在前；降序只反转同类条目"""
+    sorter = Sorter()
+    assert sorter.sort(listing, SortSpec()).names == [
+        "Apps", "docs", "a.png", "b.png", "c.jpg", "file10.txt", "File2.txt"]
+    assert sorter.sort(listing, SortSpec(descending=True)).names == [
+        "docs", "Apps", "File2.txt", "file10.txt", "c.jpg", "b.png", "a.png"]
+    assert sorter.sort(listing, SortSpec(natural=True)).names[-2:] == ["File2.txt", "file10.txt"]
+
+
+def test_sort_by_other_columns(listing):
+    """测试按大小、时间、扩展名和类型排序，相同值按名称排列"""
+    sorter = Sorter(type_key=lambda ext: "image" if ext in (".png", ".jpg") else "document")
+    assert sorter.sort(listing, SortSpec(SORT_SIZE)).names == [
+        "Apps", "docs", "c.jpg", "File2.txt", "a.png", "b.png", "file10.txt"]
+    assert sorter.sort(listing, SortSpec(SORT_MTIME, descending=True)).names == [
+        "Apps", "docs", "a.png", "file10.txt", "b.png", "File2.txt", "c.jpg"]
+    assert sorter.sort(listing, SortSpec(SORT_EXTENSION)).names[2:] == [
+        "c.jpg", "a.png", "b.png", "file10.txt", "File2.txt"]
+    assert sorter.sort(listing, SortSpec(SORT_TYPE)).names[2:] == [
+        "file10.txt", "File2.txt", "a.png", "b.png", "c.jpg"]
+
+
+def test_ranks_reused_after_resort(listing):
+    """测试缓存的名次在排序后仍然对应正确的行"""
+    sorter = Sorter()
+    by_size = sorter.sort(listing, SortSpec(SORT_SIZE))
+    by_name = sorter.sort(by_size, SortSpec(SORT_NAME))
+    assert by_name.names == Sorter().sort(listing, SortSpec()).names
+    assert len(sorter._ranks) == 2
+    assert sorter.sort(by_name, SortSpec(SORT_SIZE)).names == by_size.names
+
+
+def test_upsert_keeps_order(listing):
+    """测试插入和更新条目时按当前排序方式定位"""
+    for spec in (SortSpec(), SortSpec(SORT_SIZE, descending=True), SortSpec(SORT_MTIME), SortSpec(natural=True)):
+        sorter = Sorter()
+        sorted_listing = sorter.sort(listing, spec)
+        entries = DirListing(Path("/root"))
+        entries.add("file3.txt", 150, 2.5, 0)
+        entries.add("b.png", 1000, 9.0, 0)  # 已有条目的大小和时间变化
+        entries.add("Docs2", 0, 1.0, FLAG_DIR)
+        sorter.upsert(sorted_listing, entries, spec)
+
+        expected = listing.copy()
+        expected.remove_names(["b.png"])
+        expected.extend(entries)
+        assert sorted_listing.names == Sorter().sort(expected, spec).names
+        assert sorted_listing.sizes[sorted_listing.index_of("b.png")] == 1000
+
+
+def test_size_sort_uses_dir_sizes(listing):
+    """测试按大小排序时文件夹按递归大小排列，新结果到达后只重排目录块"""
+    sizes = {"docs": 500}
+    sorter = Sorter(dir_sizes=sizes)
+    by_size = sorter.sort(listing, SortSpec(SORT_SIZE, descending=True))
+    assert by_size.names[:2] == ["docs", "Apps"]
+    files = by_size.names[2:]
+
+    sizes["Apps"] = 900
+    assert sorter.update_dir_sizes(by_size, SortSpec(SORT_SIZE, descending=True))
+    assert by_size.names[:2] == ["Apps", "docs"]
+    assert by_size.names[2:] == files
+    assert by_size.names == Sorter(dir_sizes=sizes).sort(listing, SortSpec(SORT_SIZE, descending=True)).names
+    # 缓存的名称名次随目录块一起重排
+    assert sorter.sort(by_size, SortSpec()).names == Sorter().sort(listing, SortSpec()).names
+    assert not sorter.update_dir_sizes(by_size, SortSpec())
+
+
+def test_natural_key():
+    assert natural_key("img12.png") > natural_key("IMG2.png")
+    assert sorted(["a10", "a2", "a1b", "b"], key=natural_key) == ["a1b", "a2", "a10", "b"]
+
+
+def test_unknown_column():
+    with pytest.raises(ValueError):
+        SortSpec("owner")
+
+
+def test_large_resort(benchmark):
+    """基准测试：50 万条目在已缓存名次时切换排序方向"""
+    listing = DirListing(Path("/root"))
+    rng = random.Random(0)
+    for i in range(500_000):
+        listing.add(f"file_{rng.randrange(10 ** 9)}.txt", rng.randrange(10 ** 6), rng.random(), 0)
+    sorter = Sorter()
+    state = {"listing": sorter.sort(listing, SortSpec(SORT_SIZE)), "descending": False}
+
+    def toggle():
+        state["descending"] = not state["descending"]
+        state["listing"] = sorter.sort(state["listing"], SortSpec(SORT_SIZE, state["descending"]))
+
+    benchmark.pedantic(toggle, rounds=3, iterations=1)
+    sizes = state["listing"].sizes
+    assert state["descending"]  # 3 次切换之后是降序
+    assert sizes[0] >= sizes[-1]
+    assert all(sizes[i] >= sizes[i + 1] for i in range(len(sizes) - 1))
@@ -0,0 +1,18 @@
+from tkinter_file_manager.utils import startup
+
+
+def test_heavy_modules_deferred():
+    """测试启动时不导入只在搜索、查重、索引时才需要的模块"""
+    loaded = set(startup.loaded_modules())
+    assert startup.ENTRY_MODULE in loaded
+    assert loaded.isdisjoint(startup.DEFERRED_MODULES)
+
+
+def test_import_profile_parsed():
+    """测试 -X importtime 输出的解析"""
+    timings = startup.import_profile("json")
+    modules = {timing.module: timing for timing in timings}
+    assert "json.decoder" in modules
+    assert modules["json"].depth == 0
+    assert modules["json"].cumulative >= modules["json.decoder"].cumulative
+
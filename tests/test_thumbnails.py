@@ -0,0 +1,117 @@
+import threading
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+from PIL import Image
+
+from tkinter_file_manager.core.thumbnails import ThumbnailService, can_thumbnail
+
+
+@pytest.fixture
+def root():
+    with TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        Image.new("RGB", (2000, 1500), "red").save(root / "photo.jpg", quality=90)
+        Image.new("RGBA", (300, 300), (0, 0, 255, 128)).save(root / "alpha.png")
+        Image.new("RGB", (800, 600), "green").convert("P").save(root / "palette.gif")
+        Image.new("RGB", (800, 600), "green").convert("P").save(root / "palette.png")
+        Image.new("1", (800, 600), 1).save(root / "bilevel.png")
+        (root / "broken.jpg").write_bytes(b"not an image")
+        yield root
+
+
+@pytest.fixture
+def service(root):
+    service = ThumbnailService(max_workers=1, cache_dir=root / "cache")
+    yield service
+    service.shutdown()
+
+
+def _key(service, path, box=(128, 128)):
+    st = path.stat()
+    return service.key(path, st.st_mtime, st.st_size, box)
+
+
+def _request(service, key, timeout=30):
+    results = []
+    done = threading.Event()
+
+    def on_ready(image):
+        results.append(image)
+        done.set()
+
+    service.request(key, on_ready)
+    assert done.wait(timeout)
+    return results[0]
+
+
+def test_thumbnail_fits_box(service, root):
+    """测试缩略图缩小到目标尺寸以内并保持比例，透明通道保留"""
+    image = _request(service, _key(service, root / "photo.jpg"))
+    assert image.size == (128, 96)
+    assert image.getpixel((10, 10))[0] > 200
+
+    image = _request(service, _key(service, root / "alpha.png", (64, 64)))
+    assert image.mode == "RGBA"
+    assert image.size == (64, 64)
+
+
+@pytest.mark.parametrize("name", ["palette.gif", "palette.png", "bilevel.png"])
+def test_thumbnail_non_rgb_modes(service, root, name):
+    """测试调色板和 1 位图片（需要整数倍缩小时）也能生成缩略图"""
+    image = _request(service, _key(service, root / name, (64, 64)))
+    assert image is not None
+    assert image.mode == "RGB"
+    assert image.size == (64, 48)
+
+
+def test_memory_and_disk_cache(service, root):
+    """测试结果进入内存缓存和磁盘缓存，新的服务实例可以直接读取磁盘缓存"""
+    key = _key(service, root / "photo.jpg")
+    _request(service, key)
+    found, image = service.lookup(key)
+    assert found and image.size == (128, 96)
+    assert len(list((root / "cache").rglob("*.png"))) == 1
+
+    (root / "photo.jpg").unlink()  # 原图不在了，只能来自磁盘缓存
+    other = ThumbnailService(max_workers=1, cache_dir=root / "cache")
+    try:
+        assert _request(other, key).size == (128, 96)
+    finally:
+        other.shutdown()
+
+
+def test_undecodable_file_remembered(service, root):
+    """测试无法解码的文件返回 None，并且记住结果"""
+    key = _key(service, root / "broken.jpg")
+    assert _request(service, key) is None
+    assert service.lookup(key) == (True, None)
+
+
+def test_cancelled_request_not_delivered(service, root):
+    """测试取消的请求不会回调"""
+    results = []
+    request = service.request(_key(service, root / "photo.jpg"), results.append)
+    request.cancel()
+    # 之后的请求完成时，被取消的请求要么没有执行，要么结果被丢弃
+    _request(service, _key(service, root / "alpha.png"))
+
+    assert results == []
+
+
+def test_lru_bounded(root):
+    """测试内存缓存不超过容量上限"""
+    service = ThumbnailService(max_workers=1, cache_dir=None, max_bytes=128 * 96 * 3 + 1)
+    try:
+        first = _key(service, root / "photo.jpg")
+        _request(service, first)
+        _request(service, _key(service, root / "photo.jpg", (100, 100)))
+        assert service.lookup(first) == (False, None)
+    finally:
+        service.shutdown()
+
+
+def test_can_thumbnail():
+    assert can_thumbnail("a.JPG")
+    assert not can_thumbnail("a.txt")
@@ -0,0 +1,145 @@
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+import pytest
+
+from tkinter_file_manager.core import file_operations
+from tkinter_file_manager.core.file_operations import TransferEngine
+
+
+@pytest.fixture
+def engine():
+    engine = TransferEngine(max_workers=4)
+    yield engine
+    engine.shutdown()
+
+
+@pytest.fixture
+def dirs():
+    with TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        src = root / "src"
+        dst = root / "dst"
+        src.mkdir()
+        dst.mkdir()
+        tree = src / "tree"
+        (tree / "a" / "b").mkdir(parents=True)
+        for i in range(50):
+            (tree / f"small_{i}.txt").write_text(f"content {i}")
+        (tree / "a" / "b" / "deep.bin").write_bytes(os.urandom(300_000))
+        (tree / "link").symlink_to("small_0.txt")
+        (src / "single.txt").write_text("single")
+        yield src, dst
+
+
+def _run(task):
+    assert task.wait(10)
+    return task
+
+
+def test_copy_tree(engine, dirs):
+    """测试递归复制目录，内容、符号链接和修改时间都保留"""
+    src, dst = dirs
+    os.utime(src / "tree" / "small_1.txt", (1_000_000, 1_000_000))
+    task = _run(engine.copy([src / "tree", src / "single.txt"], dst))
+
+    assert task.errors == []
+    assert (dst / "single.txt").read_text() == "single"
+    assert (dst / "tree" / "small_7.txt").read_text() == "content 7"
+    assert (dst / "tree" / "a" / "b" / "deep.bin").read_bytes() == (src / "tree" / "a" / "b" / "deep.bin").read_bytes()
+    assert os.readlink(dst / "tree" / "link") == "small_0.txt"
+    assert (dst / "tree" / "small_1.txt").stat().st_mtime == 1_000_000
+    assert (src / "tree").exists()
+
+    progress = task.progress()
+    assert progress.done_files == progress.total_files == 53
+    assert progress.done_bytes == progress.total_bytes
+    assert not progress.planning
+
+
+def test_buffered_fallback(engine, dirs):
+    """测试内核复制不可用时退回到缓冲区读写"""
+    src, dst = dirs
+    with mock.patch.object(file_operations, "_KERNEL_COPIES", []):
+        task = _run(engine.copy([src / "tree"], dst))
+
+    assert task.errors == []
+    assert (dst / "tree" / "a" / "b" / "deep.bin").read_bytes() == (src / "tree" / "a" / "b" / "deep.bin").read_bytes()
+
+
+def test_existing_target_not_overwritten(engine, dirs):
+    """测试目标已存在时默认报错，overwrite=True 时替换"""
+    src, dst = dirs
+    (dst / "single.txt").write_text("old")
+
+    task = _run(engine.copy([src / "single.txt"], dst))
+    assert isinstance(task.errors[0][1], FileExistsError)
+    assert (dst / "single.txt").read_text() == "old"
+
+    task = _run(engine.copy([src / "single.txt"], dst, overwrite=True))
+    assert task.errors == []
+    assert (dst / "single.txt").read_text() == "single"
+
+
+def test_copy_into_itself_rejected(engine, dirs):
+    """测试不能把目录复制到它自己里面"""
+    src, _ = dirs
+    task = _run(engine.copy([src / "tree"], src / "tree" / "a"))
+
+    assert isinstance(task.errors[0][1], ValueError)
+    assert not (src / "tree" / "a" / "tree").exists()
+
+
+def test_move_same_filesystem_renames(engine, dirs):
+    """测试同一文件系统内移动只做 rename"""
+    src, dst = dirs
+    inode = (src / "tree").stat().st_ino
+    task = _run(engine.move([src / "tree"], dst))
+
+    assert task.errors == []
+    assert not (src / "tree").exists()
+    assert (dst / "tree").stat().st_ino == inode
+
+
+def test_move_across_devices_copies_then_removes(engine, dirs):
+    """测试跨设备移动时先复制再删除源"""
+    src, dst = dirs
+
+    def replace(source, target):
+        raise OSError(18, "Invalid cross-device link")  # EXDEV
+
+    with mock.patch.object(file_operations.os, "replace", replace):
+        task = _run(engine.move([src / "tree"], dst))
+
+    assert task.errors == []
+    assert not (src / "tree").exists()
+    assert (dst / "tree" / "small_3.txt").read_text() == "content 3"
+
+
+def test_progress_is_throttled(engine, dirs):
+    """测试进度按时间间隔汇总报告，而不是每个文件一次"""
+    src, dst = dirs
+    reports = []
+    task = _run(engine.copy([src / "tree"], dst, on_progress=reports.append))
+
+    assert len(reports) < 10
+    assert reports[-1].done_files == 52
+    assert reports[-1].bytes_per_sec > 0
+
+
+def test_cancel_leaves_no_partial_file(engine, dirs):
+    """测试取消后不留下不完整的文件"""
+    src, dst = dirs
+    big = src / "big.bin"
+    big.write_bytes(os.urandom(4 * 1024 * 1024))
+
+    with mock.patch.object(file_operations, "_KERNEL_COPIES", []), \
+            mock.patch.object(file_operations, "BUFFER_SIZE", 64 * 1024):
+        task = engine.copy([big], dst, on_progress=lambda p: task.cancel())
+        task._interval = 0
+        _run(task)
+
+    assert task.cancelled
+    assert not (dst / "big.bin").exists()
@@ -0,0 +1,148 @@
+import os
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from tkinter_file_manager.core.watcher import (
+    DiffCoalescer, InotifyWatcher, PollBudget, PollingWatcher, POLLING_FS_TYPES,
+    inotify_available, needs_polling, _mount_fs_type,
+)
+
+
+@pytest.fixture
+def test_dir():
+    with TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        (root / "old.txt").write_text("old")
+        yield root
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise TimeoutError
+        time.sleep(0.01)
+
+
+def test_coalescer_collapses_events(test_dir):
+    """测试合并后的变化只反映最终状态"""
+    coalescer = DiffCoalescer()
+
+    (test_dir / "new.txt").write_text("new")
+    coalescer.touch(test_dir, "new.txt", existed_before=False)
+    coalescer.touch(test_dir, "new.txt", existed_before=True)
+    coalescer.touch(test_dir, "temp.txt", existed_before=False)  # 创建后又被删除
+    coalescer.touch(test_dir, "old.txt", existed_before=True)
+    coalescer.touch(test_dir, "gone.txt", existed_before=True)
+
+    [diff] = coalescer.flush()
+
+    assert diff.added.names == ["new.txt"]
+    assert diff.added.sizes[0] == 3
+    assert diff.changed.names == ["old.txt"]
+    assert diff.removed == ["gone.txt"]
+    assert not coalescer
+
+
+def test_coalescer_rescan(test_dir):
+    """测试需要整体重新扫描的目录"""
+    coalescer = DiffCoalescer()
+    coalescer.touch(test_dir, "old.txt", existed_before=True)
+    coalescer.request_rescan(test_dir)
+
+    [diff] = coalescer.flush()
+
+    assert diff.rescan
+
+
+@pytest.mark.skipif(not inotify_available(), reason="需要 inotify")
+def test_inotify_watcher_reports_changes(test_dir):
+    """测试 inotify 事件被合并为一次变化"""
+    diffs = []
+    watcher = InotifyWatcher(diffs.append, debounce=0.05)
+    try:
+        watcher.add(test_dir)
+        (test_dir / "a.txt").write_text("a")
+        (test_dir / "tmp.txt").touch()
+        os.remove(test_dir / "tmp.txt")
+        os.rename(test_dir / "old.txt", test_dir / "renamed.txt")
+        _wait_for(lambda: diffs)
+    finally:
+        watcher.close()
+
+    [diff] = diffs
+    assert diff.path == test_dir
+    assert sorted(diff.added.names) == ["a.txt", "renamed.txt"]
+    assert diff.removed == ["old.txt"]
+
+
+@pytest.mark.skipif(not inotify_available(), reason="需要 inotify")
+def test_inotify_watcher_remove(test_dir):
+    """测试取消监视后不再报告变化"""
+    diffs = []
+    watcher = InotifyWatcher(diffs.append, debounce=0.01)
+    try:
+        watcher.add(test_dir)
+        watcher.remove(test_dir)
+        (test_dir / "a.txt").touch()
+        time.sleep(0.1)
+    finally:
+        watcher.close()
+
+    assert diffs == []
+    assert watcher.watched() == []
+
+
+def test_polling_watcher_reports_changes(test_dir):
+    """测试轮询监视器在目录 mtime 变化后产生同样格式的变化"""
+    diffs = []
+    watcher = PollingWatcher(diffs.append, budget=PollBudget(fraction=1.0))
+    watcher.ACTIVE_INTERVALS = (0.02, 0.05)
+    try:
+        watcher.add(test_dir)
+        time.sleep(0.1)
+        (test_dir / "a.txt").write_text("a")
+        os.remove(test_dir / "old.txt")
+        _wait_for(lambda: diffs)
+    finally:
+        watcher.close()
+
+    [diff] = diffs
+    assert diff.added.names == ["a.txt"]
+    assert diff.removed == ["old.txt"]
+
+
+def test_polling_backs_off_when_quiet(test_dir):
+    """测试目录没有变化时轮询间隔逐步加倍"""
+    watcher = PollingWatcher(lambda diff: None, budget=PollBudget(fraction=1.0))
+    watcher.ACTIVE_INTERVALS = (0.01, 0.08)
+    try:
+        watcher.add(test_dir)
+        time.sleep(0.3)
+        polled = watcher._dirs[test_dir]
+        assert polled.interval == 0.08
+
+        watcher.set_active(test_dir, False)
+        assert polled.interval == PollingWatcher.BACKGROUND_INTERVALS[0]
+    finally:
+        watcher.close()
+
+
+def test_poll_budget_defers_polling():
+    """测试超出预算后需要等待"""
+    budget = PollBudget(fraction=0.1, burst=0.01)
+    assert budget.wait_time() == 0.0
+
+    budget.charge(0.11)
+
+    assert budget.wait_time() == pytest.approx(1.0, abs=0.05)
+
+
+def test_needs_polling_for_local_tmp(test_dir):
+    """测试本地临时目录在有 inotify 时不需要轮询"""
+    if not inotify_available() or _mount_fs_type(str(test_dir)) in POLLING_FS_TYPES:
+        pytest.skip("临时目录不在本地文件系统上")
+    assert not needs_polling(test_dir)
@@ -1,6 +1,81 @@
+import argparse
 import sys
-from pytest import main as pytest_main
+import time
+from datetime import datetime
+from pathlib import Path
 
 def test():
     """包装pytest的入口函数"""
-    sys.exit(pytest_main())
\ No newline at end of file
+    from pytest import main as pytest_main
+    sys.exit(pytest_main())
+
+
+def index(argv=None):
+    """文件名索引的命令行入口：查看状态、构建、重建、删除和查询"""
+    parser = argparse.ArgumentParser(prog="tfm-index", description="Manage the persistent filename index")
+    parser.add_argument("--db", type=Path, default=None, help="index database path")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("status", help="show index status")
+    for name in ("build", "rebuild", "remove"):
+        command = commands.add_parser(name, help=f"{name} the index for a directory")
+        command.add_argument("root", type=Path)
+    search = commands.add_parser("search", help="query the index")
+    search.add_argument("root", type=Path)
+    search.add_argument("text")
+    args = parser.parse_args(argv)
+
+    from tkinter_file_manager.core.index import FileIndex, DEFAULT_INDEX_PATH
+    from tkinter_file_manager.core.search import SearchQuery
+
+    file_index = FileIndex(args.db or DEFAULT_INDEX_PATH)
+    try:
+        if args.command == "status":
+            status = file_index.status()
+            print(f"Index: {status['db_path']} ({status['db_bytes']:,} bytes)")
+            print(f"Directories: {status['dirs']:,}  Entries: {status['files']:,}")
+            for root in status["roots"]:
+                built = root["built_at"]
+                built = datetime.fromtimestamp(built).strftime("%Y-%m-%d %H:%M") if built else "incomplete"
+                print(f"  {root['path']}  (built: {built})")
+        elif args.command in ("build", "rebuild"):
+            started = time.perf_counter()
+            build = file_index.rebuild if args.command == "rebuild" else file_index.build
+            rescanned = build(args.root)
+            print(f"Indexed {args.root}: {rescanned:,} directories read in {time.perf_counter() - started:.1f}s")
+        elif args.command == "remove":
+            file_index.remove_root(args.root)
+        elif args.command == "search":
+            started = time.perf_counter()
+            results = file_index.query(args.root, SearchQuery.parse(args.text))
+            for name in results.names:
+                print(name)
+            print(f"{len(results):,} results in {(time.perf_counter() - started) * 1000:.1f} ms", file=sys.stderr)
+    finally:
+        file_index.close()
+
+
+def startup(argv=None):
+    """启动耗时分析：按模块列出导入耗时，有显示环境（或 Xvfb）时再测量到第一帧的时间"""
+    parser = argparse.ArgumentParser(prog="tfm-startup", description="Profile application startup time")
+    parser.add_argument("--top", type=int, default=20, help="number of modules to list")
+    parser.add_argument("--module", default=None, help="module to import instead of the application entry point")
+    args = parser.parse_args(argv)
+
+    from tkinter_file_manager.utils import startup as profiling
+
+    module = args.module or profiling.ENTRY_MODULE
+    timings = profiling.import_profile(module)
+    print(f"{'self ms':>9} {'cumul ms':>9}  module")
+    for timing in sorted(timings, key=lambda t: t.self_time, reverse=True)[:args.top]:
+        print(f"{timing.self_time * 1000:9.1f} {timing.cumulative * 1000:9.1f}  {timing.module}")
+    total = next((t.cumulative for t in timings if t.module == module), 0.0)
+    print(f"\nimport {module}: {total * 1000:.1f} ms (budget {profiling.IMPORT_BUDGET * 1000:.0f} ms)")
+
+    with profiling.display() as env:
+        if env is None:
+            print("first paint: skipped, no display or Xvfb available")
+            return
+        paint = profiling.first_paint(env)
+    print(f"first paint: {paint['first_paint'] * 1000:.1f} ms "
+          f"(import {paint['import'] * 1000:.1f} ms, create {paint['create'] * 1000:.1f} ms, "
+          f"budget {profiling.FIRST_PAINT_BUDGET * 1000:.0f} ms)")
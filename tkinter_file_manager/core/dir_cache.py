@@ -0,0 +1,116 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from tkinter_file_manager.core.dir_listing import DirListing
+
+# 目录 mtime 距离现在不足这个秒数时不缓存：
+# 粗粒度时间戳的文件系统上，同一秒内的后续修改不会改变 mtime
+RACY_WINDOW = 2.0
+
+
+class DirListingCache:
+    """
+    目录列表的 LRU 缓存
+    以解析后的真实路径为键，按条目数和估算内存两个上限淘汰最久未使用的列表；
+    读取时只对目录做一次 stat，mtime 不变才复用缓存
+    """
+
+    def __init__(self, max_entries: int = 64, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[int, DirListing, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(path: Path) -> str:
+        return os.path.realpath(path)
+
+    def get(self, path: Path) -> Optional[DirListing]:
+        """
+        返回缓存列表的副本，目录已变化或不在缓存中时返回 None
+        副本中的条目都标记为待补全，文件的大小和时间会在显示时重新读取
+        """
+        key = self.key(path)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None:
+                self.misses += 1
+                return None
+
+        mtime_ns, listing, _size = cached
+        try:
+            current = os.stat(key).st_mtime_ns
+        except OSError:
+            current = None
+
+        with self._lock:
+            if current != mtime_ns:
+                if self._entries.get(key) is cached:
+                    self._discard(key)
+                self.misses += 1
+                return None
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self.hits += 1
+
+        result = listing.copy()
+        result.mark_pending()
+        return result
+
+    def put(self, path: Path, listing: DirListing, mtime_ns: int):
+        """
+        缓存 listing，mtime_ns 必须是扫描开始前读取的目录 mtime，
+        这样扫描期间发生的修改会让这份缓存在下次读取时失效
+        """
+        if time.time() - mtime_ns / 1e9 < RACY_WINDOW:
+            return
+        key = self.key(path)
+        listing = listing.copy()
+        size = listing.nbytes()
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (mtime_ns, listing, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _key, (_mtime, _listing, old_size) = self._entries.popitem(last=False)
+                self._bytes -= old_size
+                self.evictions += 1
+
+    def invalidate(self, path: Path):
+        with self._lock:
+            self._discard(self.key(path))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """命中/未命中计数，用于调整缓存上限"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def _discard(self, key: str):
+        cached = self._entries.pop(key, None)
+        if cached is not None:
+            self._bytes -= cached[2]
+
+
+listing_cache = DirListingCache()
@@ -0,0 +1,222 @@
+import bisect
+import os
+import stat
+import sys
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Any
+
+# flags 字段中的标志位
+FLAG_DIR = 0x1
+FLAG_HIDDEN = 0x2
+FLAG_SYMLINK = 0x4
+# 快速模式扫描的条目还没有 stat：大小、修改时间和隐藏属性待补全
+FLAG_PENDING = 0x8
+
+# macOS/BSD chflags 的 UF_HIDDEN 标志
+UF_HIDDEN = 0x8000
+
+MODIFIED_FORMAT = "%Y-%m-%d %H:%M"
+
+
+class DirListing:
+    """
+    紧凑的列式目录列表
+    每一列是一个数组：名称、大小(int64)、修改时间(float64)、标志位(uint8)；
+    Path 对象和日期字符串只在被读取时才构造。
+    listing[i] 返回与 get_dir_content 相同格式的字典，保持对旧代码的兼容。
+    快速模式扫描出的条目带有 FLAG_PENDING，需要 hydrate() 之后大小和修改时间才有效
+    """
+
+    __slots__ = ("root", "names", "sizes", "mtimes", "flags", "_root_str")
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._root_str = str(root)
+        self.names: List[str] = []
+        self.sizes = array("q")
+        self.mtimes = array("d")
+        self.flags = bytearray()
+
+    def add(self, name: str, size: int, mtime: float, flags: int):
+        self.names.append(name)
+        self.sizes.append(size)
+        self.mtimes.append(mtime)
+        self.flags.append(flags)
+
+    def extend(self, other: "DirListing"):
+        self.names.extend(other.names)
+        self.sizes.extend(other.sizes)
+        self.mtimes.extend(other.mtimes)
+        self.flags.extend(other.flags)
+
+    def insert(self, index: int, name: str, size: int, mtime: float, flags: int):
+        self.names.insert(index, name)
+        self.sizes.insert(index, size)
+        self.mtimes.insert(index, mtime)
+        self.flags.insert(index, flags)
+
+    def delete(self, index: int):
+        del self.names[index]
+        del self.sizes[index]
+        del self.mtimes[index]
+        del self.flags[index]
+
+    def index_of(self, name: str) -> int:
+        """按名称查找条目下标，不存在时返回 -1；列表可能按任意列排序，这里是线性查找"""
+        try:
+            return self.names.index(name)
+        except ValueError:
+            return -1
+
+    def remove_names(self, names: Iterable[str]) -> List[int]:
+        """删除给定名称的条目，返回被删除条目原来的下标（升序）；无论删除多少个只遍历列表一次"""
+        targets = set(names)
+        if not targets:
+            return []
+        removed = [i for i, name in enumerate(self.names) if name in targets]
+        for index in reversed(removed):
+            self.delete(index)
+        return removed
+
+    def upsert_sorted(self, entries: "DirListing") -> List[int]:
+        """
+        把 entries 中的条目插入到默认排序（目录优先、名称不区分大小写）的位置，
+        同名条目先一次性删除，插入位置用二分查找，不需要整体重新排序。
+        返回受影响的下标
+        """
+        touched = self.remove_names(entries.names)
+        for j, name in enumerate(entries.names):
+            key = _default_key(name, entries.flags[j])
+            index = bisect.bisect_left(
+                range(len(self.names)), key,
+                key=lambda i: _default_key(self.names[i], self.flags[i]))
+            self.insert(index, name, entries.sizes[j], entries.mtimes[j], entries.flags[j])
+            touched.append(index)
+        return touched
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        if index < 0:
+            index += len(self.names)
+        if not 0 <= index < len(self.names):
+            raise IndexError("DirListing index out of range")
+        self.hydrate((index,))
+        return {
+            "name": self.names[index],
+            "path": self.path(index),
+            "is_dir": self.is_dir(index),
+            "size": self.sizes[index],
+            "modified": self.modified(index),
+            "is_hidden": self.is_hidden(index),
+            "extension": self.extension(index),
+        }
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self.names)):
+            yield self[i]
+
+    def is_dir(self, index: int) -> bool:
+        return bool(self.flags[index] & FLAG_DIR)
+
+    def is_hidden(self, index: int) -> bool:
+        return bool(self.flags[index] & FLAG_HIDDEN)
+
+    def is_symlink(self, index: int) -> bool:
+        return bool(self.flags[index] & FLAG_SYMLINK)
+
+    def is_pending(self, index: int) -> bool:
+        return bool(self.flags[index] & FLAG_PENDING)
+
+    def hydrate(self, indices: Iterable[int]) -> int:
+        """
+        为快速模式扫描的条目补全大小、修改时间和隐藏属性
+        只处理带 FLAG_PENDING 的条目，返回实际 stat 的条目数；
+        stat 失败（断开的链接、无权限）时大小和时间保持为 0
+        """
+        flags = self.flags
+        count = 0
+        for i in indices:
+            if not flags[i] & FLAG_PENDING:
+                continue
+            flags[i] &= ~FLAG_PENDING
+            count += 1
+            path = os.path.join(self._root_str, self.names[i])
+            try:
+                st = os.stat(path)
+                lst = os.lstat(path) if flags[i] & FLAG_SYMLINK else st
+            except OSError:
+                continue
+            if not flags[i] & FLAG_DIR:
+                self.sizes[i] = st.st_size
+            self.mtimes[i] = st.st_mtime
+            if hidden_by_attributes(lst):
+                flags[i] |= FLAG_HIDDEN
+        return count
+
+    def hydrate_all(self) -> int:
+        return self.hydrate(range(len(self.names)))
+
+    def mark_pending(self):
+        """把所有条目标记为待补全，下次 hydrate 时重新读取元数据"""
+        flags = self.flags
+        for i in range(len(flags)):
+            flags[i] |= FLAG_PENDING
+
+    def path(self, index: int) -> Path:
+        return Path(os.path.join(self._root_str, self.names[index]))
+
+    def modified(self, index: int) -> str:
+        return datetime.fromtimestamp(self.mtimes[index]).strftime(MODIFIED_FORMAT)
+
+    def extension(self, index: int) -> str:
+        if self.flags[index] & FLAG_DIR:
+            return 'folder'
+        return os.path.splitext(self.names[index])[1].lower()
+
+    def take(self, order: Iterable[int]) -> "DirListing":
+        """按给定的下标顺序构造新的列表"""
+        result = DirListing(self.root)
+        names, sizes, mtimes, flags = self.names, self.sizes, self.mtimes, self.flags
+        for i in order:
+            result.names.append(names[i])
+            result.sizes.append(sizes[i])
+            result.mtimes.append(mtimes[i])
+            result.flags.append(flags[i])
+        return result
+
+    def copy(self) -> "DirListing":
+        result = DirListing(self.root)
+        result.extend(self)
+        return result
+
+    def nbytes(self) -> int:
+        """估算占用的内存字节数（名称字符串 + 各列数组）"""
+        names_size = sum(sys.getsizeof(name) for name in self.names) + 8 * len(self.names)
+        columns_size = (self.sizes.itemsize + self.mtimes.itemsize + 1) * len(self.names)
+        return names_size + columns_size
+
+    def sorted(self) -> "DirListing":
+        """目录优先、名称不区分大小写的默认排序"""
+        names, flags = self.names, self.flags
+        order = sorted(range(len(names)), key=lambda i: _default_key(names[i], flags[i]))
+        return self.take(order)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return list(self)
+
+
+def _default_key(name: str, flags: int):
+    return not flags & FLAG_DIR, name.lower()
+
+
+def hidden_by_attributes(st: os.stat_result) -> bool:
+    """Windows 隐藏属性或 macOS/BSD 的隐藏标志"""
+    if hasattr(st, 'st_file_attributes'):
+        return bool(st.st_file_attributes & stat.FILE_ATTRIBUTE_HIDDEN)
+    if hasattr(st, 'st_flags'):
+        return bool(st.st_flags & UF_HIDDEN)
+    return False
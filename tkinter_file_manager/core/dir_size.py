@@ -0,0 +1,185 @@
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Tuple
+
+
+class _DirRecord:
+    """一个目录自身的统计：所在设备、直接包含的文件大小、多链接文件和子目录名"""
+
+    __slots__ = ("dev", "mtime_ns", "direct", "links", "children")
+
+    def __init__(self, dev: int, mtime_ns: int, direct: int, links: Tuple[tuple, ...], children: Tuple[str, ...]):
+        self.dev = dev
+        self.mtime_ns = mtime_ns
+        self.direct = direct
+        self.links = links
+        self.children = children
+
+
+class DirSizeCache:
+    """
+    按目录缓存 _DirRecord，以目录 mtime 校验
+    子树总大小每次由各目录的记录汇总，未变化的目录只需要一次 stat，不需要重新读取目录内容
+    """
+
+    def __init__(self, max_entries: int = 200_000):
+        self.max_entries = max_entries
+        self._records: "OrderedDict[str, _DirRecord]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str, mtime_ns: int) -> Optional[_DirRecord]:
+        with self._lock:
+            record = self._records.get(path)
+            if record is None or record.mtime_ns != mtime_ns:
+                return None
+            self._records.move_to_end(path)
+            return record
+
+    def put(self, path: str, record: _DirRecord):
+        with self._lock:
+            self._records[path] = record
+            self._records.move_to_end(path)
+            while len(self._records) > self.max_entries:
+                self._records.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+
+class SizeTask:
+    """一次文件夹大小计算，可取消"""
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+
+class DirSizeEngine:
+    """
+    递归计算文件夹大小（文件的表观大小 st_size 之和）
+    多个子文件夹在线程池中并行计算，每算完一个就通过 on_size 报告；
+    同一子树中的硬链接文件只计算一次，不进入符号链接指向的目录，
+    也不进入挂载在其他设备上的目录（与 du -x 相同），打开 / 时不会遍历 /proc、/sys 或网络挂载
+    """
+
+    def __init__(self, max_workers: int = 4, cache: Optional[DirSizeCache] = None):
+        self.cache = cache if cache is not None else DirSizeCache()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dir-size")
+        self._outstanding = 0
+        self._lock = threading.Lock()
+
+    def compute(self, parent: Path, names: Iterable[str],
+                on_size: Callable[[Tuple[str, int]], None],
+                task: Optional[SizeTask] = None) -> SizeTask:
+        """
+        计算 parent 下各个子文件夹的大小，按 names 的顺序提交
+        on_size 在工作线程中以 (name, size) 调用；传入已有的 task 可以把多批计算归到同一次取消
+        """
+        if task is None:
+            task = SizeTask()
+        try:
+            device = os.stat(parent).st_dev
+        except OSError:
+            device = None
+        for name in names:
+            with self._lock:
+                self._outstanding += 1
+            self._pool.submit(self._compute_one, task, os.path.join(parent, name), name, on_size, device)
+        return task
+
+    @property
+    def outstanding(self) -> int:
+        """已提交、还没算完（包括还没回调 on_size）的文件夹数"""
+        return self._outstanding
+
+    def subtree_size(self, path: Path, task: Optional[SizeTask] = None,
+                     device: Optional[int] = None) -> Optional[int]:
+        """
+        计算单个目录的总大小，只统计与 device（默认为 path 自身所在的设备）相同设备上的目录；
+        被取消或 path 本身挂载在其他设备上时返回 None
+        """
+        root = os.fspath(path)
+        total = 0
+        seen_links = set()
+        stack = [root]
+        while stack:
+            if task is not None and task.cancelled:
+                return None
+            current = stack.pop()
+            record = self._record(current)
+            if record is None:
+                continue
+            if device is None:
+                device = record.dev
+            elif record.dev != device:
+                if current is root:
+                    return None
+                continue  # 挂载点，不计入
+            total += record.direct
+            for dev, ino, size in record.links:
+                if (dev, ino) not in seen_links:
+                    seen_links.add((dev, ino))
+                    total += size
+            stack.extend(os.path.join(current, child) for child in record.children)
+        return total
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _compute_one(self, task: SizeTask, path: str, name: str, on_size: Callable, device: Optional[int]):
+        try:
+            if task.cancelled:
+                return
+            size = self.subtree_size(path, task, device)
+            if size is not None and not task.cancelled:
+                on_size((name, size))
+        finally:
+            with self._lock:
+                self._outstanding -= 1
+
+    def _record(self, path: str) -> Optional[_DirRecord]:
+        try:
+            dir_st = os.stat(path)
+        except OSError:
+            return None
+        mtime_ns = dir_st.st_mtime_ns
+        record = self.cache.get(path, mtime_ns)
+        if record is not None:
+            return record
+
+        direct = 0
+        links = []
+        children = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            children.append(entry.name)
+                            continue
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if st.st_nlink > 1 and st.st_ino:
+                        links.append((st.st_dev, st.st_ino, st.st_size))
+                    else:
+                        direct += st.st_size
+        except OSError:
+            return None
+
+        record = _DirRecord(dir_st.st_dev, mtime_ns, direct, tuple(links), tuple(children))
+        self.cache.put(path, record)
+        return record
+
+
+dir_size_engine = DirSizeEngine()
@@ -0,0 +1,307 @@
+import hashlib
+import os
+import stat
+import threading
+from collections import OrderedDict, defaultdict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+# 部分哈希读取文件开头和结尾各 PARTIAL_SIZE 字节；不超过两倍的文件，部分哈希就是完整内容
+PARTIAL_SIZE = 4096
+READ_CHUNK = 1024 * 1024
+# 一个进程池任务最多包含的文件数和字节数，减少进程间往返
+BATCH_FILES = 64
+BATCH_BYTES = 64 * 1024 * 1024
+# 每轮最多处理的候选文件数；每轮结束就把确认的重复组交出去
+WINDOW_FILES = 2048
+# 需要哈希的文件少于这个数时直接在当前线程计算，不启动进程池
+INLINE_FILES = 32
+
+# (设备, inode, 大小, 修改时间)，任何一项变化都视为不同内容
+FileKey = Tuple[int, int, int, int]
+
+
+def _digest(path: str, size: int, partial: bool) -> Optional[bytes]:
+    """计算文件的哈希；partial 时只读取开头和结尾，文件读取失败时返回 None"""
+    h = hashlib.blake2b(digest_size=16)
+    try:
+        with open(path, "rb") as f:
+            if partial and size > 2 * PARTIAL_SIZE:
+                h.update(f.read(PARTIAL_SIZE))
+                f.seek(size - PARTIAL_SIZE)
+                h.update(f.read(PARTIAL_SIZE))
+            else:
+                while True:
+                    chunk = f.read(READ_CHUNK)
+                    if not chunk:
+                        break
+                    h.update(chunk)
+    except OSError:
+        return None
+    return h.digest()
+
+
+def _digest_batch(jobs: List[Tuple[str, int]], partial: bool) -> List[Optional[bytes]]:
+    """在进程池中执行，必须是模块级函数才能被 pickle"""
+    return [_digest(path, size, partial) for path, size in jobs]
+
+
+class HashCache:
+    """
+    按 FileKey 缓存部分哈希和完整哈希
+    文件内容变化时 mtime 或大小随之变化，旧记录自然失效
+    """
+
+    def __init__(self, max_entries: int = 500_000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[FileKey, List[Optional[bytes]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: FileKey, partial: bool) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0 if partial else 1]
+
+    def put(self, key: FileKey, partial: bool, digest: bytes):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = [None, None]
+            entry[0 if partial else 1] = digest
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DuplicateGroup:
+    """一组内容相同的文件；同一文件的多个硬链接只出现一次"""
+
+    __slots__ = ("size", "paths")
+
+    def __init__(self, size: int, paths: List[str]):
+        self.size = size
+        self.paths = paths
+
+    @property
+    def wasted(self) -> int:
+        """删除多余副本后可以释放的字节数"""
+        return self.size * (len(self.paths) - 1)
+
+
+class DuplicateTask:
+    """一次查重，可取消"""
+
+    def __init__(self):
+        self.scanned = 0
+        self.groups = 0
+        self.wasted = 0
+        self._cancelled = threading.Event()
+        self._finished = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def finished(self) -> bool:
+        return self._finished.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._finished.wait(timeout)
+
+
+class DuplicateFinder:
+    """
+    查找内容重复的文件
+    先按大小分组，再用开头和结尾的部分哈希排除绝大多数候选，只对剩下的文件计算完整哈希。
+    哈希在进程池中计算；候选按文件大小从大到小分轮处理，每轮确认的重复组立即通过 on_group 交出，
+    回调在后台线程中执行。不进入符号链接，不比较空文件
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, cache: Optional[HashCache] = None):
+        self.max_workers = max_workers
+        self.cache = cache if cache is not None else HashCache()
+        self._pool: Optional["ProcessPoolExecutor"] = None
+        self._pool_lock = threading.Lock()
+
+    def find(self, roots: Iterable[Path], on_group: Callable[[DuplicateGroup], None],
+             on_done: Optional[Callable[[DuplicateTask], None]] = None,
+             min_size: int = 1, include_hidden: bool = True) -> DuplicateTask:
+        roots = [os.fspath(root) for root in roots]
+        for root in roots:
+            if not os.path.isdir(root):
+                raise NotADirectoryError(f"{root} is not a directory")
+        task = DuplicateTask()
+        threading.Thread(target=self._run, args=(task, roots, on_group, on_done, max(1, min_size), include_hidden),
+                         name="duplicates", daemon=True).start()
+        return task
+
+    def shutdown(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def _run(self, task: DuplicateTask, roots: List[str], on_group: Callable,
+             on_done: Optional[Callable], min_size: int, include_hidden: bool):
+        try:
+            by_size = self._collect(task, roots, min_size, include_hidden)
+            candidates = sorted((group for group in by_size.values() if len(group) > 1),
+                                key=lambda group: group[0][2], reverse=True)
+            window: List[List[tuple]] = []
+            count = 0
+            for group in candidates:
+                if task.cancelled:
+                    break
+                window.append(group)
+                count += len(group)
+                if count >= WINDOW_FILES:
+                    self._process(task, window, on_group)
+                    window, count = [], 0
+            if window and not task.cancelled:
+                self._process(task, window, on_group)
+        finally:
+            task._finished.set()
+            if on_done is not None:
+                on_done(task)
+
+    def _collect(self, task: DuplicateTask, roots: List[str], min_size: int,
+                 include_hidden: bool) -> Dict[int, List[tuple]]:
+        """遍历目录，按大小分组；每个文件为 (path, key, size)"""
+        by_size: Dict[int, List[tuple]] = defaultdict(list)
+        seen = set()
+        stack = list(roots)
+        while stack and not task.cancelled:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if not include_hidden and entry.name.startswith('.'):
+                            continue
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                                continue
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        if not stat.S_ISREG(st.st_mode) or st.st_size < min_size:
+                            continue
+                        inode = (st.st_dev, st.st_ino)
+                        if st.st_ino and inode in seen:
+                            continue  # 硬链接指向同一份数据，不算重复
+                        seen.add(inode)
+                        task.scanned += 1
+                        key = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+                        by_size[st.st_size].append((entry.path, key, st.st_size))
+            except OSError:
+                continue
+        return by_size
+
+    def _process(self, task: DuplicateTask, window: List[List[tuple]], on_group: Callable):
+        """对一轮候选做部分哈希和完整哈希，交出确认的重复组"""
+        survivors = []
+        partial = self._digests(task, [f for group in window for f in group], partial=True)
+        for group in window:
+            survivors.extend(_split(group, partial))
+
+        # 小文件的部分哈希已经覆盖了全部内容
+        confirmed = [group for group in survivors if group[0][2] <= 2 * PARTIAL_SIZE]
+        large = [group for group in survivors if group[0][2] > 2 * PARTIAL_SIZE]
+        full = self._digests(task, [f for group in large for f in group], partial=False)
+        for group in large:
+            confirmed.extend(_split(group, full))
+
+        if task.cancelled:
+            return
+        confirmed.sort(key=lambda group: group[0][2], reverse=True)
+        for group in confirmed:
+            result = DuplicateGroup(group[0][2], sorted(f[0] for f in group))
+            task.groups += 1
+            task.wasted += result.wasted
+            on_group(result)
+
+    def _digests(self, task: DuplicateTask, files: List[tuple], partial: bool) -> Dict[str, Optional[bytes]]:
+        """返回 path -> 哈希；先查缓存，其余分批交给进程池"""
+        digests: Dict[str, Optional[bytes]] = {}
+        missing = []
+        for path, key, size in files:
+            digest = self.cache.get(key, partial)
+            if digest is None:
+                missing.append((path, key, size))
+            else:
+                digests[path] = digest
+        if not missing or task.cancelled:
+            return digests
+
+        if len(missing) < INLINE_FILES:
+            results = [(missing, _digest_batch([(path, size) for path, _, size in missing], partial))]
+        else:
+            pool = self._get_pool()
+            futures = [(batch, pool.submit(_digest_batch, [(path, size) for path, _, size in batch], partial))
+                       for batch in _batches(missing, partial)]
+            results = []
+            for batch, future in futures:
+                if task.cancelled:
+                    for _, pending in futures:
+                        pending.cancel()
+                    return digests
+                results.append((batch, future.result()))
+
+        for batch, batch_digests in results:
+            for (path, key, _), digest in zip(batch, batch_digests):
+                digests[path] = digest
+                if digest is not None:
+                    self.cache.put(key, partial, digest)
+        return digests
+
+    def _get_pool(self) -> "ProcessPoolExecutor":
+        with self._pool_lock:
+            if self._pool is None:
+                # multiprocessing 只在第一次需要进程池时导入；使用 spawn，避免在已有多个线程的 GUI 进程中 fork
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+
+def _split(group: List[tuple], digests: Dict[str, Optional[bytes]]) -> List[List[tuple]]:
+    """按哈希把一组文件再分组，只保留多于一个文件的子组；读取失败的文件被排除"""
+    by_digest: Dict[bytes, List[tuple]] = defaultdict(list)
+    for f in group:
+        digest = digests.get(f[0])
+        if digest is not None:
+            by_digest[digest].append(f)
+    return [sub for sub in by_digest.values() if len(sub) > 1]
+
+
+def _batches(files: List[tuple], partial: bool) -> Iterable[List[tuple]]:
+    batch, batch_bytes = [], 0
+    for f in files:
+        batch.append(f)
+        batch_bytes += 2 * PARTIAL_SIZE if partial else f[2]
+        if len(batch) >= BATCH_FILES or batch_bytes >= BATCH_BYTES:
+            yield batch
+            batch, batch_bytes = [], 0
+    if batch:
+        yield batch
+
+
+duplicate_finder = DuplicateFinder()
@@ -1,36 +1,163 @@
+import errno
 import os
+import shutil
 import stat
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Iterator, Iterable, Callable, Optional
 from datetime import datetime
+from urllib.parse import quote
+
+from tkinter_file_manager.core.dir_listing import (
+    DirListing, FLAG_DIR, FLAG_HIDDEN, FLAG_SYMLINK, FLAG_PENDING, hidden_by_attributes
+)
 
 def get_dir_content(path: Path) -> List[Dict[str, any]]:
+    contents = []
+    for batch in iter_dir_content(path):
+        contents.extend(batch)
+    return sort_dir_content(contents)
+
+
+def iter_dir_content(path: Path, batch_size: int = 256) -> Iterator[List[Dict[str, any]]]:
+    """
+    分批扫描目录，每读取 batch_size 个条目就产出一批
+    条目按目录读取顺序返回，未排序；调用方可以先显示第一批，再用 sort_dir_content 整体排序
+    路径检查在调用时立即进行，而不是等到第一次迭代
+    """
+    return (batch.to_dicts() for batch in iter_dir_listing(path, batch_size))
+
+
+def sort_dir_content(contents: List[Dict[str, any]]) -> List[Dict[str, any]]:
+    """目录优先、名称不区分大小写的默认排序"""
+    return sorted(contents, key = lambda x:(not x["is_dir"], x["name"].lower()))
+
+
+def list_dir(path: Path, fast: bool = False) -> DirListing:
+    """扫描目录并返回排好序的紧凑列表 DirListing"""
+    listing = DirListing(path)
+    for batch in iter_dir_listing(path, fast=fast):
+        listing.extend(batch)
+    return listing.sorted()
+
+
+def list_entries(path: Path, names: Iterable[str]) -> DirListing:
+    """读取目录中指定名称条目的完整信息，已不存在或无法访问的条目被跳过"""
+    listing = DirListing(path)
+    for name in names:
+        full_path = os.path.join(path, name)
+        try:
+            lst = os.lstat(full_path)
+            try:
+                st = os.stat(full_path) if stat.S_ISLNK(lst.st_mode) else lst
+            except OSError:
+                st = lst  # 断开的链接按链接本身显示
+        except OSError:
+            continue
+        is_dir = stat.S_ISDIR(st.st_mode)
+        flags = FLAG_DIR if is_dir else 0
+        if stat.S_ISLNK(lst.st_mode):
+            flags |= FLAG_SYMLINK
+        if name.startswith('.') or hidden_by_attributes(lst):
+            flags |= FLAG_HIDDEN
+        listing.add(name, 0 if is_dir else st.st_size, st.st_mtime, flags)
+    return listing
+
+
+def list_subdirs(path: Path, include_hidden: bool = True) -> List[str]:
+    """
+    只列出子目录（含指向目录的链接）的名称，按名称不区分大小写排序，供导航树展开时使用
+    依靠 scandir 返回的类型判断，普通文件不产生任何 stat
+    """
+    names = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if not include_hidden and entry.name.startswith('.'):
+                continue
+            try:
+                if entry.is_dir():
+                    names.append(entry.name)
+            except OSError:
+                continue
+    names.sort(key=str.casefold)
+    return names
+
+
+def has_subdirs(path: Path, include_hidden: bool = True) -> bool:
+    """目录下是否至少有一个子目录；找到第一个就停止，无法读取的目录视为没有"""
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if not include_hidden and entry.name.startswith('.'):
+                    continue
+                try:
+                    if entry.is_dir():
+                        return True
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return False
+
+
+def iter_dir_listing(path: Path, batch_size: int = 256, fast: bool = False) -> Iterator[DirListing]:
+    """
+    与 iter_dir_content 相同，但每一批是 DirListing 而不是字典列表
+    fast=True 时不对条目做 stat，只使用 scandir 已经返回的名称和类型（d_type），
+    条目带 FLAG_PENDING，大小、修改时间等到 DirListing.hydrate() 时才读取
+    """
     if not path.is_dir():
         raise NotADirectoryError(f"{path} is not a directory")
+    if batch_size < 1:
+        raise ValueError("batch_size must be positive")
 
-    contents = []
+    return _iter_batches(path, batch_size, _add_entry_fast if fast else _add_entry)
+
+
+def _iter_batches(path: Path, batch_size: int, add_entry) -> Iterator[DirListing]:
+    batch = DirListing(path)
 
     try:
         with os.scandir(path) as entries:
             for entry in entries:
                 try:
-                    _stat = entry.stat()
-                    item = {
-                        "name": entry.name,
-                        "path": Path(entry.path),
-                        "is_dir": entry.is_dir(),
-                        "size": _stat.st_size if not entry.is_dir() else 0,
-                        "modified": datetime.fromtimestamp(_stat.st_mtime).strftime("%Y-%m-%d %H:%M"),
-                        "is_hidden": _is_hidden(entry),
-                        "extension": _get_extension(entry)
-                    }
-                    contents.append(item)
+                    add_entry(batch, entry)
                 except (OSError, PermissionError) as e:
                     continue
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = DirListing(path)
     except OSError as e:
         raise RuntimeError(f"Scan file error {e}")
 
-    return sorted(contents, key = lambda x:(not x["is_dir"], x["name"].lower()))
+    if len(batch):
+        yield batch
+
+
+def _add_entry(listing: DirListing, entry: os.DirEntry):
+    _stat = entry.stat()
+    is_dir = entry.is_dir()
+    flags = FLAG_DIR if is_dir else 0
+    if _is_hidden(entry):
+        flags |= FLAG_HIDDEN
+    if entry.is_symlink():
+        flags |= FLAG_SYMLINK
+    listing.add(entry.name, 0 if is_dir else _stat.st_size, _stat.st_mtime, flags)
+
+
+def _add_entry_fast(listing: DirListing, entry: os.DirEntry):
+    # 除符号链接和 d_type 未知的文件系统外，is_dir/is_symlink 不会产生系统调用
+    flags = FLAG_PENDING
+    if entry.is_dir():
+        flags |= FLAG_DIR
+    if entry.is_symlink():
+        flags |= FLAG_SYMLINK
+    if entry.name.startswith('.'):
+        flags |= FLAG_HIDDEN
+    listing.add(entry.name, 0, 0.0, flags)
 
 
 def _is_hidden(entry: os.DirEntry) -> bool:
@@ -88,4 +215,633 @@ def _is_hidden(entry: os.DirEntry) -> bool:
 def _get_extension(entry:os.DirEntry) -> str:
     if entry.is_dir():
         return 'folder'
-    return os.path.splitext(entry.name)[1].lower()
\ No newline at end of file
+    return os.path.splitext(entry.name)[1].lower()
+
+
+COPY_CHUNK = 64 * 1024 * 1024   # 每次 copy_file_range/sendfile 最多复制的字节数，也是大文件报告进度的粒度
+BUFFER_SIZE = 1024 * 1024       # 内核复制不可用时用户态读写的缓冲区大小
+PROGRESS_INTERVAL = 0.25        # 两次进度回调之间的最小间隔（秒）
+
+# 这些错误表示内核复制在当前文件系统组合上不可用，换下一种方式即可
+_KERNEL_COPY_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EBADF,
+                            errno.EOPNOTSUPP, getattr(errno, "ENOTSUP", errno.EOPNOTSUPP)}
+
+
+class TransferProgress:
+    """复制/移动进度的快照；planning 为 True 时源目录还没有遍历完，总量仍会增长"""
+
+    __slots__ = ("done_bytes", "total_bytes", "done_files", "total_files",
+                 "bytes_per_sec", "files_per_sec", "planning")
+
+    def __init__(self, done_bytes: int, total_bytes: int, done_files: int, total_files: int,
+                 bytes_per_sec: float, files_per_sec: float, planning: bool):
+        self.done_bytes = done_bytes
+        self.total_bytes = total_bytes
+        self.done_files = done_files
+        self.total_files = total_files
+        self.bytes_per_sec = bytes_per_sec
+        self.files_per_sec = files_per_sec
+        self.planning = planning
+
+
+class TransferTask:
+    """
+    一次复制、移动或删除，可取消
+    进度在工作线程中累加，最多每 interval 秒通过 on_progress 报告一次，结束时再报告一次；
+    单个条目的失败记录在 errors 中，不会中断其余条目
+    """
+
+    def __init__(self, on_progress: Optional[Callable[[TransferProgress], None]] = None,
+                 interval: float = PROGRESS_INTERVAL):
+        self.errors: List[Tuple[str, Exception]] = []
+        self._on_progress = on_progress
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._done_bytes = 0
+        self._total_bytes = 0
+        self._done_files = 0
+        self._total_files = 0
+        self._planning = True
+        self._started = time.monotonic()
+        self._last_report = self._started
+        self._last_bytes = 0
+        self._last_files = 0
+        self._bytes_per_sec = 0.0
+        self._files_per_sec = 0.0
+        self._cancelled = threading.Event()
+        self._finished = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def finished(self) -> bool:
+        return self._finished.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._finished.wait(timeout)
+
+    def progress(self) -> TransferProgress:
+        with self._lock:
+            return self._snapshot()
+
+    def _snapshot(self) -> TransferProgress:
+        return TransferProgress(self._done_bytes, self._total_bytes, self._done_files, self._total_files,
+                                self._bytes_per_sec, self._files_per_sec, self._planning)
+
+    def _add_total(self, size: int, files: int = 1):
+        with self._lock:
+            self._total_bytes += size
+            self._total_files += files
+
+    def _advance(self, size: int, files: int = 0):
+        with self._lock:
+            self._done_bytes += size
+            self._done_files += files
+            now = time.monotonic()
+            if self._on_progress is None or now - self._last_report < self._interval:
+                return
+            progress = self._update_rates(now)
+        self._on_progress(progress)
+
+    def _update_rates(self, now: float) -> TransferProgress:
+        elapsed = now - self._last_report
+        if elapsed > 0:
+            self._bytes_per_sec = (self._done_bytes - self._last_bytes) / elapsed
+            self._files_per_sec = (self._done_files - self._last_files) / elapsed
+        self._last_report = now
+        self._last_bytes = self._done_bytes
+        self._last_files = self._done_files
+        return self._snapshot()
+
+    def _fail(self, path: str, error: Exception):
+        with self._lock:
+            self.errors.append((path, error))
+
+    def _finish(self):
+        with self._lock:
+            self._planning = False
+            now = time.monotonic()
+            elapsed = now - self._started
+            if elapsed > 0:  # 最终报告给出整个任务的平均速度
+                self._bytes_per_sec = self._done_bytes / elapsed
+                self._files_per_sec = self._done_files / elapsed
+            progress = self._snapshot()
+        if self._on_progress is not None:
+            self._on_progress(progress)
+        self._finished.set()
+
+
+class TransferEngine:
+    """
+    复制/移动文件和目录
+    文件数据优先用 copy_file_range 或 sendfile 在内核中复制，都不可用时退回到大缓冲区读写；
+    同一文件系统内的移动直接 rename。文件复制在线程池中并行进行，
+    目录遍历和建目录在每个任务自己的协调线程中完成，提交给线程池的文件数有上限，内存占用不随文件数增长
+    """
+
+    def __init__(self, max_workers: int = 8):
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="transfer")
+
+    def copy(self, sources: Iterable[Path], dest_dir: Path,
+             on_progress: Optional[Callable[[TransferProgress], None]] = None,
+             on_done: Optional[Callable[[TransferTask], None]] = None,
+             overwrite: bool = False) -> TransferTask:
+        """把 sources 复制到 dest_dir 下；回调都在后台线程中执行"""
+        return self._start(sources, dest_dir, on_progress, on_done, overwrite, move=False)
+
+    def move(self, sources: Iterable[Path], dest_dir: Path,
+             on_progress: Optional[Callable[[TransferProgress], None]] = None,
+             on_done: Optional[Callable[[TransferTask], None]] = None,
+             overwrite: bool = False) -> TransferTask:
+        """
+        把 sources 移动到 dest_dir 下
+        与目标在同一设备上时只做 rename；否则先复制，全部成功后再删除源
+        """
+        return self._start(sources, dest_dir, on_progress, on_done, overwrite, move=True)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _start(self, sources, dest_dir, on_progress, on_done, overwrite, move) -> TransferTask:
+        dest_dir = Path(dest_dir)
+        if not dest_dir.is_dir():
+            raise NotADirectoryError(f"{dest_dir} is not a directory")
+        task = TransferTask(on_progress)
+        sources = [os.path.abspath(source) for source in sources]
+        threading.Thread(target=self._run, args=(task, sources, os.path.abspath(dest_dir), overwrite, move, on_done),
+                         name="transfer-plan", daemon=True).start()
+        return task
+
+    def _run(self, task: TransferTask, sources: List[str], dest_dir: str,
+             overwrite: bool, move: bool, on_done: Optional[Callable]):
+        # 限制已提交但未完成的文件数；结束时取回全部许可即等于等待所有文件完成
+        slots = threading.BoundedSemaphore(self.max_workers * 4)
+        copied_dirs: List[Tuple[str, os.stat_result]] = []
+        to_remove: List[str] = []
+        try:
+            dest_dev = os.stat(dest_dir).st_dev
+            for source in sources:
+                if task.cancelled:
+                    break
+                target = os.path.join(dest_dir, os.path.basename(source))
+                try:
+                    st = os.lstat(source)
+                    if source == target or stat.S_ISDIR(st.st_mode) and _is_within(target, source):
+                        raise ValueError(f"Cannot transfer {source} into itself")
+                    is_dir = stat.S_ISDIR(st.st_mode)
+                    merge = is_dir and os.path.isdir(target)
+                    # overwrite 时文件替换同类文件，目录合并进已有目录；文件和目录之间不互相替换
+                    if os.path.lexists(target) and not (overwrite and is_dir == os.path.isdir(target)):
+                        raise FileExistsError(errno.EEXIST, "Target already exists", target)
+                    if move and st.st_dev == dest_dev and not merge:
+                        try:
+                            os.replace(source, target)
+                        except OSError as e:
+                            if e.errno != errno.EXDEV:
+                                raise
+                        else:
+                            task._add_total(0)
+                            task._advance(0, 1)
+                            continue
+                    self._copy_entry(task, source, target, st, slots, copied_dirs)
+                    if move:
+                        to_remove.append(source)
+                except Exception as e:
+                    task._fail(source, e)
+        except Exception as e:
+            task._fail(dest_dir, e)
+        finally:
+            with task._lock:
+                task._planning = False
+            for _ in range(self.max_workers * 4):
+                slots.acquire()
+
+        # 文件写完之后目录的 mtime 才不会再变，由深到浅恢复
+        for path, st in reversed(copied_dirs):
+            try:
+                _copy_metadata(path, st)
+            except OSError:
+                pass
+
+        if to_remove and not task.cancelled:
+            failed = [path for path, _ in task.errors]
+            # 有条目复制失败时保留源
+            to_remove = [source for source in to_remove
+                         if not any(path == source or _is_within(path, source) for path in failed)]
+            removal = delete_engine.delete(to_remove)
+            removal.wait()
+            for path, error in removal.errors:
+                task._fail(path, error)
+
+        task._finish()
+        if on_done is not None:
+            on_done(task)
+
+    def _copy_entry(self, task: TransferTask, source: str, target: str, st: os.stat_result,
+                    slots: threading.BoundedSemaphore, copied_dirs: List[Tuple[str, os.stat_result]]):
+        if not stat.S_ISDIR(st.st_mode):
+            self._submit_file(task, source, target, st, slots)
+            return
+
+        stack = [(source, target, st)]
+        while stack and not task.cancelled:
+            src_dir, dst_dir, dir_st = stack.pop()
+            try:
+                os.makedirs(dst_dir, exist_ok=True)
+                copied_dirs.append((dst_dir, dir_st))
+                with os.scandir(src_dir) as entries:
+                    for entry in entries:
+                        if task.cancelled:
+                            break
+                        src = entry.path
+                        dst = os.path.join(dst_dir, entry.name)
+                        try:
+                            entry_st = entry.stat(follow_symlinks=False)
+                            if stat.S_ISDIR(entry_st.st_mode):
+                                stack.append((src, dst, entry_st))
+                            else:
+                                self._submit_file(task, src, dst, entry_st, slots)
+                        except OSError as e:
+                            task._fail(src, e)
+            except OSError as e:
+                task._fail(src_dir, e)
+
+    def _submit_file(self, task: TransferTask, source: str, target: str, st: os.stat_result,
+                     slots: threading.BoundedSemaphore):
+        task._add_total(st.st_size if stat.S_ISREG(st.st_mode) else 0)
+        slots.acquire()
+        try:
+            self._pool.submit(self._copy_file, task, source, target, st, slots)
+        except RuntimeError:  # 线程池已关闭
+            slots.release()
+            raise
+
+    def _copy_file(self, task: TransferTask, source: str, target: str, st: os.stat_result,
+                   slots: threading.BoundedSemaphore):
+        try:
+            if task.cancelled:
+                return
+            if stat.S_ISLNK(st.st_mode):
+                if os.path.lexists(target):
+                    os.unlink(target)
+                os.symlink(os.readlink(source), target)
+                task._advance(0, 1)
+                return
+            if not stat.S_ISREG(st.st_mode):
+                raise OSError(errno.EINVAL, "Not a regular file", source)
+
+            src_fd = os.open(source, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+            try:
+                dst_fd = os.open(target, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0),
+                                 stat.S_IMODE(st.st_mode) | stat.S_IWUSR)
+                try:
+                    complete = _copy_data(task, src_fd, dst_fd, st.st_size)
+                finally:
+                    os.close(dst_fd)
+            finally:
+                os.close(src_fd)
+            if not complete:
+                os.unlink(target)  # 取消时不留下不完整的文件
+                return
+            _copy_metadata(target, st)
+            task._advance(0, 1)
+        except Exception as e:
+            task._fail(source, e)
+        finally:
+            slots.release()
+
+
+def _copy_data(task: TransferTask, src_fd: int, dst_fd: int, size: int) -> bool:
+    """复制文件内容，依次尝试 copy_file_range、sendfile 和缓冲区读写；被取消时返回 False"""
+    copied = 0
+    for kernel_copy in _KERNEL_COPIES:
+        try:
+            while True:
+                n = kernel_copy(src_fd, dst_fd, copied)
+                if n == 0:
+                    break
+                copied += n
+                task._advance(n)
+                if task.cancelled:
+                    return False
+        except OSError as e:
+            if copied or e.errno not in _KERNEL_COPY_UNSUPPORTED:
+                raise
+            continue
+        # 部分内核对某些文件系统上的非空文件直接返回 0，这时换下一种方式
+        if copied or not size:
+            return True
+
+    os.lseek(src_fd, copied, os.SEEK_SET)
+    os.lseek(dst_fd, copied, os.SEEK_SET)
+    while True:
+        data = os.read(src_fd, BUFFER_SIZE)
+        if not data:
+            return True
+        view = memoryview(data)
+        while view:
+            view = view[os.write(dst_fd, view):]
+        task._advance(len(data))
+        if task.cancelled:
+            return False
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, offset: int) -> int:
+    return os.copy_file_range(src_fd, dst_fd, COPY_CHUNK, offset, offset)
+
+
+def _sendfile(src_fd: int, dst_fd: int, offset: int) -> int:
+    return os.sendfile(dst_fd, src_fd, offset, COPY_CHUNK)
+
+
+_KERNEL_COPIES = []
+if hasattr(os, "copy_file_range"):
+    _KERNEL_COPIES.append(_copy_file_range)
+if hasattr(os, "sendfile") and os.name != "nt":
+    _KERNEL_COPIES.append(_sendfile)
+
+
+def _copy_metadata(path: str, st: os.stat_result):
+    os.chmod(path, stat.S_IMODE(st.st_mode))
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+def _is_within(path: str, parent: str) -> bool:
+    return path.startswith(parent.rstrip(os.sep) + os.sep)
+
+
+transfer_engine = TransferEngine()
+
+
+TRASH_DIR = os.path.join(os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share"), "Trash")
+
+_O_DIRECTORY = getattr(os, "O_DIRECTORY", 0)
+_O_NOFOLLOW = getattr(os, "O_NOFOLLOW", 0)
+_DIR_FD_SUPPORTED = os.unlink in os.supports_dir_fd and os.scandir in os.supports_fd
+_RMDIR_DIR_FD_SUPPORTED = os.rmdir in os.supports_dir_fd
+
+
+class _DeleteNode:
+    """
+    一个待删除的目录；pending 是它尚未完成的工作数：自身的扫描加上还没删掉的子目录
+    st 和 parent_st 是扫描时目录本身和父目录的 stat，删除时据此确认没有被换成别的目录
+    """
+
+    __slots__ = ("path", "parent", "pending", "failed", "st", "parent_st")
+
+    def __init__(self, path: str, parent: Optional["_DeleteNode"], st: os.stat_result,
+                 parent_st: Optional[os.stat_result] = None):
+        self.path = path
+        self.parent = parent
+        self.pending = 1
+        self.failed = False
+        self.st = st
+        self.parent_st = parent.st if parent is not None else parent_st
+
+
+class _DeleteState:
+    """一次删除中所有目录共享的计数，outstanding 归零时整个删除结束"""
+
+    def __init__(self, task: TransferTask):
+        self.task = task
+        self.lock = threading.Lock()
+        self.idle = threading.Condition(self.lock)
+        self.outstanding = 0
+
+
+class DeleteEngine:
+    """
+    删除文件和目录树，或者把它们移到回收站
+    每个目录由一个工作线程打开，其中的文件以目录的 fd 为基准逐个 unlink，子目录作为独立的工作提交给线程池；
+    目录的最后一项工作完成时删除这个目录并通知父目录，整棵树自底向上删除，工作线程之间从不互相等待。
+    进度只统计删除的条目数，不对文件做 stat；取消后不再打开新的目录，已经删除的条目不会恢复
+    """
+
+    def __init__(self, max_workers: int = 8):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="delete")
+
+    def delete(self, paths: Iterable[Path],
+               on_progress: Optional[Callable[[TransferProgress], None]] = None,
+               on_done: Optional[Callable[[TransferTask], None]] = None) -> TransferTask:
+        """永久删除 paths；回调都在后台线程中执行"""
+        task = TransferTask(on_progress)
+        paths = [os.path.abspath(path) for path in paths]
+        threading.Thread(target=self._run_delete, args=(task, paths, on_done),
+                         name="delete-plan", daemon=True).start()
+        return task
+
+    def trash(self, paths: Iterable[Path],
+              on_done: Optional[Callable[[TransferTask], None]] = None) -> TransferTask:
+        """
+        把 paths 移到回收站（freedesktop.org Trash 规范，macOS 为 ~/.Trash）
+        每一项只做一次 rename：与主目录不在同一设备上时使用该设备根目录下的 .Trash-$uid
+        """
+        task = TransferTask()
+        paths = [os.path.abspath(path) for path in paths]
+        threading.Thread(target=self._run_trash, args=(task, paths, on_done),
+                         name="trash", daemon=True).start()
+        return task
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run_delete(self, task: TransferTask, paths: List[str], on_done: Optional[Callable]):
+        state = _DeleteState(task)
+        for path in paths:
+            if task.cancelled:
+                break
+            try:
+                st = os.lstat(path)
+                if not stat.S_ISDIR(st.st_mode):
+                    os.unlink(path)
+                    task._advance(0, 1)
+                elif _DIR_FD_SUPPORTED:
+                    parent_st = os.stat(os.path.dirname(path))
+                    self._submit_dir(state, _DeleteNode(path, None, st, parent_st))
+                else:
+                    shutil.rmtree(path)
+                    task._advance(0, 1)
+            except OSError as e:
+                task._fail(path, e)
+
+        with state.idle:
+            state.idle.wait_for(lambda: state.outstanding == 0)
+        task._finish()
+        if on_done is not None:
+            on_done(task)
+
+    def _submit_dir(self, state: _DeleteState, node: _DeleteNode):
+        with state.lock:
+            state.outstanding += 1
+        self._pool.submit(self._delete_dir, state, node)
+
+    def _delete_dir(self, state: _DeleteState, node: _DeleteNode):
+        task = state.task
+        removed = 0
+        try:
+            if task.cancelled:
+                return
+            subdirs = []
+            fd = os.open(node.path, os.O_RDONLY | _O_DIRECTORY | _O_NOFOLLOW)
+            try:
+                # 目录在 lstat 之后被换成了别的东西（例如指向别处的符号链接）时不删除
+                if not os.path.samestat(node.st, os.fstat(fd)):
+                    raise OSError(errno.ENOTDIR, "Directory changed during delete", node.path)
+                with os.scandir(fd) as entries:
+                    for entry in entries:
+                        if task.cancelled:
+                            break
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                subdirs.append((entry.name, entry.stat(follow_symlinks=False)))
+                            else:
+                                os.unlink(entry.name, dir_fd=fd)
+                                removed += 1
+                        except FileNotFoundError:
+                            pass
+                        except OSError as e:
+                            node.failed = True
+                            task._fail(os.path.join(node.path, entry.name), e)
+            finally:
+                os.close(fd)
+
+            for name, sub_st in subdirs:
+                if task.cancelled:
+                    break
+                with state.lock:
+                    node.pending += 1
+                self._submit_dir(state, _DeleteNode(os.path.join(node.path, name), node, sub_st))
+        except OSError as e:
+            node.failed = True
+            task._fail(node.path, e)
+        finally:
+            task._advance(0, removed)
+            self._release(state, node)
+            with state.idle:
+                state.outstanding -= 1
+                if not state.outstanding:
+                    state.idle.notify_all()
+
+    def _release(self, state: _DeleteState, node: Optional[_DeleteNode]):
+        """完成 node 的一项工作；目录的工作全部完成时删除它，并沿父目录向上传递"""
+        task = state.task
+        while node is not None:
+            with state.lock:
+                node.pending -= 1
+                if node.pending:
+                    return
+            if not node.failed and not task.cancelled:
+                try:
+                    _remove_dir(node)
+                    task._advance(0, 1)
+                except OSError as e:
+                    node.failed = True
+                    task._fail(node.path, e)
+            if node.failed and node.parent is not None:
+                node.parent.failed = True  # 子树里有删不掉的条目，父目录也不会是空的
+            node = node.parent
+
+    def _run_trash(self, task: TransferTask, paths: List[str], on_done: Optional[Callable]):
+        for path in paths:
+            if task.cancelled:
+                break
+            try:
+                _trash_one(path)
+                task._advance(0, 1)
+            except OSError as e:
+                task._fail(path, e)
+        task._finish()
+        if on_done is not None:
+            on_done(task)
+
+
+def _remove_dir(node: _DeleteNode):
+    """
+    删除已经清空的目录：打开父目录并确认它仍是扫描时的那个目录后，以父目录的 fd 为基准 rmdir，
+    路径中的上级目录在此期间被换成符号链接时不会删到别处；平台不支持 dir_fd 时按路径删除
+    """
+    if not _RMDIR_DIR_FD_SUPPORTED or node.parent_st is None:
+        os.rmdir(node.path)
+        return
+    parent, name = os.path.split(node.path)
+    fd = os.open(parent, os.O_RDONLY | _O_DIRECTORY)
+    try:
+        if not os.path.samestat(node.parent_st, os.fstat(fd)):
+            raise OSError(errno.ENOTDIR, "Directory changed during delete", parent)
+        os.rmdir(name, dir_fd=fd)
+    finally:
+        os.close(fd)
+
+
+def _trash_one(path: str):
+    if os.name == "nt":
+        raise OSError(errno.EOPNOTSUPP, "Moving to the recycle bin is not supported", path)
+    base = os.path.basename(path.rstrip(os.sep))
+    if sys.platform == "darwin":
+        trash = os.path.expanduser("~/.Trash")
+        os.rename(path, _unique_name(trash, base, lambda name: None))
+        return
+
+    trash = _trash_dir_for(path)
+    files_dir = os.path.join(trash, "files")
+    info_dir = os.path.join(trash, "info")
+    os.makedirs(files_dir, mode=0o700, exist_ok=True)
+    os.makedirs(info_dir, mode=0o700, exist_ok=True)
+
+    def reserve(name: str):
+        # 按规范先以 O_EXCL 创建 .trashinfo 占住名称，再移动文件
+        info_path = os.path.join(info_dir, name + ".trashinfo")
+        fd = os.open(info_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write("[Trash Info]\n"
+                    f"Path={quote(path)}\n"
+                    f"DeletionDate={datetime.now().strftime('%Y-%m-%dT%H:%M:%S')}\n")
+        return info_path
+
+    target = _unique_name(files_dir, base, reserve)
+    try:
+        os.rename(path, target)
+    except OSError:
+        os.unlink(os.path.join(info_dir, os.path.basename(target) + ".trashinfo"))
+        raise
+
+
+def _unique_name(directory: str, base: str, reserve: Callable[[str], Optional[str]]) -> str:
+    """在 directory 中为 base 找一个未被占用的名称，重名时依次加上 .2、.3 ……"""
+    name = base
+    number = 1
+    while True:
+        target = os.path.join(directory, name)
+        if not os.path.lexists(target):
+            try:
+                reserve(name)
+                return target
+            except FileExistsError:
+                pass
+        number += 1
+        name = f"{base}.{number}"
+
+
+def _trash_dir_for(path: str) -> str:
+    """与 path 在同一设备上的回收站目录：主目录回收站，或者挂载点下的 .Trash-$uid"""
+    device = os.lstat(path).st_dev
+    os.makedirs(TRASH_DIR, mode=0o700, exist_ok=True)
+    if os.stat(TRASH_DIR).st_dev == device:
+        return TRASH_DIR
+
+    top = os.path.dirname(path)
+    while True:
+        parent = os.path.dirname(top)
+        if parent == top or os.stat(parent).st_dev != device:
+            break
+        top = parent
+    return os.path.join(top, f".Trash-{os.getuid()}")
+
+
+delete_engine = DeleteEngine()
@@ -0,0 +1,190 @@
+import mmap
+import os
+import re
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# 超过这个长度的行从真正的行首起按这个长度切开显示，向后找行尾只在这个范围内查找
+MAX_LINE_BYTES = 4096
+# 判断是否为二进制文件时检查的开头字节数
+SNIFF_BYTES = 8192
+HEX_WIDTH = 16
+
+
+class MappedFile:
+    """
+    以只读 mmap 打开的文件
+    打开的代价与文件大小无关，读取时只有访问到的页会被载入
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(path, "rb") as f:
+            self.size = os.fstat(f.fileno()).st_size
+            # 空文件不能 mmap；映射在文件关闭后仍然有效
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+
+    def read(self, offset: int, length: int) -> bytes:
+        if self._map is None:
+            return b""
+        return self._map[max(0, offset):max(0, offset + length)]
+
+    def find(self, sub: bytes, start: int, end: int) -> int:
+        return self._map.find(sub, start, end) if self._map is not None else -1
+
+    def rfind(self, sub: bytes, start: int, end: int) -> int:
+        return self._map.rfind(sub, start, end) if self._map is not None else -1
+
+    def is_binary(self) -> bool:
+        return b"\0" in self.read(0, SNIFF_BYTES)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __enter__(self) -> "MappedFile":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class TextDocument:
+    """
+    按字节偏移定位的文本视图
+    视图的位置是某一行行首的字节偏移，翻页只需要在当前位置附近查找换行符，
+    因此跳到大文件的任意位置都不需要读取之前的内容。
+    从文件开头连续滚动时顺带记录行首偏移，已经索引到的位置可以显示行号
+    """
+
+    def __init__(self, mapped: MappedFile, encoding: str = "utf-8"):
+        self.mapped = mapped
+        self.encoding = encoding
+        self.offsets = array('q', [0])
+        # 最近一次向前查找超长行的结果：start 是行首，[start, end) 中没有换行符；
+        # 在同一行中连续向上滚动时不再重复查找整行
+        self._long_line = (0, 0)
+
+    @property
+    def size(self) -> int:
+        return self.mapped.size
+
+    def line_start(self, offset: int) -> int:
+        """
+        offset 所在片段的起点；行超过 MAX_LINE_BYTES 时从真正的行首起按 MAX_LINE_BYTES 切开，
+        与 next_line 切出的片段一致
+        """
+        offset = min(max(0, offset), self.size)
+        if offset == 0:
+            return 0
+        window = max(0, offset - MAX_LINE_BYTES)
+        newline = self.mapped.rfind(b"\n", window, offset)
+        if newline >= 0:
+            return newline + 1
+        start, end = self._long_line
+        if start <= window <= end:
+            self._long_line = (start, max(end, offset))
+        else:
+            start = self.mapped.rfind(b"\n", 0, window) + 1
+            self._long_line = (start, offset)
+        return start + (offset - start) // MAX_LINE_BYTES * MAX_LINE_BYTES
+
+    def next_line(self, offset: int) -> int:
+        newline = self.mapped.find(b"\n", offset, offset + MAX_LINE_BYTES)
+        if newline >= 0:
+            return newline + 1
+        return min(offset + MAX_LINE_BYTES, self.size)
+
+    def prev_line(self, offset: int) -> int:
+        return self.line_start(offset - 1) if offset > 0 else 0
+
+    def scroll(self, offset: int, lines: int) -> int:
+        """从行首 offset 向下（lines > 0）或向上滚动若干行，返回新的行首"""
+        for _ in range(abs(lines)):
+            if lines > 0:
+                following = self.next_line(offset)
+                if following >= self.size:
+                    break
+                offset = following
+            else:
+                if offset == 0:
+                    break
+                offset = self.prev_line(offset)
+        return offset
+
+    def lines(self, offset: int, count: int) -> List[Tuple[int, str]]:
+        """从行首 offset 开始的至多 count 行，返回 (行首偏移, 文本)"""
+        result = []
+        while len(result) < count and offset < self.size:
+            end = self.next_line(offset)
+            if offset == self.offsets[-1]:
+                self.offsets.append(end)  # 与已有索引相接时顺带建立索引
+            text = self.mapped.read(offset, end - offset).decode(self.encoding, errors="replace")
+            result.append((offset, text.rstrip("\r\n")))
+            offset = end
+        return result
+
+    def line_number(self, offset: int) -> Optional[int]:
+        """行首 offset 的行号（从 0 开始），该位置还没有被索引时返回 None"""
+        if offset > self.offsets[-1]:
+            return None
+        i = bisect_right(self.offsets, offset) - 1
+        return i if self.offsets[i] == offset else None
+
+
+def hex_lines(mapped: MappedFile, offset: int, count: int, width: int = HEX_WIDTH) -> List[str]:
+    """从 offset 开始的 count 行十六进制转储：偏移、十六进制字节和可打印字符"""
+    data = mapped.read(offset, count * width)
+    lines = []
+    for i in range(0, len(data), width):
+        chunk = data[i:i + width]
+        text = "".join(chr(b) if 32 <= b < 127 else "." for b in chunk)
+        lines.append(f"{offset + i:08x}  {chunk.hex(' '):<{width * 3 - 1}}  {text}")
+    return lines
+
+
+_KEYWORDS = {
+    "python": "False None True and as assert async await break class continue def del elif else except "
+              "finally for from global if import in is lambda nonlocal not or pass raise return try while with yield",
+    "c": "auto break case char const continue default do double else enum extern float for goto if int long "
+         "register return short signed sizeof static struct switch typedef union unsigned void volatile while "
+         "class public private protected new delete this true false null function var let import export",
+    "json": "true false null",
+}
+_LANGUAGES = {
+    ".py": ("python", "#"), ".pyw": ("python", "#"), ".sh": ("python", "#"),
+    ".toml": ("json", "#"), ".yaml": ("json", "#"), ".yml": ("json", "#"), ".ini": ("json", r"[#;]"),
+    ".c": ("c", "//"), ".h": ("c", "//"), ".cpp": ("c", "//"), ".hpp": ("c", "//"), ".java": ("c", "//"),
+    ".js": ("c", "//"), ".ts": ("c", "//"), ".go": ("c", "//"), ".rs": ("c", "//"), ".cs": ("c", "//"),
+    ".json": ("json", None),
+}
+_highlighters: Dict[str, re.Pattern] = {}
+
+
+def highlight(line: str, extension: str) -> List[Tuple[str, int, int]]:
+    """
+    单行的简单语法高亮，返回 (标签, 起始列, 结束列)
+    只处理单行内的注释、字符串、数字和关键字，由界面对可视行逐行调用
+    """
+    pattern = _highlighter(extension.lower())
+    if pattern is None:
+        return []
+    return [(match.lastgroup, match.start(), match.end()) for match in pattern.finditer(line)]
+
+
+def _highlighter(extension: str) -> Optional[re.Pattern]:
+    if extension not in _LANGUAGES:
+        return None
+    if extension not in _highlighters:
+        language, comment = _LANGUAGES[extension]
+        parts = []
+        if comment is not None:
+            parts.append(rf"(?P<comment>{comment}.*$)")
+        parts.append(r"""(?P<string>"(?:\\.|[^"\\])*"?|'(?:\\.|[^'\\])*'?)""")
+        parts.append(r"(?P<number>\b\d+(?:\.\d+)?\b)")
+        parts.append(r"(?P<keyword>\b(?:" + "|".join(_KEYWORDS[language].split()) + r")\b)")
+        _highlighters[extension] = re.compile("|".join(parts))
+    return _highlighters[extension]
@@ -0,0 +1,61 @@
+from typing import List, Optional, Tuple
+
+from tkinter_file_manager.core.dir_listing import DirListing
+
+
+class ListingFilter:
+    """
+    在当前目录的列表上按名称过滤（不区分大小写的子串匹配），结果是匹配行的下标
+    每次过滤的结果按查询保存成一条链，新查询包含上一次的查询时只在上一次的结果里继续筛选；
+    删除字符时退回到链上仍然适用的结果，不必重新扫描整个列表。
+    追加到列表末尾的条目会自动补进各级结果；列表被原地修改后需要调用 invalidate
+    """
+
+    def __init__(self):
+        self._listing: Optional[DirListing] = None
+        # 每个名称的 casefold 形式，只在第一次过滤时计算
+        self._keys: List[str] = []
+        # (查询, 匹配的下标)，后一项的查询总是包含前一项的查询
+        self._history: List[Tuple[str, List[int]]] = []
+
+    def apply(self, listing: DirListing, query: str) -> Optional[List[int]]:
+        """返回 listing 中名称包含 query 的下标，按原顺序排列；query 为空时返回 None 表示不过滤"""
+        query = query.casefold()
+        if listing is not self._listing:
+            self._listing = listing
+            self._keys = []
+            self._history = []
+        if not query:
+            self._history = []
+            return None
+        self._catch_up(listing)
+
+        history = self._history
+        while history and history[-1][0] not in query:
+            history.pop()
+        if history and history[-1][0] == query:
+            return history[-1][1]
+        keys = self._keys
+        if history:
+            matches = [i for i in history[-1][1] if query in keys[i]]
+        else:
+            matches = [i for i, key in enumerate(keys) if query in key]
+        history.append((query, matches))
+        return matches
+
+    def invalidate(self):
+        """列表被原地修改（删除、插入）后下标不再有效，下一次 apply 重新扫描"""
+        self._listing = None
+        self._keys = []
+        self._history = []
+
+    def _catch_up(self, listing: DirListing):
+        """为追加到末尾的条目计算名称，并补进每一级结果"""
+        keys = self._keys
+        start = len(keys)
+        names = listing.names
+        if start == len(names):
+            return
+        keys.extend(name.casefold() for name in names[start:])
+        for query, matches in self._history:
+            matches.extend(i for i in range(start, len(keys)) if query in keys[i])
@@ -0,0 +1,335 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Any
+
+from tkinter_file_manager.core.dir_listing import DirListing, FLAG_DIR, FLAG_SYMLINK
+from tkinter_file_manager.core.file_operations import iter_dir_listing
+from tkinter_file_manager.core.search import SearchQuery, MODE_SUBSTRING, KIND_DIR, KIND_FILE
+
+DEFAULT_INDEX_PATH = Path.home() / ".cache" / "tkinter-file-manager" / "index.sqlite3"
+# 每处理这么多个目录提交一次事务
+COMMIT_EVERY = 200
+# trigram 分词器至少需要 3 个字符，更短的查询退回 LIKE
+TRIGRAM_MIN_LENGTH = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS roots (
+    path TEXT PRIMARY KEY,
+    built_at REAL
+);
+CREATE TABLE IF NOT EXISTS dirs (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    dir_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    flags INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_dir ON files(dir_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING fts5(
+    name, content='files', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS files_ai AFTER INSERT ON files BEGIN
+    INSERT INTO files_fts(rowid, name) VALUES (new.id, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS files_ad AFTER DELETE ON files BEGIN
+    INSERT INTO files_fts(files_fts, rowid, name) VALUES ('delete', old.id, old.name);
+END;
+"""
+
+
+class FileIndex:
+    """
+    持久化的文件名索引（SQLite + FTS5 trigram）
+    记录每个目录的 mtime 和其中条目的名称、大小、修改时间；
+    重新构建或再次访问目录时，mtime 未变化的目录不会重新读取。
+    连接在多个线程间共享，所有数据库操作都持有同一把锁；
+    再次访问时发现的新子树在索引自己的单个工作线程中补全，不占用调用方（扫描线程池）的线程
+    """
+
+    def __init__(self, db_path: Path = DEFAULT_INDEX_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="file-index")
+        # close() 时设置，取消还在进行和排队的子树补全
+        self._closing = threading.Event()
+
+    def close(self):
+        self._closing.set()
+        self._worker.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            self._conn.close()
+
+    def flush(self, timeout: Optional[float] = None):
+        """等待已提交的子树补全执行完"""
+        self._worker.submit(lambda: None).result(timeout)
+
+    # ---- 构建与增量更新 ----
+
+    def build(self, root: Path, cancel: Optional[threading.Event] = None,
+              on_progress: Optional[Callable[[int], None]] = None) -> int:
+        """
+        建立或更新 root 下的索引，返回重新读取的目录数
+        mtime 未变化的目录直接沿用索引中记录的子目录继续向下，不读取目录内容
+        """
+        root = os.path.realpath(root)
+        rescanned = visited = 0
+        queue = deque([root])
+        with self._lock:
+            self._conn.execute("INSERT OR IGNORE INTO roots(path, built_at) VALUES (?, NULL)", (root,))
+
+        while queue:
+            if cancel is not None and cancel.is_set():
+                break
+            path = queue.popleft()
+            with self._lock:
+                subdirs, changed = self._update_dir(path)
+                visited += 1
+                rescanned += changed
+                if visited % COMMIT_EVERY == 0:
+                    self._conn.commit()
+            queue.extend(subdirs)
+            if on_progress is not None and visited % COMMIT_EVERY == 0:
+                on_progress(visited)
+
+        with self._lock:
+            if cancel is None or not cancel.is_set():
+                self._conn.execute("UPDATE roots SET built_at = ? WHERE path = ?", (time.time(), root))
+            self._conn.commit()
+        return rescanned
+
+    def build_in_background(self, root: Path,
+                            on_done: Optional[Callable[[int], None]] = None) -> threading.Event:
+        """在后台线程构建索引，返回可用于取消的 Event"""
+        cancel = threading.Event()
+
+        def run():
+            rescanned = self.build(root, cancel)
+            if on_done is not None:
+                on_done(rescanned)
+
+        threading.Thread(target=run, name="file-index", daemon=True).start()
+        return cancel
+
+    def rebuild(self, root: Path, cancel: Optional[threading.Event] = None) -> int:
+        """丢弃 root 下的全部记录后重新构建"""
+        with self._lock:
+            self._delete_subtree(os.path.realpath(root))
+            self._conn.commit()
+        return self.build(root, cancel)
+
+    def revisit(self, path: Path, cancel: Optional[threading.Event] = None) -> bool:
+        """
+        再次访问目录时调用：目录位于已索引的根目录下且 mtime 变化时，更新这一层的记录
+        未变化时只花费一次 stat 和一次查询，返回是否更新了这一层。
+        新出现的子目录提交到索引的工作线程中补全，设置 cancel（或关闭索引）即停止
+        """
+        path = os.path.realpath(path)
+        with self._lock:
+            if not self._is_covered(path):
+                return False
+            subdirs, changed = self._update_dir(path)
+            # 新出现的子目录还没有记录，需要向下补全
+            new_subdirs = [sub for sub in subdirs if self._dir_mtime(sub) is None]
+            self._conn.commit()
+        for sub in new_subdirs:
+            self._worker.submit(self.build_subtree, sub, cancel if cancel is not None else self._closing)
+        return bool(changed)
+
+    def build_subtree(self, path: str, cancel: Optional[threading.Event] = None) -> bool:
+        """
+        读取 path 下的全部目录，返回是否完整读完
+        被取消时已读取的目录留在索引中，其余部分由下一次 build 补全
+        """
+        queue = deque([path])
+        while queue:
+            if cancel is not None and cancel.is_set():
+                break
+            with self._lock:
+                subdirs, _changed = self._update_dir(queue.popleft())
+            queue.extend(subdirs)
+        with self._lock:
+            self._conn.commit()
+        return not queue
+
+    def _update_dir(self, path: str):
+        """返回 (子目录列表, 是否重新读取)，调用方持有锁"""
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            self._delete_subtree(path)
+            return [], 1
+
+        row = self._conn.execute("SELECT id, mtime_ns FROM dirs WHERE path = ?", (path,)).fetchone()
+        if row is not None and row[1] == mtime_ns:
+            names = self._conn.execute(
+                "SELECT name FROM files WHERE dir_id = ? AND flags & ? = ?",
+                (row[0], FLAG_DIR | FLAG_SYMLINK, FLAG_DIR)).fetchall()
+            return [os.path.join(path, name) for (name,) in names], 0
+
+        listing = DirListing(path)
+        try:
+            for batch in iter_dir_listing(Path(path)):
+                listing.extend(batch)
+        except (OSError, RuntimeError):
+            self._delete_subtree(path)
+            return [], 1
+
+        if row is None:
+            dir_id = self._conn.execute(
+                "INSERT INTO dirs(path, mtime_ns) VALUES (?, ?)", (path, mtime_ns)).lastrowid
+            old_dirs = set()
+        else:
+            dir_id = row[0]
+            old_dirs = {
+                name for (name,) in self._conn.execute(
+                    "SELECT name FROM files WHERE dir_id = ? AND flags & ? = ?",
+                    (dir_id, FLAG_DIR | FLAG_SYMLINK, FLAG_DIR))
+            }
+            self._conn.execute("DELETE FROM files WHERE dir_id = ?", (dir_id,))
+            self._conn.execute("UPDATE dirs SET mtime_ns = ? WHERE id = ?", (mtime_ns, dir_id))
+
+        self._conn.executemany(
+            "INSERT INTO files(dir_id, name, size, mtime, flags) VALUES (?, ?, ?, ?, ?)",
+            ((dir_id, listing.names[i], listing.sizes[i], listing.mtimes[i], listing.flags[i])
+             for i in range(len(listing))))
+
+        subdirs = [
+            listing.names[i] for i in range(len(listing))
+            if listing.flags[i] & (FLAG_DIR | FLAG_SYMLINK) == FLAG_DIR
+        ]
+        for name in old_dirs.difference(subdirs):
+            self._delete_subtree(os.path.join(path, name))
+        return [os.path.join(path, name) for name in subdirs], 1
+
+    def _delete_subtree(self, path: str):
+        low, high = _prefix_range(path)
+        condition = "path = ? OR (path >= ? AND path < ?)"
+        self._conn.execute(
+            f"DELETE FROM files WHERE dir_id IN (SELECT id FROM dirs WHERE {condition})", (path, low, high))
+        self._conn.execute(f"DELETE FROM dirs WHERE {condition}", (path, low, high))
+
+    def _dir_mtime(self, path: str) -> Optional[int]:
+        row = self._conn.execute("SELECT mtime_ns FROM dirs WHERE path = ?", (path,)).fetchone()
+        return None if row is None else row[0]
+
+    def _is_covered(self, path: str) -> bool:
+        for (root,) in self._conn.execute("SELECT path FROM roots"):
+            if path == root or path.startswith(root.rstrip(os.sep) + os.sep):
+                return True
+        return False
+
+    # ---- 查询 ----
+
+    def covers(self, path: Path) -> bool:
+        """path 是否位于已经构建完成的索引根目录下"""
+        path = os.path.realpath(path)
+        with self._lock:
+            for (root,) in self._conn.execute("SELECT path FROM roots WHERE built_at IS NOT NULL"):
+                if path == root or path.startswith(root.rstrip(os.sep) + os.sep):
+                    return True
+        return False
+
+    def supports(self, query: SearchQuery) -> bool:
+        """索引只支持子串匹配（不区分大小写），glob 和正则需要遍历磁盘"""
+        return query.mode == MODE_SUBSTRING and not query.case_sensitive and query.max_depth is None
+
+    def query(self, root: Path, query: SearchQuery) -> DirListing:
+        """
+        在 root 下查询，返回与 SearchEngine 相同格式的 DirListing（names 为相对 root 的路径）
+        """
+        if not self.supports(query):
+            raise ValueError("Query is not supported by the index")
+        root = os.path.realpath(root)
+        low, high = _prefix_range(root)
+
+        sql = ["SELECT d.path, f.name, f.size, f.mtime, f.flags FROM"]
+        params: List[Any] = []
+        if len(query.pattern) >= TRIGRAM_MIN_LENGTH:
+            sql.append("files_fts JOIN files f ON f.id = files_fts.rowid JOIN dirs d ON d.id = f.dir_id"
+                       " WHERE files_fts MATCH ?")
+            params.append('"' + query.pattern.replace('"', '""') + '"')
+        else:
+            sql.append("files f JOIN dirs d ON d.id = f.dir_id WHERE instr(lower(f.name), ?) > 0")
+            params.append(query.pattern.lower())
+        sql.append("AND (d.path = ? OR (d.path >= ? AND d.path < ?))")
+        params += [root, low, high]
+        if query.kind == KIND_DIR:
+            sql.append(f"AND f.flags & {FLAG_DIR}")
+        elif query.kind == KIND_FILE:
+            sql.append(f"AND NOT f.flags & {FLAG_DIR}")
+        if not query.include_hidden:
+            sql.append("AND f.name NOT LIKE '.%'")
+        for column, op, value in (("f.size", ">=", query.min_size), ("f.size", "<=", query.max_size),
+                                  ("f.mtime", ">=", query.modified_after),
+                                  ("f.mtime", "<=", query.modified_before)):
+            if value is not None:
+                sql.append(f"AND {column} {op} ?")
+                params.append(value)
+        if query.max_results is not None:
+            sql.append("LIMIT ?")
+            params.append(query.max_results)
+
+        result = DirListing(Path(root))
+        with self._lock:
+            rows = self._conn.execute(" ".join(sql), params).fetchall()
+        for dir_path, name, size, mtime, flags in rows:
+            full_path = os.path.join(dir_path, name)
+            result.add(os.path.relpath(full_path, root), size, mtime, flags)
+        return result
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            roots = self._conn.execute("SELECT path, built_at FROM roots ORDER BY path").fetchall()
+            dirs = self._conn.execute("SELECT count(*) FROM dirs").fetchone()[0]
+            files = self._conn.execute("SELECT count(*) FROM files").fetchone()[0]
+        return {
+            "db_path": str(self.db_path),
+            "db_bytes": self.db_path.stat().st_size if self.db_path.exists() else 0,
+            "roots": [{"path": path, "built_at": built_at} for path, built_at in roots],
+            "dirs": dirs,
+            "files": files,
+        }
+
+    def remove_root(self, root: Path):
+        root = os.path.realpath(root)
+        with self._lock:
+            self._delete_subtree(root)
+            self._conn.execute("DELETE FROM roots WHERE path = ?", (root,))
+            self._conn.commit()
+
+
+def _prefix_range(path: str):
+    """返回 path 下所有子路径所在的字符串区间 [low, high)"""
+    prefix = path.rstrip(os.sep) + os.sep
+    return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+
+_default_index: Optional[FileIndex] = None
+_default_lock = threading.Lock()
+
+
+def default_index(create: bool = False) -> Optional[FileIndex]:
+    """
+    默认位置的索引；索引是可选的，除非 create=True，否则数据库文件不存在时返回 None
+    """
+    global _default_index
+    with _default_lock:
+        if _default_index is None and (create or DEFAULT_INDEX_PATH.exists()):
+            _default_index = FileIndex(DEFAULT_INDEX_PATH)
+        return _default_index
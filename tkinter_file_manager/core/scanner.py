@@ -0,0 +1,191 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from tkinter_file_manager.core.dir_cache import DirListingCache, listing_cache
+from tkinter_file_manager.core.dir_listing import DirListing
+from tkinter_file_manager.core.file_operations import iter_dir_listing
+from tkinter_file_manager.utils.logging import span, tracer
+
+# 每次 drain 最多占用主线程的时间（秒），避免一次性回放太多结果卡住界面
+DRAIN_BUDGET = 0.010
+
+
+class ScanTask:
+    """一次后台目录扫描，可随时取消"""
+
+    def __init__(self, path: Path, key: Optional[str], fast: bool,
+                 on_batch: Optional[Callable[[DirListing], None]],
+                 on_done: Optional[Callable[[DirListing], None]],
+                 on_error: Optional[Callable[[Exception], None]]):
+        self.path = path
+        self.key = key
+        self.fast = fast
+        self.on_batch = on_batch
+        self.on_done = on_done
+        self.on_error = on_error
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+
+class ScanExecutor:
+    """
+    在工作线程中扫描目录
+    工作线程只把结果放进队列，回调统一在调用 drain() 的线程中执行；attach() 之后结果改由传入的
+    dispatch 投递（界面使用 ui_events.call，与其他后台结果共用同一个事件总线和派发周期）。
+    同一个 key 的新扫描会取消旧扫描（即使旧扫描已经结束但结果还在队列中），
+    已取消扫描的结果在投递前被丢弃。
+    设置了 cache 时，目录未变化则直接用缓存列表调用 on_done，不再产生批次
+    """
+
+    def __init__(self, max_workers: int = 2, batch_size: int = 256,
+                 cache: Optional[DirListingCache] = None):
+        self.batch_size = batch_size
+        self.cache = cache
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scan")
+        self._results: "queue.SimpleQueue[tuple]" = queue.SimpleQueue()
+        self._latest: Dict[str, ScanTask] = {}
+        self._lock = threading.Lock()
+        self._dispatch: Optional[Callable[[Callable, Any], None]] = None
+
+    def submit(self, path: Path,
+               on_batch: Optional[Callable[[DirListing], None]] = None,
+               on_done: Optional[Callable[[DirListing], None]] = None,
+               on_error: Optional[Callable[[Exception], None]] = None,
+               key: Optional[str] = None,
+               fast: bool = False) -> ScanTask:
+        """
+        提交扫描任务
+        on_batch 收到未排序的 DirListing 批次，on_done 收到排好序的完整 DirListing，on_error 收到扫描异常；
+        fast=True 时使用不做 stat 的快速扫描，见 iter_dir_listing
+        """
+        task = ScanTask(path, key, fast, on_batch, on_done, on_error)
+        if key is not None:
+            with self._lock:
+                previous = self._latest.get(key)
+                self._latest[key] = task
+            if previous is not None:
+                previous.cancel()
+
+        self._pool.submit(self._run, task)
+        return task
+
+    def cancel(self, key: str):
+        with self._lock:
+            task = self._latest.pop(key, None)
+        if task is not None:
+            task.cancel()
+
+    def drain(self, budget: float = DRAIN_BUDGET) -> int:
+        """在当前线程执行已就绪的回调，返回执行的回调数"""
+        started = time.perf_counter()
+        deadline = started + budget
+        handled = 0
+        while True:
+            try:
+                item = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if self._deliver(item):
+                handled += 1
+            if time.perf_counter() >= deadline:
+                break
+        if handled and tracer.enabled:
+            # 空轮询不记录，否则每秒几十个空 span 会挤掉有用的记录
+            tracer.record("dispatch", "event", started, time.perf_counter() - started, {"handled": handled})
+        return handled
+
+    def attach(self, dispatch: Callable[[Callable, Any], None]):
+        """
+        之后的结果以 dispatch(回调, 结果) 投递，例如 ui_events.call；已在队列中的结果一并转交
+        重复调用只替换 dispatch，不依赖任何窗口，窗口重建后结果照常送达
+        """
+        with self._lock:
+            self._dispatch = dispatch
+            while True:
+                try:
+                    item = self._results.get_nowait()
+                except queue.Empty:
+                    break
+                dispatch(self._deliver, item)
+
+    def shutdown(self):
+        with self._lock:
+            tasks = list(self._latest.values())
+            self._latest.clear()
+        for task in tasks:
+            task.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, task: ScanTask):
+        if task.cancelled:
+            return
+
+        if self.cache is not None:
+            cached = self.cache.get(task.path)
+            if cached is not None:
+                if task.on_done is not None:
+                    self._post(task, task.on_done, cached)
+                return
+
+        contents = DirListing(task.path)
+        try:
+            with span("scan", "io", path=task.path):
+                batches = iter_dir_listing(task.path, batch_size=self.batch_size, fast=task.fast)
+                mtime_ns = os.stat(task.path).st_mtime_ns
+                for batch in batches:
+                    if task.cancelled:
+                        batches.close()
+                        return
+                    contents.extend(batch)
+                    if task.on_batch is not None:
+                        self._post(task, task.on_batch, batch)
+            with span("sort"):
+                contents = contents.sorted()
+            if self.cache is not None:
+                self.cache.put(task.path, contents, mtime_ns)
+        except Exception as e:
+            if task.on_error is not None:
+                self._post(task, task.on_error, e)
+            return
+
+        if task.on_done is not None:
+            self._post(task, task.on_done, contents)
+
+        # 目录在已建立索引的范围内时顺便更新索引（mtime 未变化时只有一次 stat）
+        # 索引模块（及 sqlite3）只在工作线程中按需导入，不拖慢启动
+        from tkinter_file_manager.core.index import default_index
+        index = default_index()
+        if index is not None:
+            index.revisit(task.path)
+
+    def _post(self, task: ScanTask, callback: Callable, payload):
+        if task.cancelled:
+            return
+        with self._lock:
+            if self._dispatch is not None:
+                self._dispatch(self._deliver, (task, callback, payload))
+            else:
+                self._results.put((task, callback, payload))
+
+    @staticmethod
+    def _deliver(item: tuple) -> bool:
+        """执行一个结果的回调；扫描在投递之后被取消的结果在这里丢弃"""
+        task, callback, payload = item
+        if task.cancelled:
+            return False
+        callback(payload)
+        return True
+
+
+scan_executor = ScanExecutor(cache=listing_cache)
@@ -0,0 +1,256 @@
+import fnmatch
+import os
+import queue
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+from tkinter_file_manager.core.dir_listing import DirListing, FLAG_DIR, FLAG_HIDDEN, FLAG_SYMLINK, FLAG_PENDING
+
+MODE_SUBSTRING = "substring"
+MODE_GLOB = "glob"
+MODE_REGEX = "regex"
+
+KIND_FILE = "file"
+KIND_DIR = "dir"
+
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+_SIZE_FILTER = re.compile(r"^size([<>])(\d+(?:\.\d+)?)([KMGT]?)B?$", re.IGNORECASE)
+
+
+class SearchQuery:
+    """
+    搜索条件
+    名称匹配支持子串、glob 和正则三种模式（默认不区分大小写），
+    另外可以按大小、修改时间和类型过滤；只有名称匹配且需要大小/时间过滤时才会 stat
+    """
+
+    def __init__(self, pattern: str, mode: str = MODE_SUBSTRING, case_sensitive: bool = False,
+                 min_size: Optional[int] = None, max_size: Optional[int] = None,
+                 modified_after: Optional[float] = None, modified_before: Optional[float] = None,
+                 kind: Optional[str] = None, max_depth: Optional[int] = None,
+                 max_results: Optional[int] = 10000, include_hidden: bool = True):
+        self.pattern = pattern
+        self.mode = mode
+        self.case_sensitive = case_sensitive
+        self.min_size = min_size
+        self.max_size = max_size
+        self.modified_after = modified_after
+        self.modified_before = modified_before
+        self.kind = kind
+        self.max_depth = max_depth
+        self.max_results = max_results
+        self.include_hidden = include_hidden
+        self.match_name = self._compile()
+
+    @classmethod
+    def parse(cls, text: str, **kwargs) -> "SearchQuery":
+        """
+        解析搜索框中的文本
+        支持的过滤词：type:file、type:dir、size>10M、size<1K、after:2024-01-01、before:2024-12-31；
+        re: 开头的词作为正则，含 * ? [ 的词作为 glob，其余作为子串
+        """
+        words = []
+        for token in text.split():
+            lower = token.lower()
+            size_filter = _SIZE_FILTER.match(token)
+            if lower in ("type:file", "type:dir"):
+                kwargs["kind"] = lower[5:]
+            elif size_filter:
+                op, number, unit = size_filter.groups()
+                size = int(float(number) * _SIZE_UNITS[unit.upper()])
+                kwargs["min_size" if op == ">" else "max_size"] = size
+            elif lower.startswith(("after:", "before:")):
+                name, _, value = token.partition(":")
+                timestamp = datetime.strptime(value, "%Y-%m-%d").timestamp()
+                kwargs["modified_after" if name.lower() == "after" else "modified_before"] = timestamp
+            else:
+                words.append(token)
+
+        pattern = " ".join(words)
+        if pattern.startswith("re:"):
+            return cls(pattern[3:], mode=MODE_REGEX, **kwargs)
+        if any(ch in pattern for ch in "*?["):
+            return cls(pattern, mode=MODE_GLOB, **kwargs)
+        return cls(pattern, mode=MODE_SUBSTRING, **kwargs)
+
+    @property
+    def needs_stat(self) -> bool:
+        return (self.min_size is not None or self.max_size is not None
+                or self.modified_after is not None or self.modified_before is not None)
+
+    def _compile(self) -> Callable[[str], bool]:
+        flags = 0 if self.case_sensitive else re.IGNORECASE
+        if self.mode == MODE_REGEX:
+            return re.compile(self.pattern, flags).search
+        if self.mode == MODE_GLOB:
+            return re.compile(fnmatch.translate(self.pattern), flags).match
+        if self.mode != MODE_SUBSTRING:
+            raise ValueError(f"Unknown search mode {self.mode}")
+        if self.case_sensitive:
+            pattern = self.pattern
+            return lambda name: pattern in name
+        pattern = self.pattern.lower()
+        return lambda name: pattern in name.lower()
+
+    def accepts_stat(self, st: os.stat_result, is_dir: bool) -> bool:
+        size = 0 if is_dir else st.st_size
+        if self.min_size is not None and size < self.min_size:
+            return False
+        if self.max_size is not None and size > self.max_size:
+            return False
+        if self.modified_after is not None and st.st_mtime < self.modified_after:
+            return False
+        if self.modified_before is not None and st.st_mtime > self.modified_before:
+            return False
+        return True
+
+
+class SearchTask:
+    """一次正在进行的搜索"""
+
+    def __init__(self, root: Path, query: SearchQuery):
+        self.root = root
+        self.query = query
+        self.count = 0
+        self.truncated = False
+        self._cancelled = threading.Event()
+        self._finished = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def finished(self) -> bool:
+        return self._finished.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._finished.wait(timeout)
+
+
+class SearchEngine:
+    """
+    并行递归搜索
+    max_workers 个线程共享一个待扫描目录队列，每个线程同一时间最多打开一个目录，
+    因此文件描述符的占用不超过线程数。不进入符号链接指向的目录，避免循环。
+    每扫描完一个目录，就把其中的匹配项作为一个 DirListing 批次交给 on_results；
+    批次的 root 是搜索根目录，names 是相对路径。回调在工作线程中执行。
+    没有大小/时间过滤时结果不做 stat，条目带 FLAG_PENDING
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+
+    def search(self, root: Path, query: SearchQuery,
+               on_results: Callable[[DirListing], None],
+               on_done: Optional[Callable[[SearchTask], None]] = None) -> SearchTask:
+        root = Path(root)
+        if not root.is_dir():
+            raise NotADirectoryError(f"{root} is not a directory")
+
+        task = SearchTask(root, query)
+        pending: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        pending.put(("", 0))
+        lock = threading.Lock()
+        workers = [
+            threading.Thread(target=self._worker, args=(task, pending, lock, on_results),
+                             name=f"search-{i}", daemon=True)
+            for i in range(self.max_workers)
+        ]
+        for worker in workers:
+            worker.start()
+
+        def finish():
+            pending.join()
+            for _ in workers:
+                pending.put(None)
+            for worker in workers:
+                worker.join()
+            task._finished.set()
+            if on_done is not None:
+                on_done(task)
+
+        threading.Thread(target=finish, name="search-join", daemon=True).start()
+        return task
+
+    def _worker(self, task: SearchTask, pending: queue.Queue, lock: threading.Lock,
+                on_results: Callable[[DirListing], None]):
+        root = str(task.root)
+        while True:
+            item = pending.get()
+            if item is None:
+                pending.task_done()
+                return
+            try:
+                if not task.cancelled:
+                    relative, depth = item
+                    matches = self._scan(task, root, relative, depth, pending)
+                    if len(matches):
+                        with lock:
+                            limit = task.query.max_results
+                            if limit is not None and task.count + len(matches) >= limit:
+                                matches = matches.take(range(limit - task.count))
+                                task.truncated = True
+                                task.cancel()
+                            task.count += len(matches)
+                        if len(matches):
+                            on_results(matches)
+            finally:
+                pending.task_done()
+
+    def _scan(self, task: SearchTask, root: str, relative: str, depth: int, pending: queue.Queue) -> DirListing:
+        query = task.query
+        matches = DirListing(task.root)
+        descend = query.max_depth is None or depth < query.max_depth
+        try:
+            with os.scandir(os.path.join(root, relative)) as entries:
+                for entry in entries:
+                    if task.cancelled:
+                        break
+                    name = entry.name
+                    hidden = name.startswith('.')
+                    if hidden and not query.include_hidden:
+                        continue
+                    try:
+                        is_symlink = entry.is_symlink()
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        continue
+                    child = os.path.join(relative, name) if relative else name
+                    if is_dir and descend and not is_symlink:
+                        pending.put((child, depth + 1))
+
+                    if query.kind == KIND_DIR and not is_dir or query.kind == KIND_FILE and is_dir:
+                        continue
+                    if not query.match_name(name):
+                        continue
+                    flags = FLAG_DIR if is_dir else 0
+                    if hidden:
+                        flags |= FLAG_HIDDEN
+                    if is_symlink:
+                        flags |= FLAG_SYMLINK
+                    size, mtime = 0, 0.0
+                    if query.needs_stat:
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        if not query.accepts_stat(st, is_dir):
+                            continue
+                        size = 0 if is_dir else st.st_size
+                        mtime = st.st_mtime
+                    else:
+                        flags |= FLAG_PENDING  # 大小和时间在显示时再读取
+                    matches.add(child, size, mtime, flags)
+        except OSError:
+            pass  # 无权限或已被删除的目录直接跳过
+        return matches
+
+
+search_engine = SearchEngine()
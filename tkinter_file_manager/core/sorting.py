@@ -0,0 +1,226 @@
+import re
+from array import array
+from typing import Callable, Dict, List, Optional, Tuple
+
+from tkinter_file_manager.core.dir_listing import DirListing, FLAG_DIR
+from tkinter_file_manager.utils.logging import traced
+
+SORT_NAME = "name"
+SORT_SIZE = "size"
+SORT_MTIME = "mtime"
+SORT_EXTENSION = "extension"
+SORT_TYPE = "type"
+SORT_COLUMNS = (SORT_NAME, SORT_SIZE, SORT_MTIME, SORT_EXTENSION, SORT_TYPE)
+
+_DIGITS = re.compile(r"(\d+)")
+
+
+def natural_key(name: str) -> tuple:
+    """自然顺序：名称中的数字按数值比较，file2 排在 file10 之前"""
+    parts = _DIGITS.split(name.casefold())
+    parts[1::2] = map(int, parts[1::2])
+    return tuple(parts)
+
+
+class SortSpec:
+    """排序方式：列、方向，名称是否按自然顺序比较；无论哪种方式目录都排在文件前面"""
+
+    __slots__ = ("column", "descending", "natural")
+
+    def __init__(self, column: str = SORT_NAME, descending: bool = False, natural: bool = False):
+        if column not in SORT_COLUMNS:
+            raise ValueError(f"Unknown sort column {column}")
+        self.column = column
+        self.descending = descending
+        self.natural = natural
+
+    @property
+    def needs_metadata(self) -> bool:
+        """按大小或时间排序前，快速扫描的条目需要先 hydrate"""
+        return self.column in (SORT_SIZE, SORT_MTIME)
+
+    def toggled(self, column: str) -> "SortSpec":
+        """点击列标题：同一列切换方向，其他列从升序开始"""
+        if column == self.column:
+            return SortSpec(column, not self.descending, self.natural)
+        return SortSpec(column, False, self.natural)
+
+    def _key(self) -> tuple:
+        return self.column, self.descending, self.natural
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SortSpec) and self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __repr__(self) -> str:
+        return f"SortSpec({self.column!r}, descending={self.descending}, natural={self.natural})"
+
+
+class Sorter:
+    """
+    按 SortSpec 排序 DirListing
+    每一列第一次使用时算出各行在该列升序中的名次并缓存，之后切换方向或切回这一列时
+    只需按名次把行放回原位，不再比较。非名称列以名称作为第二关键字（在名称顺序上做稳定排序）。
+    缓存的名次随排序结果一起重排；条目增删之后缓存失效，插入只做二分查找。
+    按大小排序时，文件夹使用 dir_sizes 中的递归大小（按名称），还没算出的文件夹使用列表中的大小
+    """
+
+    def __init__(self, type_key: Optional[Callable[[str], str]] = None,
+                 dir_sizes: Optional[Dict[str, int]] = None):
+        # type_key 把扩展名映射为类别（如 "image"），没有时按扩展名本身分类
+        self.type_key = type_key
+        self.dir_sizes: Dict[str, int] = dir_sizes if dir_sizes is not None else {}
+        self._listing: Optional[DirListing] = None
+        self._ranks: Dict[Tuple[str, bool], array] = {}
+
+    @traced("sort")
+    def sort(self, listing: DirListing, spec: SortSpec) -> DirListing:
+        """返回按 spec 排好序的新列表，之后的缓存对应返回的列表"""
+        if spec.needs_metadata:
+            listing.hydrate_all()
+        ranks = self._ranks_for(listing, spec)
+        order = [0] * len(listing)
+        for i, rank in enumerate(ranks):
+            order[rank] = i
+        if spec.descending:
+            dirs = sum(1 for flag in listing.flags if flag & FLAG_DIR)
+            order = order[dirs - 1::-1] + order[:dirs - 1:-1] if dirs else order[::-1]
+
+        result = listing.take(order)
+        self._ranks = {key: array('l', [cached[i] for i in order]) for key, cached in self._ranks.items()}
+        self._listing = result
+        return result
+
+    @traced("sort")
+    def upsert(self, listing: DirListing, entries: DirListing, spec: SortSpec) -> List[int]:
+        """
+        把 entries 插入到 listing 中按 spec 排序的位置，同名条目先一次性删除；返回受影响的下标
+        只对插入位置做二分查找，不整体重新排序
+        """
+        touched = listing.remove_names(entries.names)
+        for j, name in enumerate(entries.names):
+            index = self._position(listing, self._row_key(entries, j, spec), spec)
+            listing.insert(index, name, entries.sizes[j], entries.mtimes[j], entries.flags[j])
+            touched.append(index)
+        if listing is self._listing:
+            self._ranks = {}
+        return touched
+
+    def invalidate(self):
+        self._listing = None
+        self._ranks = {}
+
+    def update_dir_sizes(self, listing: DirListing, spec: SortSpec) -> bool:
+        """
+        dir_sizes 有新结果后调用：丢弃按大小缓存的名次；按大小排序时只在目录块内原地重新排列
+        返回 listing 是否被重新排列
+        """
+        if listing is self._listing:
+            self._ranks = {key: ranks for key, ranks in self._ranks.items() if key[0] != SORT_SIZE}
+        if spec.column != SORT_SIZE:
+            return False
+        dirs = sum(1 for flag in listing.flags if flag & FLAG_DIR)
+        keys = [self._row_key(listing, i, spec)[1:] for i in range(dirs)]
+        order = sorted(range(dirs), key=keys.__getitem__, reverse=spec.descending)
+        if order == list(range(dirs)):
+            return False
+        names, sizes, mtimes, flags = listing.names, listing.sizes, listing.mtimes, listing.flags
+        names[:dirs] = [names[i] for i in order]
+        sizes[:dirs] = array(sizes.typecode, [sizes[i] for i in order])
+        mtimes[:dirs] = array(mtimes.typecode, [mtimes[i] for i in order])
+        flags[:dirs] = bytearray(flags[i] for i in order)
+        if listing is self._listing:
+            for ranks in self._ranks.values():
+                ranks[:dirs] = array('l', [ranks[i] for i in order])
+        return True
+
+    def _ranks_for(self, listing: DirListing, spec: SortSpec) -> array:
+        if listing is not self._listing:
+            self._listing = listing
+            self._ranks = {}
+        key = (spec.column, spec.natural)
+        ranks = self._ranks.get(key)
+        if ranks is None:
+            if spec.column == SORT_NAME:
+                names = self._name_keys(listing, spec.natural)
+                order = [i for block in _blocks(listing) for i in sorted(block, key=names.__getitem__)]
+            else:
+                # 在名称顺序上按该列稳定排序，相同值之间保持名称顺序
+                name_ranks = self._ranks_for(listing, SortSpec(SORT_NAME, natural=spec.natural))
+                by_name = [0] * len(listing)
+                for i, rank in enumerate(name_ranks):
+                    by_name[rank] = i
+                values = self._column_values(listing, spec.column)
+                dirs = sum(1 for flag in listing.flags if flag & FLAG_DIR)
+                order = (sorted(by_name[:dirs], key=values.__getitem__)
+                         + sorted(by_name[dirs:], key=values.__getitem__))
+            ranks = array('l', bytes(len(order) * array('l').itemsize))
+            for rank, i in enumerate(order):
+                ranks[i] = rank
+            self._ranks[key] = ranks
+        return ranks
+
+    def _name_keys(self, listing: DirListing, natural: bool) -> list:
+        if natural:
+            return [natural_key(name) for name in listing.names]
+        return [name.casefold() for name in listing.names]
+
+    def _column_values(self, listing: DirListing, column: str):
+        if column == SORT_SIZE:
+            if not self.dir_sizes:
+                return listing.sizes
+            return [self._size(listing, i) for i in range(len(listing))]
+        if column == SORT_MTIME:
+            return listing.mtimes
+        extensions = [listing.extension(i) if not listing.is_dir(i) else "" for i in range(len(listing))]
+        if column == SORT_TYPE and self.type_key is not None:
+            return [self.type_key(ext) for ext in extensions]
+        return extensions
+
+    def _row_key(self, listing: DirListing, i: int, spec: SortSpec) -> tuple:
+        """单行的完整排序键：(是否文件, 列值, 名称)，供二分查找使用"""
+        name = listing.names[i]
+        name_key = natural_key(name) if spec.natural else name.casefold()
+        is_file = not listing.flags[i] & FLAG_DIR
+        if spec.column == SORT_NAME:
+            value = name_key
+        elif spec.column == SORT_SIZE:
+            value = self._size(listing, i)
+        elif spec.column == SORT_MTIME:
+            value = listing.mtimes[i]
+        else:
+            value = listing.extension(i) if is_file else ""
+            if spec.column == SORT_TYPE and self.type_key is not None:
+                value = self.type_key(value)
+        return is_file, value, name_key
+
+    def _size(self, listing: DirListing, i: int) -> int:
+        if listing.flags[i] & FLAG_DIR:
+            return self.dir_sizes.get(listing.names[i], listing.sizes[i])
+        return listing.sizes[i]
+
+    def _position(self, listing: DirListing, key: tuple, spec: SortSpec) -> int:
+        lo, hi = 0, len(listing)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if _before(self._row_key(listing, mid, spec), key, spec.descending):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+
+def _before(a: tuple, b: tuple, descending: bool) -> bool:
+    """a 是否应排在 b 之前；目录始终在前，降序只反转同类条目之间的顺序"""
+    if a[0] != b[0]:
+        return a[0] < b[0]
+    return a[1:] > b[1:] if descending else a[1:] < b[1:]
+
+
+def _blocks(listing: DirListing) -> Tuple[List[int], List[int]]:
+    dirs, files = [], []
+    for i, flag in enumerate(listing.flags):
+        (dirs if flag & FLAG_DIR else files).append(i)
+    return dirs, files
@@ -0,0 +1,209 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Optional, Tuple, TYPE_CHECKING
+
+from PIL import Image
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+THUMBNAIL_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.tif', '.tiff', '.ico'}
+DEFAULT_THUMBNAIL_DIR = Path.home() / ".cache" / "tkinter-file-manager" / "thumbnails"
+
+# (路径, 修改时间, 大小, 目标尺寸)
+ThumbnailKey = Tuple[str, float, int, Tuple[int, int]]
+
+# EXIF Orientation 取值对应的变换，在缩小之后再做，代价只与缩略图大小有关
+_ORIENTATION_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+
+def _render(path: str, box: Tuple[int, int], cache_file: Optional[str]) -> Optional[Tuple[str, Tuple[int, int], bytes]]:
+    """
+    在进程池中执行：优先读取磁盘缓存，否则解码原图并写入磁盘缓存
+    JPEG 通过 draft() 让解码器直接按 1/2~1/8 的比例解码，其余格式先用 reduce() 做整数倍缩小，再精确缩放。
+    返回 (mode, size, 像素数据)，无法解码时返回 None
+    """
+    if cache_file is not None:
+        try:
+            with Image.open(cache_file) as cached:
+                cached.load()
+                return cached.mode, cached.size, cached.tobytes()
+        except OSError:
+            pass
+
+    try:
+        with Image.open(path) as img:
+            transpose = _ORIENTATION_TRANSPOSE.get(img.getexif().get(0x0112))
+            img.draft("RGB", box)
+            # reduce() 不支持调色板（GIF、P 模式 PNG）、1 位和 I;16 等模式，必须先转换
+            if img.mode not in ("RGB", "RGBA"):
+                has_alpha = img.mode in ("LA", "PA", "RGBa") or "transparency" in img.info
+                img = img.convert("RGBA" if has_alpha else "RGB")
+            factor = min(img.width // box[0], img.height // box[1])
+            if factor >= 2:
+                img = img.reduce(factor)
+            img.thumbnail(box, Image.Resampling.LANCZOS)
+            if transpose is not None:
+                img = img.transpose(transpose)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
+
+    if cache_file is not None:
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            temp_file = f"{cache_file}.{os.getpid()}.tmp"
+            img.save(temp_file, "PNG")
+            os.replace(temp_file, cache_file)
+        except OSError:
+            pass  # 缓存写不进去不影响显示
+    return img.mode, img.size, img.tobytes()
+
+
+class ThumbnailRequest:
+    """一次缩略图请求；行滚出可视区域时取消，还在排队的解码不会执行"""
+
+    def __init__(self, key: ThumbnailKey):
+        self.key = key
+        self._future: Optional[Future] = None
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+        if self._future is not None:
+            self._future.cancel()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+
+class ThumbnailService:
+    """
+    在进程池中生成缩略图
+    解码结果按 ThumbnailKey 保存在有容量上限的内存 LRU 中，并以 PNG 写入磁盘缓存，
+    文件的修改时间或大小变化后键随之变化，旧缩略图不会被使用。无法解码的文件也会记住，不再重试
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, cache_dir: Optional[Path] = DEFAULT_THUMBNAIL_DIR,
+                 max_bytes: int = 64 * 1024 * 1024):
+        self.max_workers = max_workers
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._images: "OrderedDict[ThumbnailKey, Optional[Image.Image]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._pool: Optional["ProcessPoolExecutor"] = None
+        # 已提交到进程池、还没处理完结果的请求数
+        self._outstanding = 0
+
+    @staticmethod
+    def key(path, mtime: float, size: int, box: Tuple[int, int]) -> ThumbnailKey:
+        return os.fspath(path), mtime, size, tuple(box)
+
+    def lookup(self, key: ThumbnailKey) -> Tuple[bool, Optional[Image.Image]]:
+        """只查内存缓存，返回 (是否命中, 图像)；命中但图像为 None 表示文件无法解码"""
+        with self._lock:
+            if key not in self._images:
+                return False, None
+            self._images.move_to_end(key)
+            return True, self._images[key]
+
+    def request(self, key: ThumbnailKey, on_ready: Callable[[Optional[Image.Image]], None]) -> ThumbnailRequest:
+        """
+        异步生成缩略图，完成后在后台线程中以图像（无法解码时为 None）调用 on_ready；
+        请求被取消后不再回调
+        """
+        request = ThumbnailRequest(key)
+        found, image = self.lookup(key)
+        if found:
+            on_ready(image)
+            return request
+
+        path, _, _, box = key
+        cache_file = self._cache_file(key) if self.cache_dir is not None else None
+        with self._lock:
+            self._outstanding += 1
+        request._future = self._get_pool().submit(_render, path, box, cache_file)
+        request._future.add_done_callback(lambda future: self._on_rendered(request, future, on_ready))
+        return request
+
+    @property
+    def outstanding(self) -> int:
+        """还没完成（包括还没回调 on_ready）的请求数"""
+        return self._outstanding
+
+    def clear(self):
+        with self._lock:
+            self._images.clear()
+            self._bytes = 0
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def _on_rendered(self, request: ThumbnailRequest, future: Future, on_ready: Callable):
+        try:
+            if future.cancelled():
+                return
+            try:
+                result = future.result()
+            except Exception:
+                return  # 进程池被关闭等情况，不当作无法解码
+            image = Image.frombytes(*result) if result is not None else None
+            self._remember(request.key, image)
+            if not request.cancelled:
+                on_ready(image)
+        finally:
+            with self._lock:
+                self._outstanding -= 1
+
+    def _remember(self, key: ThumbnailKey, image: Optional[Image.Image]):
+        size = _image_bytes(image)
+        with self._lock:
+            if key in self._images:
+                return
+            self._images[key] = image
+            self._bytes += size
+            while self._bytes > self.max_bytes and len(self._images) > 1:
+                _, evicted = self._images.popitem(last=False)
+                self._bytes -= _image_bytes(evicted)
+
+    def _cache_file(self, key: ThumbnailKey) -> str:
+        path, mtime, size, box = key
+        digest = hashlib.sha1(f"{path}\0{mtime!r}\0{size}\0{box[0]}x{box[1]}".encode("utf-8", "surrogateescape")).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], digest + ".png")
+
+    def _get_pool(self) -> "ProcessPoolExecutor":
+        with self._lock:
+            if self._pool is None:
+                # multiprocessing 只在第一次需要进程池时导入；使用 spawn，避免在已有多个线程的 GUI 进程中 fork
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+
+def _image_bytes(image: Optional[Image.Image]) -> int:
+    return image.width * image.height * len(image.getbands()) if image is not None else 0
+
+
+def can_thumbnail(name: str) -> bool:
+    return os.path.splitext(name)[1].lower() in THUMBNAIL_EXTENSIONS
+
+
+thumbnail_service = ThumbnailService()
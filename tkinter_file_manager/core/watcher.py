@@ -0,0 +1,503 @@
+import ctypes
+import ctypes.util
+import os
+import re
+import select
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from tkinter_file_manager.core.dir_listing import DirListing
+from tkinter_file_manager.core.file_operations import list_entries
+
+# inotify 事件掩码，见 <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+# 这些事件发生前条目不存在
+_APPEAR_EVENTS = IN_CREATE | IN_MOVED_TO
+# 这些事件意味着需要整体重新扫描
+_RESCAN_EVENTS = IN_Q_OVERFLOW | IN_DELETE_SELF | IN_MOVE_SELF
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class DirDiff:
+    """
+    一个目录在一段时间内的变化
+    added/changed 是带完整元数据的 DirListing，removed 是名称列表；
+    rescan 为 True 时增量信息不可信（事件队列溢出、目录本身被删除或移动），应当整体重新扫描
+    """
+
+    __slots__ = ("path", "added", "changed", "removed", "rescan")
+
+    def __init__(self, path: Path, added: DirListing, changed: DirListing,
+                 removed: List[str], rescan: bool = False):
+        self.path = path
+        self.added = added
+        self.changed = changed
+        self.removed = removed
+        self.rescan = rescan
+
+    def __bool__(self) -> bool:
+        return self.rescan or bool(len(self.added) or len(self.changed) or self.removed)
+
+    def __repr__(self) -> str:
+        return (f"DirDiff({str(self.path)!r}, added={self.added.names}, changed={self.changed.names}, "
+                f"removed={self.removed}, rescan={self.rescan})")
+
+
+class DiffCoalescer:
+    """
+    合并同一目录的多个事件
+    只记录每个名称在第一次事件之前是否存在，结算时再检查它现在是否存在：
+    创建后又删除的条目不会出现，删除后又创建的条目算作修改
+    """
+
+    def __init__(self):
+        self._touched: Dict[Path, Dict[str, bool]] = {}
+        self._rescan: set = set()
+
+    def __bool__(self) -> bool:
+        return bool(self._touched or self._rescan)
+
+    def touch(self, path: Path, name: str, existed_before: bool):
+        names = self._touched.setdefault(path, {})
+        names.setdefault(name, existed_before)
+
+    def request_rescan(self, path: Path):
+        self._rescan.add(path)
+        self._touched.setdefault(path, {})
+
+    def flush(self) -> List[DirDiff]:
+        diffs = []
+        for path, names in self._touched.items():
+            if path in self._rescan:
+                diffs.append(DirDiff(path, DirListing(path), DirListing(path), [], rescan=True))
+                continue
+            current = list_entries(path, names)
+            existing = set(current.names)
+            added, changed = DirListing(path), DirListing(path)
+            for i, name in enumerate(current.names):
+                target = changed if names[name] else added
+                target.add(name, current.sizes[i], current.mtimes[i], current.flags[i])
+            removed = [name for name, existed in names.items() if existed and name not in existing]
+            diff = DirDiff(path, added, changed, removed)
+            if diff:
+                diffs.append(diff)
+        self._touched = {}
+        self._rescan = set()
+        return diffs
+
+
+def inotify_available() -> bool:
+    return _load_libc() is not None
+
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            libc.inotify_init1.argtypes = [ctypes.c_int]
+            libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+            libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+            _libc = libc
+        except (OSError, AttributeError):
+            _libc = False
+    return _libc or None
+
+
+class InotifyWatcher:
+    """
+    基于 inotify 的目录监视器（仅 Linux，非递归）
+    在后台线程读取事件，按目录合并后以 DirDiff 的形式交给 on_diff；
+    最后一个事件之后静默 debounce 秒才结算，持续变化的目录最多每 max_delay 秒结算一次。
+    on_diff 在监视线程中调用，界面代码需要自行切回 Tk 主线程
+    """
+
+    def __init__(self, on_diff: Callable[[DirDiff], None], debounce: float = 0.1, max_delay: float = 1.0):
+        libc = _load_libc()
+        if libc is None:
+            raise OSError("inotify is not available on this platform")
+        self._libc = libc
+        self.on_diff = on_diff
+        self.debounce = debounce
+        self.max_delay = max_delay
+
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._wake_r, self._wake_w = os.pipe()
+        self._lock = threading.Lock()
+        self._paths: Dict[int, Path] = {}
+        self._watches: Dict[Path, int] = {}
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="inotify-watcher", daemon=True)
+        self._thread.start()
+
+    def add(self, path: Path):
+        path = Path(path)
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), str(path))
+        with self._lock:
+            self._paths[wd] = path
+            self._watches[path] = wd
+
+    def remove(self, path: Path):
+        with self._lock:
+            wd = self._watches.pop(Path(path), None)
+            if wd is not None:
+                self._paths.pop(wd, None)
+        if wd is not None:
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def watched(self) -> List[Path]:
+        with self._lock:
+            return list(self._watches)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        os.write(self._wake_w, b"x")
+        self._thread.join()
+        os.close(self._fd)
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+
+    def _run(self):
+        pending = DiffCoalescer()
+        first_event = last_event = 0.0
+
+        while not self._closed:
+            timeout = None
+            if pending:
+                now = time.monotonic()
+                timeout = max(0.0, min(last_event + self.debounce, first_event + self.max_delay) - now)
+
+            readable, _, _ = select.select([self._fd, self._wake_r], [], [], timeout)
+            if self._wake_r in readable:
+                break
+            if self._fd in readable:
+                now = time.monotonic()
+                if not pending:
+                    first_event = now
+                last_event = now
+                self._read_events(pending)
+
+            if pending:
+                now = time.monotonic()
+                if now >= last_event + self.debounce or now >= first_event + self.max_delay:
+                    for diff in pending.flush():
+                        self.on_diff(diff)
+
+    def _read_events(self, pending: DiffCoalescer):
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+
+        offset = 0
+        with self._lock:
+            paths = dict(self._paths)
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                for path in paths.values():
+                    pending.request_rescan(path)
+                continue
+            path = paths.get(wd)
+            if path is None or mask & IN_IGNORED:
+                continue
+            if mask & _RESCAN_EVENTS:
+                pending.request_rescan(path)
+            elif name:
+                pending.touch(path, name, existed_before=not mask & _APPEAR_EVENTS)
+
+
+# 这些文件系统上 inotify 收不到其他主机或用户态驱动产生的事件
+POLLING_FS_TYPES = {"nfs", "nfs4", "cifs", "smb3", "smbfs", "9p", "afs", "ceph", "glusterfs", "sshfs", "davfs", "virtiofs"}
+
+
+def needs_polling(path: Path) -> bool:
+    """根据 /proc/mounts 判断 path 所在的文件系统是否需要轮询"""
+    fs_type = _mount_fs_type(os.path.realpath(path))
+    if fs_type is None:
+        return not inotify_available()
+    return fs_type in POLLING_FS_TYPES or fs_type.startswith("fuse")
+
+
+def _mount_fs_type(path: str) -> Optional[str]:
+    try:
+        with open("/proc/mounts", encoding="utf-8", errors="replace") as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+
+    best, best_type = "", None
+    for line in lines:
+        fields = line.split()
+        if len(fields) < 3:
+            continue
+        # 挂载点中的空格等字符以 \040 这样的八进制形式转义
+        mount_point = re.sub(r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), fields[1])
+        if len(mount_point) <= len(best):
+            continue
+        if path == mount_point or path.startswith(mount_point.rstrip("/") + "/"):
+            best, best_type = mount_point, fields[2]
+    return best_type
+
+
+class PollBudget:
+    """
+    进程级的轮询耗时预算（令牌桶）
+    所有轮询监视器共用，平均每秒最多花费 fraction 秒做轮询，超出后推迟下一次轮询
+    """
+
+    def __init__(self, fraction: float = 0.05, burst: float = 0.5):
+        self.fraction = fraction
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait_time(self) -> float:
+        """距离预算恢复到可以轮询还需要等待的秒数"""
+        with self._lock:
+            self._refill()
+            return 0.0 if self._tokens > 0 else -self._tokens / self.fraction
+
+    def charge(self, seconds: float):
+        with self._lock:
+            self._refill()
+            self._tokens -= seconds
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.fraction)
+        self._updated = now
+
+
+poll_budget = PollBudget()
+
+
+class _PolledDir:
+    __slots__ = ("path", "active", "interval", "next_poll", "mtime_ns", "snapshot")
+
+    def __init__(self, path: Path, active: bool):
+        self.path = path
+        self.active = active
+        self.interval = 0.0
+        self.next_poll = 0.0
+        self.mtime_ns = None
+        # 第一次轮询时在监视线程中建立快照，None 表示还没有快照
+        self.snapshot: Optional[Dict[str, tuple]] = None
+
+
+class PollingWatcher:
+    """
+    轮询方式的目录监视器，用于 inotify 收不到事件的文件系统（NFS、FUSE、部分容器挂载）
+    每次轮询先 stat 目录，mtime 变化时才重新扫描并与上次的快照比较，产生与 InotifyWatcher 相同的 DirDiff。
+    目录持续没有变化时轮询间隔逐步加倍；active（当前显示的）目录使用更短的间隔。
+    所有轮询共用进程级的 PollBudget，监视再多目录也不会占满一个核心
+    """
+
+    ACTIVE_INTERVALS = (0.5, 2.0)
+    BACKGROUND_INTERVALS = (2.0, 30.0)
+
+    def __init__(self, on_diff: Callable[[DirDiff], None], budget: PollBudget = poll_budget):
+        self.on_diff = on_diff
+        self.budget = budget
+        self._dirs: Dict[Path, _PolledDir] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="polling-watcher", daemon=True)
+        self._thread.start()
+
+    def add(self, path: Path, active: bool = True):
+        path = Path(path)
+        polled = _PolledDir(path, active)
+        polled.interval = self._intervals(polled)[0]
+        polled.next_poll = time.monotonic()
+        with self._lock:
+            self._dirs[path] = polled
+        self._wakeup.set()
+
+    def set_active(self, path: Path, active: bool):
+        """切换目录是否正在显示，正在显示的目录立即恢复到最短轮询间隔"""
+        with self._lock:
+            polled = self._dirs.get(Path(path))
+            if polled is None:
+                return
+            polled.active = active
+            polled.interval = self._intervals(polled)[0]
+            polled.next_poll = min(polled.next_poll, time.monotonic() + polled.interval)
+        self._wakeup.set()
+
+    def remove(self, path: Path):
+        with self._lock:
+            self._dirs.pop(Path(path), None)
+
+    def watched(self) -> List[Path]:
+        with self._lock:
+            return list(self._dirs)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join()
+
+    def _intervals(self, polled: _PolledDir):
+        return self.ACTIVE_INTERVALS if polled.active else self.BACKGROUND_INTERVALS
+
+    def _run(self):
+        while not self._closed:
+            with self._lock:
+                due = min(self._dirs.values(), key=lambda d: d.next_poll, default=None)
+            now = time.monotonic()
+            if due is None or due.next_poll > now:
+                self._wakeup.wait(None if due is None else due.next_poll - now)
+                self._wakeup.clear()
+                continue
+
+            wait = self.budget.wait_time()
+            if wait > 0:
+                self._wakeup.wait(wait)
+                self._wakeup.clear()
+                continue
+
+            started = time.perf_counter()
+            diff = self._poll(due)
+            self.budget.charge(time.perf_counter() - started)
+            if diff:
+                self.on_diff(diff)
+
+    def _poll(self, polled: _PolledDir) -> Optional[DirDiff]:
+        low, high = self._intervals(polled)
+        if polled.snapshot is None:
+            polled.mtime_ns, polled.snapshot = self._snapshot(polled.path)
+            polled.next_poll = time.monotonic() + polled.interval
+            return None
+
+        try:
+            mtime_ns = os.stat(polled.path).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+
+        if mtime_ns == polled.mtime_ns and mtime_ns is not None:
+            polled.interval = min(high, polled.interval * 2)
+            polled.next_poll = time.monotonic() + polled.interval
+            return None
+
+        polled.interval = low
+        polled.next_poll = time.monotonic() + polled.interval
+        if mtime_ns is None:
+            polled.mtime_ns = None
+            return DirDiff(polled.path, DirListing(polled.path), DirListing(polled.path), [], rescan=True)
+
+        old = polled.snapshot
+        polled.mtime_ns, polled.snapshot = self._snapshot(polled.path)
+        return _diff_snapshots(polled.path, old, polled.snapshot)
+
+    @staticmethod
+    def _snapshot(path: Path):
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+            listing = list_entries(path, os.listdir(path))
+        except OSError:
+            return None, {}
+        snapshot = {
+            name: (listing.sizes[i], listing.mtimes[i], listing.flags[i])
+            for i, name in enumerate(listing.names)
+        }
+        return mtime_ns, snapshot
+
+
+def _diff_snapshots(path: Path, old: Dict[str, tuple], new: Dict[str, tuple]) -> DirDiff:
+    added, changed = DirListing(path), DirListing(path)
+    for name, values in new.items():
+        previous = old.get(name)
+        if previous is None:
+            added.add(name, *values)
+        elif previous != values:
+            changed.add(name, *values)
+    removed = [name for name in old if name not in new]
+    return DirDiff(path, added, changed, removed)
+
+
+class DirWatcher:
+    """
+    按文件系统选择监视方式：本地文件系统用 inotify，网络/FUSE 文件系统或没有 inotify 时轮询
+    接口与 InotifyWatcher 相同，两种后端产生同样的 DirDiff
+    """
+
+    def __init__(self, on_diff: Callable[[DirDiff], None]):
+        self.on_diff = on_diff
+        self._inotify: Optional[InotifyWatcher] = None
+        self._polling: Optional[PollingWatcher] = None
+        self._backends: Dict[Path, object] = {}
+
+    def add(self, path: Path, active: bool = True):
+        path = Path(path)
+        if not needs_polling(path):
+            try:
+                if self._inotify is None:
+                    self._inotify = InotifyWatcher(self.on_diff)
+                self._inotify.add(path)
+                self._backends[path] = self._inotify
+                return
+            except OSError:
+                pass  # 例如超出 max_user_watches，退回轮询
+
+        if self._polling is None:
+            self._polling = PollingWatcher(self.on_diff)
+        self._polling.add(path, active)
+        self._backends[path] = self._polling
+
+    def set_active(self, path: Path, active: bool):
+        if self._backends.get(Path(path)) is self._polling:
+            self._polling.set_active(path, active)
+
+    def remove(self, path: Path):
+        backend = self._backends.pop(Path(path), None)
+        if backend is not None:
+            backend.remove(path)
+
+    def watched(self) -> List[Path]:
+        return list(self._backends)
+
+    def close(self):
+        for backend in (self._inotify, self._polling):
+            if backend is not None:
+                backend.close()
+        self._backends.clear()
@@ -1,62 +1,566 @@
+import math
+import os
+import re
+import threading
 from pathlib import Path
+from typing import Dict, List, Optional, Union, TYPE_CHECKING
 
 import customtkinter as ctk
 
-from core.file_operations import get_dir_content
-from gui.utils.icon_utils import common_icons
-from tkinter_file_manager.gui.event_bus import signal_status_change, signal_path_change
+from tkinter_file_manager.core.dir_listing import DirListing, FLAG_PENDING
+from tkinter_file_manager.core.dir_size import SizeTask, dir_size_engine
+from tkinter_file_manager.core.filtering import ListingFilter
+from tkinter_file_manager.core.scanner import scan_executor
+from tkinter_file_manager.core.sorting import SortSpec, Sorter, SORT_NAME, SORT_SIZE, SORT_MTIME
+from tkinter_file_manager.core.thumbnails import ThumbnailRequest, can_thumbnail, thumbnail_service
+from tkinter_file_manager.core.watcher import DirDiff, DirWatcher
+from tkinter_file_manager.gui.utils.icon_infos import EXTENSION_ICON_MAP
+from tkinter_file_manager.gui.utils.icon_utils import common_icons
+from tkinter_file_manager.gui.event_bus import (
+    signal_status_change, signal_path_change, signal_selection_change, signal_timing_change, ui_events
+)
+from tkinter_file_manager.utils.logging import format_summary, span, traced, tracer
 
+if TYPE_CHECKING:
+    from tkinter_file_manager.core.duplicates import DuplicateGroup, DuplicateTask
+    from tkinter_file_manager.core.search import SearchTask
+
+# 每一行的像素高度（CTkLabel 默认高度 28 + 上下 pady）
+ROW_HEIGHT = 30
+# 同一时间只允许文件列表有一个扫描在进行，新导航会取消旧扫描
+SCAN_KEY = "file_list"
+# 图片文件在名称列中显示的缩略图尺寸，与 medium 图标一致
+ROW_THUMBNAIL_BOX = (24, 24)
+# 输入过滤文字后等待多久才应用（毫秒），连续输入时只过滤最后一次
+FILTER_DEBOUNCE = 80
+# 列标题：(排序列, 标题, 宽度)，宽度与 _FileRow 中的各列一致
+HEADER_COLUMNS = ((SORT_NAME, "Name", 300), (SORT_SIZE, "Size", 100), (SORT_MTIME, "Modified", 150))
+
+
+class _FileRow(ctk.CTkFrame):
+    """
+    可复用的列表行
+    只在创建时绑定一次事件，滚动时仅更新文字和图标，内容没变的行不重新配置
+    """
+
+    def __init__(self, panel: "FileListPanel"):
+        super().__init__(panel.body)
+        self.panel = panel
+        self.index = -1
+        self._shown = None
+        self._thumbnail: Optional[ThumbnailRequest] = None
+
+        self.name_label = ctk.CTkLabel(self, text="", compound="left", anchor="w", width=300)
+        self.name_label.grid(row=0, column=0, sticky="w")
+        self.size_label = ctk.CTkLabel(self, text="", anchor="e", width=100)
+        self.size_label.grid(row=0, column=1, sticky="e")
+        self.mod_label = ctk.CTkLabel(self, text="", anchor="w", width=150)
+        self.mod_label.grid(row=0, column=2, sticky="w")
+
+        for widget in (self, self.name_label, self.size_label, self.mod_label):
+            widget.bind("<Button-1>", self._on_click)
+            widget.bind("<Double-Button-1>", self._on_double_click)
+            panel.bind_scroll(widget)
+
+    def show(self, index: int, files: DirListing, dir_size: Optional[int] = None):
+        """dir_size 是文件夹的递归大小，还没算出来时为 None"""
+        self.index = index
+        size = dir_size if files.is_dir(index) else files.sizes[index]
+        shown = (files.names[index], size, files.mtimes[index], files.flags[index])
+        if shown == self._shown:
+            return
+        self._shown = shown
+        self.cancel_thumbnail()
+        icon = common_icons.get_icon_by_ext(files.extension(index))
+        if not files.is_dir(index) and can_thumbnail(files.names[index]):
+            key = thumbnail_service.key(files.path(index), files.mtimes[index], files.sizes[index], ROW_THUMBNAIL_BOX)
+            found, image = thumbnail_service.lookup(key)
+            if image is not None:
+                icon = _to_ctk_image(image)
+            elif not found:
+                # 先显示类型图标，缩略图生成后再替换；行被复用时取消请求
+                self._thumbnail = thumbnail_service.request(
+                    key, ui_events.wrap(self._on_thumbnail, shown))
+        self.name_label.configure(text=files.names[index], image=icon)
+        self.size_label.configure(text=f"{size:,} bytes" if size is not None else "")
+        self.mod_label.configure(text=files.modified(index))
+
+    def cancel_thumbnail(self):
+        if self._thumbnail is not None:
+            self._thumbnail.cancel()
+            self._thumbnail = None
+
+    def _on_thumbnail(self, image, shown: tuple):
+        if image is not None and shown == self._shown:
+            self.name_label.configure(image=_to_ctk_image(image))
+
+    def _on_click(self, _event):
+        if self.index >= 0:
+            self.panel._on_row_click(self.index)
+
+    def _on_double_click(self, _event):
+        if self.index >= 0:
+            self.panel._on_row_double_click(self.index)
+
+
+def _to_ctk_image(image) -> ctk.CTkImage:
+    return ctk.CTkImage(image, image, image.size)
+
+
+class FileListPanel(ctk.CTkFrame):
+    """
+    虚拟化文件列表
+    self.files 是完整的数据模型，界面上只创建填满可视区域所需的行，
+    滚动时复用这些行，因此刷新耗时和内存与条目数量无关。
+    设置过滤文字后，self._view 是匹配行在 self.files 中的下标，行按 self._view 显示
+    """
 
-class FileListPanel(ctk.CTkScrollableFrame):
     def __init__(self, parent):
         super().__init__(parent)
         self.pack(fill="both", expand=True)
         self.current_path = Path()
-        self.files = []
+        self.files = DirListing(self.current_path)
+        self.first_index = 0
+        self._rows: List[_FileRow] = []
+        self._loading = False
+        self._held_diffs: List[DirDiff] = []
+        # 后台排序进行中时为它使用的 Sorter；此时到达的目录变化和扫描期间一样先保存
+        self._pending_sort: Optional[Sorter] = None
+        self._watcher = DirWatcher(ui_events.wrap(self._on_diff))
+        self._search: Optional[Union["SearchTask", "DuplicateTask"]] = None
+        # 正在显示搜索结果时不应用目录变化
+        self._showing_results = False
+        # 当前目录下各子文件夹的递归大小，后台逐个算出后填入
+        self.dir_sizes: Dict[str, int] = {}
+        self._size_task: Optional[SizeTask] = None
+        # 每次导航或搜索都会递增，过期的搜索结果据此丢弃
+        self._generation = 0
+        # 当前排序方式；Sorter 缓存各列的名次，切换方向或列时不再重新比较
+        self.sort_spec = SortSpec()
+        # 按大小排序时文件夹使用 dir_sizes 中的递归大小，结果陆续到达时只重排目录块
+        self._sorter = Sorter(type_key=lambda ext: EXTENSION_ICON_MAP.get(ext, 'file'), dir_sizes=self.dir_sizes)
+        self._dir_sizes_changed = False
+        # 名称过滤：None 表示不过滤
+        self.filter_text = ""
+        self._filter = ListingFilter()
+        self._view: Optional[List[int]] = None
+        self._filter_job: Optional[str] = None
+
+        self.grid_rowconfigure(1, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        self.header = ctk.CTkFrame(self, fg_color="transparent")
+        self.header.grid(row=0, column=0, sticky="ew")
+        self._header_buttons: Dict[str, ctk.CTkButton] = {}
+        for i, (column, _title, width) in enumerate(HEADER_COLUMNS):
+            button = ctk.CTkButton(self.header, width=width, anchor="w", fg_color="transparent",
+                                   text_color=("gray10", "gray90"), command=lambda c=column: self.sort_by(c))
+            button.grid(row=0, column=i, sticky="w")
+            self._header_buttons[column] = button
+        # 右键点击名称列切换自然顺序（file2 排在 file10 之前）
+        self._header_buttons[SORT_NAME].bind("<Button-3>", lambda _e: self.toggle_natural_sort())
+        self._update_header()
+        self.body = ctk.CTkFrame(self, fg_color="transparent")
+        self.body.grid(row=1, column=0, sticky="nsew")
+        self.body.grid_columnconfigure(0, weight=1)
+        self.body.grid_propagate(False)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+
+        self.body.bind("<Configure>", lambda _e: self._render())
+        self.bind_scroll(self.body)
+        scan_executor.attach(ui_events.call)
         signal_path_change.connect(self.refresh)
+        ui_events.attach(self.winfo_toplevel())
 
     def refresh(self, path: Path):
+        """
+        在后台线程扫描目录，批次到达即绘制，扫描结束后换成排好序的完整列表
+        扫描使用快速模式，大小和修改时间只对可视区域内的行读取；
+        扫描开始前就开始监视目录，扫描期间到达的变化在扫描结束后再应用
+        """
+        tracer.mark("navigation")
+        self._cancel_search()
+        self._cancel_sizes()
+        self._showing_results = False
+        self._watch(path)
+        if path != self.current_path:
+            self.filter_text = ""
         self.current_path = path
         self.clear()
+        self._loading = True
+        self._held_diffs = []
+        scan_executor.submit(
+            path,
+            on_batch=self.append,
+            on_done=self._on_scan_done,
+            on_error=self._on_scan_error,
+            key=SCAN_KEY,
+            fast=True,
+        )
+
+    def search(self, text: str):
+        """
+        在当前目录下递归搜索，结果边找边显示，名称列显示相对路径
+        当前目录已建立索引且查询是子串匹配时直接查询索引，否则遍历磁盘。
+        语法见 SearchQuery.parse
+        """
+        # 搜索和索引（sqlite3）在第一次搜索时才导入，不计入启动时间
+        import sqlite3
+        from tkinter_file_manager.core.index import default_index
+        from tkinter_file_manager.core.search import SearchQuery, search_engine
 
+        self._cancel_search()
         try:
-            self.files = get_dir_content(path)
-            for i, item in enumerate(self.files):
-                row = ctk.CTkFrame(self)
-                row.pack(fill="x", pady=1)
-                icon = common_icons.get_icon_by_ext(item["extension"])
-                name_label = ctk.CTkLabel(
-                    row,
-                    text=item["name"],
-                    image=icon,
-                    compound="left",
-                    anchor="w",
-                    width=300
-                )
-                name_label.grid(row=0, column=0, sticky="w")
-
-                size_text = f"{item['size']:,} bytes" if not item["is_dir"] else ""
-                size_label = ctk.CTkLabel(row, text=size_text, anchor="e", width=100)
-                size_label.grid(row=0, column=1, sticky="e")
-
-                mod_label = ctk.CTkLabel(row, text=item["modified"], anchor="w", width=150)
-                mod_label.grid(row=0, column=2, sticky="w")
-
-                row.bind("<Double-Button-1>", lambda _e, idx=i: self._on_row_double_click(idx))
-                name_label.bind("<Double-Button-1>", lambda _e, idx=i: self._on_row_double_click(idx))
-                size_label.bind("<Double-Button-1>", lambda _e, idx=i: self._on_row_double_click(idx))
-                size_label.bind("<Double-Button-1>", lambda _e, idx=i: self._on_row_double_click(idx))
-                mod_label.bind("<Double-Button-1>", lambda _e, idx=i: self._on_row_double_click(idx))
-
-        except Exception as e:
-            signal_status_change.send(f"Error reading directory: {str(e)}")
+            query = SearchQuery.parse(text)
+            scan_executor.cancel(SCAN_KEY)
+            self._cancel_sizes()
+            self._loading = False
+            self._showing_results = True
+            self._reset_filter()
             self.clear()
+            index = default_index()
+            if index is not None and index.supports(query) and index.covers(self.current_path):
+                self.append(index.query(self.current_path, query))
+                ui_events.post(signal_status_change, f"Found {len(self.files)} items in index")
+                return
+            self._search = search_engine.search(
+                self.current_path, query,
+                on_results=ui_events.wrap(self._on_search_results, self._generation),
+                on_done=ui_events.wrap(self._on_search_done, self._generation),
+            )
+        except (ValueError, re.error, OSError, sqlite3.Error) as e:
+            ui_events.post(signal_status_change, f"Search error: {str(e)}")
+            return
+        ui_events.post(signal_status_change, f"Searching for: {text}...")
+
+    def find_duplicates(self):
+        """在当前目录下查找重复文件，每确认一组就追加到列表，同组的文件相邻显示"""
+        from tkinter_file_manager.core.duplicates import duplicate_finder
+
+        self._cancel_search()
+        scan_executor.cancel(SCAN_KEY)
+        self._cancel_sizes()
+        self._loading = False
+        self._showing_results = True
+        self._reset_filter()
+        self.clear()
+        try:
+            self._search = duplicate_finder.find(
+                [self.current_path],
+                on_group=ui_events.wrap(self._on_duplicate_group, self._generation),
+                on_done=ui_events.wrap(self._on_duplicates_done, self._generation),
+            )
+        except OSError as e:
+            ui_events.post(signal_status_change, f"Duplicate search error: {str(e)}")
+            return
+        ui_events.post(signal_status_change, "Looking for duplicates...")
+
+    def cancel_search(self):
+        if self._search is not None and not self._search.finished:
+            self._cancel_search()
+            ui_events.post(signal_status_change, "Search cancelled")
+
+    def filter(self, text: str):
+        """
+        按名称过滤当前列表；连续输入时等停顿 FILTER_DEBOUNCE 毫秒后才过滤
+        显示搜索或查重结果时不过滤（见 _reset_filter）
+        """
+        if self._showing_results:
+            return
+        if self._filter_job is not None:
+            self.after_cancel(self._filter_job)
+        self._filter_job = self.after(FILTER_DEBOUNCE, self._apply_filter, text)
+
+    def _reset_filter(self):
+        """搜索或查重的结果不按输入框里的文字过滤"""
+        if self._filter_job is not None:
+            self.after_cancel(self._filter_job)
+            self._filter_job = None
+        self.filter_text = ""
+
+    def _apply_filter(self, text: str):
+        self._filter_job = None
+        if text == self.filter_text:
+            return
+        self.filter_text = text
+        self.first_index = 0
+        self._render()
+        if text:
+            ui_events.post(signal_status_change, f"{len(self._view)} of {len(self.files)} items match \"{text}\"")
+        else:
+            ui_events.post(signal_status_change, f"{len(self.files)} items")
+
+    def append(self, items: DirListing):
+        """追加条目，只有新条目落在可视区域内时才重绘行"""
+        start = self.count
+        self.files.extend(items)
+        self._view = self._filter.apply(self.files, self.filter_text)
+        if start < self.first_index + self.visible_count:
+            self._render()
+        else:
+            self._update_scrollbar()
+
+    def sort_by(self, column: str):
+        """点击列标题：同一列切换升降序，其他列从升序开始"""
+        self._apply_sort(self.sort_spec.toggled(column))
+
+    def toggle_natural_sort(self):
+        spec = self.sort_spec
+        self._apply_sort(SortSpec(spec.column, spec.descending, not spec.natural))
+
+    def _apply_sort(self, spec: SortSpec):
+        """
+        按 spec 重新排列 self.files
+        扫描仍在进行时只记录排序方式，扫描结束后再排；按大小或时间排序而条目还没读取元数据时，
+        在后台线程用单独的 Sorter 读取并排序 self.files 的副本，主线程上的列表和 Sorter 不被后台线程触碰；
+        排序期间到达的目录变化先保存，排序结果交回主线程后再应用
+        """
+        self.sort_spec = spec
+        self._update_header()
+        if self._loading:
+            return
+        files = self.files
+        if spec.needs_metadata and any(flag & FLAG_PENDING for flag in files.flags):
+            ui_events.post(signal_status_change, "Sorting...")
+            snapshot = files.copy()
+            sorter = Sorter(type_key=self._sorter.type_key, dir_sizes=dict(self.dir_sizes))
+            self._pending_sort = sorter
+            on_sorted = ui_events.wrap(self._on_background_sorted, sorter, spec)
+            threading.Thread(target=lambda: on_sorted(sorter.sort(snapshot, spec)),
+                             name="sort", daemon=True).start()
+            return
+        self._pending_sort = None
+        self._on_sorted(self._sorter.sort(files, spec))
+
+    def _on_background_sorted(self, result: DirListing, sorter: Sorter, spec: SortSpec):
+        # 排序期间切换了目录、开始了搜索或换了排序方式时，_pending_sort 已不是这个 sorter
+        if sorter is not self._pending_sort or spec != self.sort_spec:
+            return
+        self._pending_sort = None
+        self._sorter = sorter
+        # 排序期间到达的文件夹大小在这里补上
+        sorter.dir_sizes = self.dir_sizes
+        sorter.update_dir_sizes(result, spec)
+        self._dir_sizes_changed = False
+        self._on_sorted(result)
+
+    def _on_sorted(self, result: DirListing):
+        self.files = result
+        self._replay_held_diffs()
+        self._render()
+        ui_events.post(signal_status_change, f"{len(result)} items")
+
+    def _update_header(self):
+        spec = self.sort_spec
+        for column, title, _width in HEADER_COLUMNS:
+            if column == spec.column:
+                title += " ▼" if spec.descending else " ▲"
+            if column == SORT_NAME and spec.natural:
+                title += " (natural)"
+            self._header_buttons[column].configure(text=title)
 
     def clear(self):
-        for child in self.winfo_children():
-            child.destroy()
+        self.files = DirListing(self.current_path)
+        self._pending_sort = None
+        self.first_index = 0
+        self._render()
+
+    def apply_diff(self, diff: DirDiff):
+        """把目录变化应用到 self.files，只重新配置受影响的可视行"""
+        if diff.path != self.current_path or self._showing_results:
+            return
+        if diff.rescan:
+            self.refresh(self.current_path)
+            return
+        self.files.remove_names(diff.removed)
+        self._sorter.upsert(self.files, diff.added, self.sort_spec)
+        self._sorter.upsert(self.files, diff.changed, self.sort_spec)
+        self._filter.invalidate()
+        self._compute_sizes(diff.added)
+        self._compute_sizes(diff.changed)
+        self._render()
+
+    def _on_scan_done(self, files: DirListing):
+        self._loading = False
+        self.files = files
+        self._compute_sizes(self.files)
+        if self.sort_spec != SortSpec():
+            # 扫描结果已按默认方式排好，其他排序方式在这里重新排列；保存的目录变化在排序后应用
+            self._apply_sort(self.sort_spec)
+        else:
+            self._replay_held_diffs()
+        self._render()
+        if tracer.enabled:
+            signal_timing_change.send(format_summary(tracer.summary("navigation")))
+
+    def _on_scan_error(self, e: Exception):
+        self._loading = False
+        ui_events.post(signal_status_change, f"Error reading directory: {str(e)}")
+        self.clear()
+
+    def _watch(self, path: Path):
+        for watched in self._watcher.watched():
+            self._watcher.remove(watched)
+        try:
+            self._watcher.add(path)
+        except OSError:
+            pass  # 无法监视的目录只能手动刷新
+
+    def _on_diff(self, diff: DirDiff):
+        if self._loading or self._pending_sort is not None:
+            self._held_diffs.append(diff)
+        else:
+            self.apply_diff(diff)
+
+    def _replay_held_diffs(self):
+        held, self._held_diffs = self._held_diffs, []
+        for diff in held:
+            self.apply_diff(diff)
+
+    def _on_search_results(self, batch: DirListing, generation: int):
+        if generation == self._generation:
+            self.append(batch)
+
+    def _on_search_done(self, task: "SearchTask", generation: int):
+        if generation != self._generation:
+            return
+        message = f"Found {task.count} items"
+        if task.truncated:
+            message += " (result limit reached)"
+        ui_events.post(signal_status_change, message)
+
+    def _on_duplicate_group(self, group: "DuplicateGroup", generation: int):
+        if generation != self._generation:
+            return
+        batch = DirListing(self.current_path)
+        for path in group.paths:
+            batch.add(os.path.relpath(path, self.current_path), group.size, 0.0, FLAG_PENDING)
+        self.append(batch)
+
+    def _on_duplicates_done(self, task: "DuplicateTask", generation: int):
+        if generation == self._generation:
+            ui_events.post(signal_status_change, f"Found {task.groups} duplicate groups, {task.wasted:,} bytes reclaimable")
+
+    def _compute_sizes(self, listing: DirListing):
+        """为 listing 中的文件夹（不含指向目录的链接）启动递归大小计算"""
+        names = [
+            listing.names[i] for i in range(len(listing))
+            if listing.is_dir(i) and not listing.is_symlink(i)
+        ]
+        if not names:
+            return
+        if self._size_task is None:
+            self._size_task = SizeTask()
+        dir_size_engine.compute(
+            self.current_path, names,
+            ui_events.wrap(self._on_dir_size, self._size_task), task=self._size_task)
+
+    def _on_dir_size(self, result, task: SizeTask):
+        if task is not self._size_task:
+            return
+        name, size = result
+        self.dir_sizes[name] = size
+        self._dir_sizes_changed = True
+        self._render_soon()
+
+    def _cancel_sizes(self):
+        if self._size_task is not None:
+            self._size_task.cancel()
+            self._size_task = None
+        self.dir_sizes.clear()
+
+    def _cancel_search(self):
+        self._generation += 1
+        if self._search is not None:
+            self._search.cancel()
+            self._search = None
+
+    def _render_soon(self):
+        """在下一个派发周期重绘；其间的多次请求（例如一批文件夹大小结果）只重绘一次"""
+        ui_events.call_latest(self._on_render_soon)
+
+    def _on_render_soon(self, _payload):
+        if self._dir_sizes_changed and not self._loading and self._pending_sort is None:
+            self._dir_sizes_changed = False
+            if self._sorter.update_dir_sizes(self.files, self.sort_spec):
+                self._filter.invalidate()
+        self._render()
+
+    def destroy(self):
+        self._watcher.close()
+        super().destroy()
+
+    @property
+    def count(self) -> int:
+        """显示的行数：过滤时为匹配的条目数"""
+        return len(self._view) if self._view is not None else len(self.files)
+
+    @property
+    def visible_count(self) -> int:
+        """可视区域能容纳的行数"""
+        return max(1, math.ceil(self.body.winfo_height() / ROW_HEIGHT))
+
+    def scroll_to(self, index: int):
+        max_first = max(0, self.count - self.visible_count + 1)
+        index = min(max(0, index), max_first)
+        if index != self.first_index:
+            self.first_index = index
+            self._render()
+
+    def bind_scroll(self, widget):
+        widget.bind("<MouseWheel>", self._on_mouse_wheel)
+        widget.bind("<Button-4>", lambda _e: self.scroll_to(self.first_index - 3))
+        widget.bind("<Button-5>", lambda _e: self.scroll_to(self.first_index + 3))
+
+    @traced("render")
+    def _render(self):
+        count = self.visible_count
+        with span("build_rows"):
+            while len(self._rows) < count:
+                row = _FileRow(self)
+                row.grid(row=len(self._rows), column=0, sticky="ew", pady=1)
+                self._rows.append(row)
+
+        view = self._view = self._filter.apply(self.files, self.filter_text)
+        shown = range(self.first_index, min(self.first_index + count, self.count))
+        with span("hydrate", "io"):
+            self.files.hydrate(shown if view is None else [view[i] for i in shown])
+        for i, row in enumerate(self._rows):
+            position = self.first_index + i
+            if i < count and position < self.count:
+                index = position if view is None else view[position]
+                row.show(index, self.files, self.dir_sizes.get(self.files.names[index]))
+                row.grid()
+            else:
+                row.index = -1
+                row._shown = None
+                row.cancel_thumbnail()
+                row.grid_remove()
+
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        total = self.count
+        if total == 0:
+            self.scrollbar.set(0, 1)
+            return
+        start = self.first_index / total
+        end = min(1.0, (self.first_index + self.visible_count) / total)
+        self.scrollbar.set(start, end)
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(value) * self.count))
+        elif action == "scroll":
+            step = self.visible_count if unit == "pages" else 1
+            self.scroll_to(self.first_index + int(value) * step)
+
+    def _on_mouse_wheel(self, event):
+        self.scroll_to(self.first_index - int(event.delta / 120) * 3)
+
+    def _on_row_click(self, idx: int):
+        signal_selection_change.send(self.files.path(idx))
 
     def _on_row_double_click(self, idx: int):
-        file = self.files[idx]
-        if not file["is_dir"]: return
-        signal_path_change.send(file["path"])
\ No newline at end of file
+        if not self.files.is_dir(idx): return
+        signal_path_change.send(self.files.path(idx))
@@ -0,0 +1,328 @@
+import math
+import os
+import string
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import customtkinter as ctk
+
+from tkinter_file_manager.core.file_operations import has_subdirs, list_subdirs
+from tkinter_file_manager.gui.event_bus import signal_path_change, ui_events
+from tkinter_file_manager.gui.utils.icon_utils import common_icons
+from tkinter_file_manager.utils.logging import traced
+
+ROW_HEIGHT = 26
+# 每一级缩进的像素
+INDENT = 16
+TREE_WIDTH = 220
+# 同时进行的目录读取数
+TREE_WORKERS = 4
+
+
+class TreeNode:
+    """导航树的一个目录节点；children 为 None 表示还没读取，has_children 为 None 表示还没检查"""
+
+    __slots__ = ("path", "name", "depth", "parent", "children", "expanded", "has_children", "loading")
+
+    def __init__(self, path: str, name: str, parent: Optional["TreeNode"] = None):
+        self.path = path
+        self.name = name
+        self.parent = parent
+        self.depth = parent.depth + 1 if parent is not None else 0
+        self.children: Optional[List[TreeNode]] = None
+        self.expanded = False
+        self.has_children: Optional[bool] = None
+        self.loading = False
+
+    def __repr__(self) -> str:
+        return f"TreeNode({self.path!r})"
+
+
+class TreeModel:
+    """
+    导航树的数据模型，不依赖界面
+    visible 是按显示顺序展开后的节点列表，界面只需按下标取行；
+    展开和折叠只在 visible 中插入或删除该节点下方的一段
+    """
+
+    def __init__(self, roots: Iterable[str]):
+        self.roots = [TreeNode(path, _display_name(path)) for path in roots]
+        self.visible: List[TreeNode] = list(self.roots)
+        self._nodes: Dict[str, TreeNode] = {node.path: node for node in self.roots}
+
+    def find(self, path: str) -> Optional[TreeNode]:
+        return self._nodes.get(path)
+
+    def index(self, node: TreeNode) -> int:
+        """节点在 visible 中的下标，不可见时为 -1"""
+        if not self.is_visible(node):
+            return -1
+        return self.visible.index(node)
+
+    def is_visible(self, node: TreeNode) -> bool:
+        parent = node.parent
+        while parent is not None:
+            if not parent.expanded:
+                return False
+            parent = parent.parent
+        return True
+
+    def expand(self, node: TreeNode) -> bool:
+        """展开节点；子目录还没读取时只做标记并返回 False，读取后由 set_children 插入"""
+        if node.expanded:
+            return node.children is not None
+        node.expanded = True
+        if node.children is None:
+            return False
+        index = self.index(node)
+        if index >= 0:
+            self.visible[index + 1:index + 1] = self._descendants(node)
+        return True
+
+    def collapse(self, node: TreeNode):
+        if not node.expanded:
+            return
+        index = self.index(node)
+        if index >= 0 and node.children is not None:
+            del self.visible[index + 1:index + 1 + len(self._descendants(node))]
+        node.expanded = False
+
+    def set_children(self, node: TreeNode, names: List[str]):
+        """填入读取到的子目录；节点已展开且可见时插入到 visible"""
+        node.loading = False
+        if node.children is not None:
+            return
+        node.children = []
+        for name in names:
+            child = TreeNode(os.path.join(node.path, name), name, node)
+            node.children.append(child)
+            self._nodes[child.path] = child
+        node.has_children = bool(names)
+        if node.expanded:
+            index = self.index(node)
+            if index >= 0:
+                self.visible[index + 1:index + 1] = node.children
+
+    def _descendants(self, node: TreeNode) -> List[TreeNode]:
+        """节点下方当前应显示的全部节点（递归进入已展开的子节点）"""
+        result = []
+        stack = list(reversed(node.children or ()))
+        while stack:
+            child = stack.pop()
+            result.append(child)
+            if child.expanded and child.children:
+                stack.extend(reversed(child.children))
+        return result
+
+
+def default_roots() -> List[str]:
+    """导航树的根：用户主目录，以及 Windows 上的各个驱动器或其他系统上的 /"""
+    roots = [str(Path.home())]
+    if os.name == 'nt':
+        roots.extend(f"{d}:\\" for d in string.ascii_uppercase if os.path.exists(f"{d}:\\"))
+    else:
+        roots.append("/")
+    return roots
+
+
+def _display_name(path: str) -> str:
+    return os.path.basename(path.rstrip("\\/")) or path
+
+
+class _TreeRow(ctk.CTkFrame):
+    """可复用的树行，内容没变时不重新配置"""
+
+    def __init__(self, panel: "FileTreePanel"):
+        super().__init__(panel.body, fg_color="transparent", corner_radius=0, height=ROW_HEIGHT)
+        self.panel = panel
+        self.node: Optional[TreeNode] = None
+        self._shown = None
+
+        self.arrow_label = ctk.CTkLabel(self, text="", width=INDENT)
+        self.arrow_label.grid(row=0, column=0, sticky="w")
+        self.name_label = ctk.CTkLabel(self, text="", compound="left", anchor="w",
+                                       image=common_icons.get_icon_by_ext('folder'))
+        self.name_label.grid(row=0, column=1, sticky="w")
+
+        self.arrow_label.bind("<Button-1>", self._on_toggle)
+        for widget in (self, self.name_label):
+            widget.bind("<Button-1>", self._on_click)
+            widget.bind("<Double-Button-1>", self._on_toggle)
+        for widget in (self, self.arrow_label, self.name_label):
+            panel.bind_scroll(widget)
+
+    def show(self, node: TreeNode, selected: bool):
+        self.node = node
+        shown = (node, node.depth, node.expanded, node.has_children, node.loading, selected)
+        if shown == self._shown:
+            return
+        self._shown = shown
+        if node.has_children is False:
+            arrow = ""
+        elif node.loading:
+            arrow = "…"
+        else:
+            arrow = "▼" if node.expanded else "▶"
+        self.arrow_label.configure(text=arrow)
+        self.arrow_label.grid_configure(padx=(node.depth * INDENT, 0))
+        self.name_label.configure(text=node.name)
+        self.configure(fg_color=("gray75", "gray30") if selected else "transparent")
+
+    def _on_click(self, _event):
+        if self.node is not None:
+            self.panel._on_row_click(self.node)
+
+    def _on_toggle(self, _event):
+        if self.node is not None:
+            self.panel.toggle(self.node)
+        return "break"
+
+
+class FileTreePanel(ctk.CTkFrame):
+    """
+    虚拟化导航树
+    只创建填满可视区域的行，滚动、展开和折叠时复用；子目录在第一次展开时在后台读取（只读目录项，不做 stat），
+    行第一次显示时在后台检查是否有子目录，找到第一个就停止，据此决定是否显示展开箭头
+    """
+
+    def __init__(self, parent, roots: Optional[Iterable[str]] = None, show_hidden: bool = False):
+        super().__init__(parent, width=TREE_WIDTH)
+        self.model = TreeModel(roots if roots is not None else default_roots())
+        self.show_hidden = show_hidden
+        self.selected: Optional[TreeNode] = None
+        self.first_index = 0
+        self._rows: List[_TreeRow] = []
+        self._probed = set()
+        self._pool = ThreadPoolExecutor(max_workers=TREE_WORKERS, thread_name_prefix="file_tree")
+
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_propagate(False)
+        self.body = ctk.CTkFrame(self, fg_color="transparent")
+        self.body.grid(row=0, column=0, sticky="nsew")
+        self.body.grid_columnconfigure(0, weight=1)
+        self.body.grid_propagate(False)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        self.body.bind("<Configure>", lambda _e: self._render())
+        self.bind_scroll(self.body)
+        signal_path_change.connect(self._on_path_change)
+        ui_events.attach(self.winfo_toplevel())
+
+    def toggle(self, node: TreeNode):
+        if node.expanded:
+            self.collapse(node)
+        else:
+            self.expand(node)
+
+    def expand(self, node: TreeNode):
+        if not self.model.expand(node) and not node.loading:
+            node.loading = True
+            self._pool.submit(self._load, node)
+        self._render()
+
+    def collapse(self, node: TreeNode):
+        self.model.collapse(node)
+        self._render()
+
+    def _load(self, node: TreeNode):
+        """在后台线程读取子目录名称"""
+        try:
+            names = list_subdirs(Path(node.path), include_hidden=self.show_hidden)
+        except OSError:
+            names = []
+        ui_events.wrap(self._on_loaded, node)(names)
+
+    def _on_loaded(self, names: List[str], node: TreeNode):
+        self.model.set_children(node, names)
+        self._render()
+
+    def _probe(self, node: TreeNode):
+        """在后台线程检查是否有子目录"""
+        ui_events.wrap(self._on_probed, node)(has_subdirs(Path(node.path), include_hidden=self.show_hidden))
+
+    def _on_probed(self, found: bool, node: TreeNode):
+        if node.has_children is None:
+            node.has_children = found
+            self._render_soon()
+
+    def _on_path_change(self, path: Path):
+        node = self.model.find(str(path))
+        if node is self.selected:
+            return
+        self.selected = node
+        self._render()
+
+    def _on_row_click(self, node: TreeNode):
+        signal_path_change.send(Path(node.path))
+
+    def _render_soon(self):
+        """在下一个派发周期重绘；可视行各自的子目录检查结果只触发一次重绘"""
+        ui_events.call_latest(self._on_render_soon)
+
+    def _on_render_soon(self, _payload):
+        self._render()
+
+    def destroy(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        super().destroy()
+
+    @property
+    def visible_count(self) -> int:
+        return max(1, math.ceil(self.body.winfo_height() / ROW_HEIGHT))
+
+    def scroll_to(self, index: int):
+        max_first = max(0, len(self.model.visible) - self.visible_count + 1)
+        index = min(max(0, index), max_first)
+        if index != self.first_index:
+            self.first_index = index
+            self._render()
+
+    def bind_scroll(self, widget):
+        widget.bind("<MouseWheel>", self._on_mouse_wheel)
+        widget.bind("<Button-4>", lambda _e: self.scroll_to(self.first_index - 3))
+        widget.bind("<Button-5>", lambda _e: self.scroll_to(self.first_index + 3))
+
+    @traced("tree_render")
+    def _render(self):
+        count = self.visible_count
+        while len(self._rows) < count:
+            row = _TreeRow(self)
+            row.grid(row=len(self._rows), column=0, sticky="ew")
+            self._rows.append(row)
+
+        visible = self.model.visible
+        self.first_index = min(self.first_index, max(0, len(visible) - count + 1))
+        for i, row in enumerate(self._rows):
+            index = self.first_index + i
+            if i < count and index < len(visible):
+                node = visible[index]
+                if node.has_children is None and node not in self._probed:
+                    self._probed.add(node)
+                    self._pool.submit(self._probe, node)
+                row.show(node, node is self.selected)
+                row.grid()
+            else:
+                row.node = None
+                row._shown = None
+                row.grid_remove()
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        total = len(self.model.visible)
+        if total == 0:
+            self.scrollbar.set(0, 1)
+            return
+        self.scrollbar.set(self.first_index / total, min(1.0, (self.first_index + self.visible_count) / total))
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(value) * len(self.model.visible)))
+        elif action == "scroll":
+            step = self.visible_count if unit == "pages" else 1
+            self.scroll_to(self.first_index + int(value) * step)
+
+    def _on_mouse_wheel(self, event):
+        self.scroll_to(self.first_index - int(event.delta / 120) * 3)
@@ -0,0 +1,199 @@
+import os
+from pathlib import Path
+from typing import Optional
+
+import customtkinter as ctk
+
+from tkinter_file_manager.core.file_preview import HEX_WIDTH, MappedFile, TextDocument, hex_lines, highlight
+from tkinter_file_manager.core.thumbnails import ThumbnailRequest, can_thumbnail, thumbnail_service
+from tkinter_file_manager.gui.event_bus import signal_path_change, signal_selection_change, ui_events
+
+# 预览区显示的缩略图尺寸
+PREVIEW_BOX = (240, 240)
+PREVIEW_WIDTH = 260
+# 预览区较窄，十六进制视图每行显示的字节数少于默认值
+PREVIEW_HEX_WIDTH = HEX_WIDTH // 2
+MODE_TEXT = "Text"
+MODE_HEX = "Hex"
+HIGHLIGHT_COLORS = {"keyword": "#0033b3", "string": "#067d17", "number": "#1750eb", "comment": "#8c8c8c"}
+
+
+class _DocumentView(ctk.CTkFrame):
+    """
+    文本/十六进制视图
+    文件通过 mmap 映射，文本框里只放可视区域的几十行，滚动时整体替换；
+    位置以字节偏移表示，滚动条对应文件中的字节位置，语法高亮也只作用于这些行
+    """
+
+    def __init__(self, parent):
+        super().__init__(parent, fg_color="transparent")
+        self.mapped: Optional[MappedFile] = None
+        self.document: Optional[TextDocument] = None
+        self.mode = MODE_TEXT
+        self.extension = ""
+        self.top = 0
+        self._shown_bytes = 0
+
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        self.font = ctk.CTkFont(family="Courier", size=11)
+        self.text = ctk.CTkTextbox(self, wrap="none", font=self.font, activate_scrollbars=False)
+        self.text.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        for tag, color in HIGHLIGHT_COLORS.items():
+            self.text.tag_config(tag, foreground=color)
+
+        self.text.bind("<Configure>", lambda _e: self.render())
+        self.text.bind("<MouseWheel>", lambda e: self._scroll(-int(e.delta / 120) * 3))
+        self.text.bind("<Button-4>", lambda _e: self._scroll(-3))
+        self.text.bind("<Button-5>", lambda _e: self._scroll(3))
+
+    def open(self, mapped: MappedFile, extension: str):
+        self.close()
+        self.mapped = mapped
+        self.document = TextDocument(mapped)
+        self.extension = extension
+        self.mode = MODE_HEX if mapped.is_binary() else MODE_TEXT
+        self.top = 0
+        self.render()
+
+    def set_mode(self, mode: str):
+        if mode == self.mode or self.mapped is None:
+            return
+        self.mode = mode
+        self._move_to(self.top)
+
+    def close(self):
+        if self.mapped is not None:
+            self.mapped.close()
+        self.mapped = None
+        self.document = None
+        self._set_text([])
+
+    @property
+    def visible_lines(self) -> int:
+        return max(1, self.text.winfo_height() // self.font.metrics("linespace"))
+
+    def render(self):
+        if self.mapped is None:
+            return
+        count = self.visible_lines
+        if self.mode == MODE_HEX:
+            lines = hex_lines(self.mapped, self.top, count, PREVIEW_HEX_WIDTH)
+            self._shown_bytes = len(lines) * PREVIEW_HEX_WIDTH
+            self._set_text([(line, []) for line in lines])
+        else:
+            lines = self.document.lines(self.top, count)
+            self._shown_bytes = self.document.next_line(lines[-1][0]) - self.top if lines else 0
+            self._set_text([(text, highlight(text, self.extension)) for _, text in lines])
+        size = max(1, self.mapped.size)
+        self.scrollbar.set(self.top / size, min(1.0, (self.top + self._shown_bytes) / size))
+
+    def _set_text(self, lines):
+        self.text.configure(state="normal")
+        self.text.delete("1.0", "end")
+        self.text.insert("1.0", "\n".join(line for line, _ in lines))
+        for row, (_, spans) in enumerate(lines, start=1):
+            for tag, start, end in spans:
+                self.text.tag_add(tag, f"{row}.{start}", f"{row}.{end}")
+        self.text.configure(state="disabled")
+
+    def _scroll(self, lines: int):
+        if self.mapped is None:
+            return "break"
+        if self.mode == MODE_HEX:
+            last = max(0, self.mapped.size - 1) // PREVIEW_HEX_WIDTH * PREVIEW_HEX_WIDTH
+            self.top = min(max(0, self.top + lines * PREVIEW_HEX_WIDTH), last)
+        else:
+            self.top = self.document.scroll(self.top, lines)
+        self.render()
+        return "break"
+
+    def _move_to(self, offset: int):
+        if self.mode == MODE_HEX:
+            self.top = offset - offset % PREVIEW_HEX_WIDTH
+        else:
+            self.top = self.document.line_start(offset)
+        self.render()
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if self.mapped is None:
+            return
+        if action == "moveto":
+            self._move_to(int(float(value) * self.mapped.size))
+        elif action == "scroll":
+            step = self.visible_lines if unit == "pages" else 1
+            self._scroll(int(value) * step)
+
+
+class PreviewPanel(ctk.CTkFrame):
+    """
+    预览选中的文件
+    图片由 thumbnail_service 在后台生成缩略图，选中其他文件或切换目录时取消未完成的请求；
+    其他文件以文本或十六进制方式显示，打开任意大小的文件都只读取可视部分
+    """
+
+    def __init__(self, parent):
+        super().__init__(parent, width=PREVIEW_WIDTH)
+        self.pack_propagate(False)
+        self.current_file: Optional[Path] = None
+        self._thumbnail: Optional[ThumbnailRequest] = None
+
+        self.image_label = ctk.CTkLabel(self, text="")
+        self.image_label.pack(fill="x", padx=10, pady=(10, 5))
+        self.name_label = ctk.CTkLabel(self, text="", wraplength=PREVIEW_WIDTH - 20)
+        self.name_label.pack(fill="x", padx=10)
+        self.mode_switch = ctk.CTkSegmentedButton(self, values=[MODE_TEXT, MODE_HEX], command=self._on_mode_change)
+        self.document_view = _DocumentView(self)
+
+        signal_selection_change.connect(self.show)
+        signal_path_change.connect(self._on_path_change)
+        ui_events.attach(self.winfo_toplevel())
+
+    def show(self, path: Path):
+        self.clear()
+        self.current_file = path
+        self.name_label.configure(text=path.name)
+        try:
+            st = os.stat(path)
+            if not can_thumbnail(path.name):
+                if os.path.isfile(path):
+                    self._open_document(path)
+                return
+        except OSError as e:
+            self.name_label.configure(text=f"{path.name}\n{e.strerror}")
+            return
+        key = thumbnail_service.key(path, st.st_mtime, st.st_size, PREVIEW_BOX)
+        self._thumbnail = thumbnail_service.request(key, ui_events.wrap(self._on_thumbnail, path))
+
+    def clear(self):
+        if self._thumbnail is not None:
+            self._thumbnail.cancel()
+            self._thumbnail = None
+        self.current_file = None
+        self.image_label.configure(image=None, text="")
+        self.name_label.configure(text="")
+        self.document_view.close()
+        self.mode_switch.pack_forget()
+        self.document_view.pack_forget()
+
+    def _open_document(self, path: Path):
+        self.document_view.open(MappedFile(path), path.suffix)
+        self.mode_switch.set(self.document_view.mode)
+        self.mode_switch.pack(padx=10, pady=5)
+        self.document_view.pack(fill="both", expand=True, padx=5, pady=(0, 5))
+
+    def _on_mode_change(self, mode: str):
+        self.document_view.set_mode(mode)
+
+    def _on_path_change(self, _path: Path):
+        self.clear()
+
+    def _on_thumbnail(self, image, path: Path):
+        if path != self.current_file:
+            return
+        if image is None:
+            self.image_label.configure(text="No preview available")
+            return
+        self.image_label.configure(image=ctk.CTkImage(image, image, image.size))
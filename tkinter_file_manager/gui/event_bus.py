@@ -1,4 +1,133 @@
-from blinker import signal
+import queue
+import time
+import tkinter
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable
+
+from blinker import NamedSignal, signal
+
+from tkinter_file_manager.utils.logging import tracer
 
 signal_status_change = signal("status change")
-signal_path_change = signal("path change")
\ No newline at end of file
+signal_path_change = signal("path change")
+signal_selection_change = signal("selection change")
+# 开启计时时，每次导航结束后发出各阶段耗时的摘要文字
+signal_timing_change = signal("timing change")
+
+# 每个 after 周期最多占用主线程的时间（秒），剩下的事件留到下一个周期
+DISPATCH_BUDGET = 0.010
+# 派发周期（毫秒），约一帧
+DISPATCH_INTERVAL = 16
+
+
+class _Event:
+    __slots__ = ("target", "payload", "args", "key")
+
+    def __init__(self, target: Any, payload: Any, args: tuple, key: Any = None):
+        self.target = target
+        self.payload = payload
+        self.args = args
+        # 合并键：同一个键在 _latest 中只保留最后一个事件，None 表示不合并
+        self.key = key
+
+
+class EventBus:
+    """
+    线程安全的事件队列
+    任意线程都可以 post 信号或 call 回调，事件只进入队列；Tk 主线程每个 after 周期取出一批，
+    按发出的顺序执行。coalesce 中的信号只保留最后一次（例如连续的状态文字），
+    call_latest 投递的回调同样按回调本身合并（例如一批后台结果各自请求的重绘），
+    被后来者取代的事件直接丢弃，不会触发多余的重绘
+    """
+
+    def __init__(self, coalesce: Iterable[NamedSignal] = (signal_status_change,)):
+        self.coalesce = set(coalesce)
+        self._queue: "queue.SimpleQueue[_Event]" = queue.SimpleQueue()
+        # 已取出、还没执行的事件；每个合并键的最后一个事件记在 _latest 中
+        self._pending: Deque[_Event] = deque()
+        self._latest: Dict[Any, _Event] = {}
+        self._widget = None
+
+    def post(self, sig: NamedSignal, payload: Any = None):
+        """在主线程中以 sig.send(payload) 发出信号"""
+        self._queue.put(_Event(sig, payload, (), sig if sig in self.coalesce else None))
+
+    def call(self, callback: Callable, payload: Any = None, *args):
+        """在主线程中执行 callback(payload, *args)"""
+        self._queue.put(_Event(callback, payload, args))
+
+    def call_latest(self, callback: Callable, payload: Any = None, *args):
+        """同 call，但同一个 callback 在一次派发前多次投递时只执行最后一次"""
+        self._queue.put(_Event(callback, payload, args, callback))
+
+    def wrap(self, callback: Callable, *args) -> Callable:
+        """包装回调，使其可以在任意线程调用，实际执行放到主线程"""
+        return lambda payload: self.call(callback, payload, *args)
+
+    def empty(self) -> bool:
+        """没有等待派发的事件"""
+        return not self._pending and self._queue.empty()
+
+    def drain(self, budget: float = DISPATCH_BUDGET) -> int:
+        """在当前线程执行排队的事件，返回执行的事件数"""
+        self._collect()
+        started = time.perf_counter()
+        deadline = started + budget
+        handled = 0
+        pending = self._pending
+        while pending:
+            event = pending.popleft()
+            target = event.target
+            if target is None:
+                continue  # 已被同一信号的后续事件取代
+            if event.key is not None and self._latest.get(event.key) is event:
+                del self._latest[event.key]
+            if isinstance(target, NamedSignal):
+                target.send(event.payload)
+            else:
+                target(event.payload, *event.args)
+            handled += 1
+            if time.perf_counter() >= deadline:
+                break
+        if handled and tracer.enabled:
+            tracer.record("dispatch", "event", started, time.perf_counter() - started, {"handled": handled})
+        return handled
+
+    def attach(self, widget, interval: int = DISPATCH_INTERVAL):
+        """用 widget.after 周期性地在 Tk 主线程中 drain；已附加到仍然存在的窗口时无副作用"""
+        if self._widget is not None and _exists(self._widget):
+            return
+        self._widget = widget
+
+        def poll():
+            try:
+                self.drain()
+            finally:
+                if self._widget is widget and _exists(widget):
+                    widget.after(interval, poll)
+
+        widget.after(interval, poll)
+
+    def _collect(self):
+        """把队列中的事件移到 _pending，同时合并键相同的事件"""
+        while True:
+            try:
+                event = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if event.key is not None:
+                previous = self._latest.get(event.key)
+                if previous is not None:
+                    previous.target = None
+                self._latest[event.key] = event
+            self._pending.append(event)
+
+
+def _exists(widget) -> bool:
+    try:
+        return bool(widget.winfo_exists())
+    except tkinter.TclError:
+        return False
+
+
+ui_events = EventBus()
@@ -1,9 +1,13 @@
+import time
+
 import customtkinter as ctk
 
-from core.file_operations import get_dir_content
 from tkinter_file_manager.gui.components.file_list import FileListPanel
+from tkinter_file_manager.gui.components.file_tree import FileTreePanel
+from tkinter_file_manager.gui.components.preview_panel import PreviewPanel
 from pathlib import Path
-from tkinter_file_manager.gui.event_bus import signal_path_change
+from tkinter_file_manager.gui.event_bus import signal_path_change, signal_status_change, signal_timing_change, ui_events
+from tkinter_file_manager.utils.logging import tracer
 from tkinter_file_manager.gui.utils.ui_button import UIButton
 
 
@@ -16,11 +20,52 @@ class MainWindow(ctk.CTk):
         ctk.set_default_color_theme("blue")
 
         self.current_path = Path("D:/")
+        self.history = []
+        self.history_index = -1
+        self._moving_in_history = False
+        signal_path_change.connect(self._on_path_change)
         self._create_ui()
+        self.bind("<Control-d>", lambda _e: self.file_list.find_duplicates())
 
     def _navigate_to(self, path: Path):
+        signal_path_change.send(path)
+
+    def _on_path_change(self, path: Path):
+        """记录导航历史，前进/后退引起的跳转不产生新记录"""
+        if path != self.current_path:
+            self._clear_search()
         self.current_path = path
-        signal_path_change.send(self.current_path)
+        if self._moving_in_history:
+            return
+        del self.history[self.history_index + 1:]
+        if not self.history or self.history[-1] != path:
+            self.history.append(path)
+        self.history_index = len(self.history) - 1
+
+    def _move_in_history(self, step: int):
+        index = self.history_index + step
+        if not 0 <= index < len(self.history):
+            return
+        self.history_index = index
+        self._moving_in_history = True
+        try:
+            self._navigate_to(self.history[index])
+        finally:
+            self._moving_in_history = False
+
+    def _go_back(self):
+        self._move_in_history(-1)
+
+    def _go_forward(self):
+        self._move_in_history(1)
+
+    def _refresh(self):
+        # 目录缓存会先用一次 stat 校验目录 mtime，未变化时直接复用
+        self._moving_in_history = True
+        try:
+            self._navigate_to(self.current_path)
+        finally:
+            self._moving_in_history = False
 
     def _create_ui(self):
         self.main_panel = ctk.CTkFrame(self)
@@ -41,13 +86,51 @@ class MainWindow(ctk.CTk):
         address_bar.pack(fill="x",padx=5,pady=5)
         content = ctk.CTkFrame(address_bar)
         content.pack(fill="both", expand=True)
-        pre_button = UIButton(content, "left")
-        forward_button = UIButton(content, "right")
-        refresh_button = UIButton(content, "refresh")
+        pre_button = UIButton(content, "left", command=self._go_back)
+        forward_button = UIButton(content, "right", command=self._go_forward)
+        refresh_button = UIButton(content, "refresh", command=self._refresh)
         pre_button.grid(row=0, column=0)
         forward_button.grid(row=0, column=1)
         refresh_button.grid(row=0, column=2)
 
+        content.grid_columnconfigure(3, weight=1)
+        # 输入时即时过滤当前目录，回车时递归搜索
+        # 不使用 textvariable：CTkEntry 设置了 textvariable 时不显示占位文字
+        self.search_entry = ctk.CTkEntry(content, width=200, placeholder_text="Search...")
+        self.search_entry.grid(row=0, column=4, padx=5, sticky="e")
+        # 上一次用于过滤的文字；方向键、Shift 等不改变文字的按键不重新过滤
+        self._filter_text = ""
+        self.search_entry.bind("<KeyRelease>", self._on_key_release)
+        self.search_entry.bind("<Return>", lambda _e: self._on_search())
+        self.search_entry.bind("<Escape>", lambda _e: self._on_escape())
+
+    def _on_search(self):
+        text = self.search_entry.get().strip()
+        if not text:
+            self._refresh()
+            return
+        self.file_list.search(text)
+
+    def _on_key_release(self, event):
+        # 回车开始递归搜索，搜索结果不按输入的文字过滤；Esc 由 _on_escape 处理
+        if event.keysym in ("Return", "KP_Enter", "Escape"):
+            return
+        text = self.search_entry.get().strip()
+        if text == self._filter_text:
+            return
+        self._filter_text = text
+        self.file_list.filter(text)
+
+    def _on_escape(self):
+        self.file_list.cancel_search()
+        self._clear_search()
+
+    def _clear_search(self):
+        """清空输入框并取消过滤；输入框没有焦点时 CTkEntry 会重新显示占位文字"""
+        self.search_entry.delete(0, "end")
+        self._filter_text = ""
+        self.file_list.filter("")
+
     def _create_toolbar(self):
         pass
 
@@ -59,15 +142,42 @@ class MainWindow(ctk.CTk):
         self._create_preview_panel()
 
     def _create_status_bar(self):
-        pass
+        status_bar = ctk.CTkFrame(self.main_panel, height=25)
+        status_bar.pack(fill="x", padx=5, pady=(0, 5))
+        self.status_label = ctk.CTkLabel(status_bar, text="Ready", anchor="w")
+        self.status_label.pack(side="left", fill="x", expand=True, padx=5)
+        signal_status_change.connect(self._on_status_change)
+        if tracer.enabled:
+            # 计时开启时在右侧显示上一次导航各阶段的耗时，F12 导出 Chrome trace
+            self.timing_label = ctk.CTkLabel(status_bar, text="", anchor="e")
+            self.timing_label.pack(side="right", padx=5)
+            signal_timing_change.connect(self._on_timing_change)
+            self.bind("<F12>", lambda _e: self._export_trace())
+
+    def _on_status_change(self, message: str):
+        self.status_label.configure(text=message)
+
+    def _on_timing_change(self, summary: str):
+        self.timing_label.configure(text=summary)
+
+    def _export_trace(self):
+        path = Path.cwd() / f"tfm-trace-{time.strftime('%Y%m%d-%H%M%S')}.json"
+        try:
+            tracer.export_chrome(path)
+        except OSError as e:
+            ui_events.post(signal_status_change, f"Trace export error: {str(e)}")
+            return
+        ui_events.post(signal_status_change, f"Trace written to {path}")
 
     def _create_navigation_panel(self):
-        pass
+        self.file_tree = FileTreePanel(self.body_panel)
+        self.file_tree.pack(side="left", fill="y")
 
     def _create_content_panel(self):
         content_panel = ctk.CTkFrame(self.body_panel)
-        content_panel.pack(fill="both", expand=True)
+        content_panel.pack(side="left", fill="both", expand=True)
         self.file_list = FileListPanel(content_panel)
 
     def _create_preview_panel(self):
-        pass
+        self.preview_panel = PreviewPanel(self.body_panel)
+        self.preview_panel.pack(side="right", fill="y")
@@ -1,45 +1,72 @@
-import customtkinter as ctk
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Tuple, TYPE_CHECKING
 from tkinter_file_manager.gui.utils.icon_infos import EXTENSION_ICON_MAP, ICON_SIZES
-from PIL import Image
+from tkinter_file_manager.utils.logging import traced
+
+if TYPE_CHECKING:
+    import customtkinter as ctk
+    from PIL import Image
+
+# 解码后保留的最大尺寸，较小的尺寸都从它缩小，不再保留 512px 的原图
+_MASTER_SIZE = max(ICON_SIZES.values())
+
 
 class IconUtils:
+    """
+    按需加载图标
+    每个 PNG 只在第一次用到时解码一次，多个扩展名共用的图标文件共享同一份图像；
+    缩放后的 CTkImage 按 (文件名, 尺寸) 缓存。创建实例和导入本模块都不读取图片，也不导入 Pillow 和 customtkinter
+    """
+
     def __init__(self, icons_dir = "assets/icons"):
         self.icons_dir = Path(__file__).parent.parent.parent / icons_dir
-        self._cache: Dict[str, ctk.CTkImage] = {}
+        self._cache: Dict[Tuple[str, str], "ctk.CTkImage"] = {}
+        self._masters: Dict[str, "Image.Image"] = {}
+        self._paths: Dict[str, Path] = {}
 
-        self._preload_icons()
+    def _get_icon_image(self, icon_name: str, size_name ='medium') -> "ctk.CTkImage":
+        icon_path = self._get_icon_path(icon_name)
+        cache_key = (icon_path.name, size_name)
+        icon = self._cache.get(cache_key)
+        if icon is None:
+            import customtkinter as ctk
+            from PIL import Image
 
-    def _preload_icons(self):
-        for icon_name in EXTENSION_ICON_MAP.keys():
-            for size_name in ICON_SIZES.keys():
-                self._cache[icon_name] = self._get_icon_image(EXTENSION_ICON_MAP[icon_name], size_name)
-
-    def _get_icon_image(self, icon_name: str, size_name ='medium') -> ctk.CTkImage:
-        cache_key = f"{icon_name}_{size_name}"
-        if cache_key not in self._cache:
-            icon_path = self._get_icon_path(icon_name)
-            icon_image = Image.open(icon_path)
+            icon_image = self._get_master(icon_path).copy()
             icon_image.thumbnail(ICON_SIZES[size_name], Image.Resampling.LANCZOS)
-            self._cache[cache_key] = ctk.CTkImage(icon_image, icon_image, ICON_SIZES[size_name])
-        return self._cache[cache_key]
+            icon = self._cache[cache_key] = ctk.CTkImage(icon_image, icon_image, ICON_SIZES[size_name])
+        return icon
+
+    def _get_master(self, icon_path: Path) -> "Image.Image":
+        master = self._masters.get(icon_path.name)
+        if master is None:
+            from PIL import Image
+
+            with Image.open(icon_path) as source:
+                source.thumbnail(_MASTER_SIZE, Image.Resampling.LANCZOS)
+                master = self._masters[icon_path.name] = source.copy()
+        return master
 
     def _get_icon_path(self, icon_name: str):
-        icon_path = self.icons_dir / f"{icon_name}.png"
+        icon_path = self._paths.get(icon_name)
+        if icon_path is None:
+            icon_path = self.icons_dir / f"{icon_name}.png"
 
-        if not icon_path.exists():
-            icon_path = self.icons_dir / f"file.png"
+            if not icon_path.exists():
+                icon_path = self.icons_dir / f"file.png"
 
+            self._paths[icon_name] = icon_path
         return icon_path
 
+    @traced("icon")
     def get_icon_by_ext(self, ext: str, size_name ='small'):
         ext = ext.lower()
         icon_name = EXTENSION_ICON_MAP.get(ext, 'file')
         return self._get_icon_image(icon_name, size_name)
 
+    @traced("icon")
     def get_icon_by_name(self, icon_name: str, size_name ='small'):
         icon_name = icon_name.lower()
         return self._get_icon_image(icon_name, size_name)
 
-common_icons = IconUtils()
\ No newline at end of file
+common_icons = IconUtils()
@@ -2,7 +2,7 @@ import customtkinter as ctk
 from tkinter_file_manager.gui.utils.icon_utils import common_icons
 
 class UIButton(ctk.CTkButton):
-    def __init__(self, parent, icon_name: str):
+    def __init__(self, parent, icon_name: str, command=None):
         icon = common_icons.get_icon_by_name(icon_name)
         super().__init__(
             parent,
@@ -12,5 +12,6 @@ class UIButton(ctk.CTkButton):
             corner_radius=0,
             text="",
             width=30,
-            image=icon
+            image=icon,
+            command=command
         )
\ No newline at end of file
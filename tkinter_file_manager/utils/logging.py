@@ -0,0 +1,168 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, TextIO, Union
+
+# 环形缓冲区能保存的 span 数，写满后丢弃最早的
+TRACE_CAPACITY = 65536
+# 设置这个环境变量（任意非空值）时启动即开启计时
+TRACE_ENV = "TFM_TRACE"
+
+
+class Span:
+    """一段计时：名称、分类、开始时间和持续时间（秒，perf_counter 时钟）、所在线程"""
+
+    __slots__ = ("name", "category", "start", "duration", "thread_id", "args")
+
+    def __init__(self, name: str, category: str, start: float, duration: float,
+                 thread_id: int, args: Optional[Dict[str, Any]]):
+        self.name = name
+        self.category = category
+        self.start = start
+        self.duration = duration
+        self.thread_id = thread_id
+        self.args = args
+
+    def __repr__(self) -> str:
+        return f"Span({self.name!r}, {self.duration * 1000:.3f} ms)"
+
+
+class _ActiveSpan:
+    __slots__ = ("tracer", "name", "category", "args", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, args: Optional[Dict[str, Any]]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *_exc):
+        end = time.perf_counter()
+        self.tracer.record(self.name, self.category, self.start, end - self.start, self.args)
+        return False
+
+
+class _NullSpan:
+    """关闭计时时 span() 返回的共享对象，进入和退出都不做任何事"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """
+    轻量计时
+    span() 是上下文管理器，traced() 是装饰器；关闭时 span() 直接返回共享的空对象，
+    traced() 包装的函数只多一次属性判断。计时结果放在固定容量的环形缓冲区中，
+    可以导出为 Chrome trace（chrome://tracing、Perfetto）格式的 JSON
+    """
+
+    def __init__(self, capacity: int = TRACE_CAPACITY, enabled: bool = False):
+        self.enabled = enabled
+        self._spans: Deque[Span] = deque(maxlen=capacity)
+        self._marks: Dict[str, float] = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def span(self, name: str, category: str = "app", **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _ActiveSpan(self, name, category, args or None)
+
+    def traced(self, name: Optional[str] = None, category: str = "app") -> Callable:
+        """装饰器：每次调用记为一个 span，name 默认为函数的限定名"""
+
+        def decorator(func: Callable) -> Callable:
+            span_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(span_name, category, start, time.perf_counter() - start)
+
+            return wrapper
+
+        return decorator
+
+    def record(self, name: str, category: str, start: float, duration: float,
+               args: Optional[Dict[str, Any]] = None):
+        # deque.append 是原子操作，任意线程都可以直接写入
+        self._spans.append(Span(name, category, start, duration, threading.get_ident(), args))
+
+    def mark(self, label: str):
+        """记录一个时间点（如一次导航开始），summary 可以只统计它之后的 span"""
+        self._marks[label] = time.perf_counter()
+
+    def spans(self, since: Optional[str] = None) -> List[Span]:
+        spans = list(self._spans)
+        if since is not None:
+            start = self._marks.get(since)
+            if start is None:
+                return []
+            spans = [span for span in spans if span.start >= start]
+        return spans
+
+    def summary(self, since: Optional[str] = None) -> Dict[str, float]:
+        """按名称汇总的总耗时（秒），按耗时从大到小排列"""
+        totals: Dict[str, float] = {}
+        for span in self.spans(since):
+            totals[span.name] = totals.get(span.name, 0.0) + span.duration
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+    def clear(self):
+        self._spans.clear()
+        self._marks.clear()
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Chrome trace 格式：每个 span 是一个完整事件（ph=X），时间单位为微秒"""
+        pid = os.getpid()
+        events = []
+        for span in self.spans():
+            event = {"name": span.name, "cat": span.category, "ph": "X", "pid": pid, "tid": span.thread_id,
+                     "ts": span.start * 1e6, "dur": span.duration * 1e6}
+            if span.args:
+                event["args"] = {key: str(value) for key, value in span.args.items()}
+            events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome(self, target: Union[str, os.PathLike, TextIO]):
+        """把缓冲区中的 span 写成 Chrome trace JSON；target 可以是路径或已打开的文本文件"""
+        if hasattr(target, "write"):
+            json.dump(self.chrome_trace(), target)
+            return
+        with open(target, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+
+
+def format_summary(summary: Dict[str, float], limit: int = 5) -> str:
+    """状态栏显示用：'scan 12.3 ms · render 4.1 ms · …'"""
+    return " · ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in list(summary.items())[:limit])
+
+
+tracer = Tracer(enabled=bool(os.environ.get(TRACE_ENV)))
+span = tracer.span
+traced = tracer.traced
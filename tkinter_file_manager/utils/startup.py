@@ -0,0 +1,114 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+# 启动时间预算（秒），由 tests/test_startup.py 检查
+IMPORT_BUDGET = 0.5
+FIRST_PAINT_BUDGET = 2.0
+
+ENTRY_MODULE = "tkinter_file_manager.main"
+
+# 第一帧之前不应导入的模块：它们只在搜索、查重、建立索引或启动进程池时才需要
+DEFERRED_MODULES = (
+    "sqlite3",
+    "multiprocessing",
+    "tkinter_file_manager.core.search",
+    "tkinter_file_manager.core.index",
+    "tkinter_file_manager.core.duplicates",
+)
+
+# 在子进程中创建主窗口，处理完第一轮绘制后输出各阶段耗时
+_FIRST_PAINT_SCRIPT = """
+import json, time
+started = time.perf_counter()
+from tkinter_file_manager.gui.main_window import MainWindow
+imported = time.perf_counter()
+app = MainWindow()
+created = time.perf_counter()
+app.update()
+painted = time.perf_counter()
+print(json.dumps({"import": imported - started, "create": created - imported,
+                  "first_paint": painted - started}))
+app.destroy()
+"""
+
+
+class ImportTiming(NamedTuple):
+    """-X importtime 的一行：模块自身耗时和包含子模块的累计耗时（秒）"""
+    module: str
+    self_time: float
+    cumulative: float
+    depth: int
+
+
+def import_profile(module: str = ENTRY_MODULE) -> List[ImportTiming]:
+    """在新的解释器中以 -X importtime 导入 module，返回每个模块的耗时，顺序与输出一致"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        timings.append(ImportTiming(name.strip(), int(self_us) / 1e6, int(cumulative_us) / 1e6, depth))
+    return timings
+
+
+def import_time(module: str = ENTRY_MODULE) -> float:
+    """导入 module 的总耗时（秒），即它在 -X importtime 中的累计时间"""
+    for timing in import_profile(module):
+        if timing.module == module:
+            return timing.cumulative
+    return 0.0
+
+
+def loaded_modules(module: str = ENTRY_MODULE) -> List[str]:
+    """在新的解释器中导入 module 之后 sys.modules 里的全部模块"""
+    result = subprocess.run(
+        [sys.executable, "-c", f"import sys, json, {module}; print(json.dumps(sorted(sys.modules)))"],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout)
+
+
+@contextmanager
+def display() -> Iterator[Optional[Dict[str, str]]]:
+    """
+    提供可以创建窗口的环境变量
+    已有 DISPLAY 时直接使用；否则在可用时启动一个 Xvfb，结束时关闭；两者都没有时给出 None
+    """
+    if os.environ.get("DISPLAY") or sys.platform in ("win32", "darwin"):
+        yield dict(os.environ)
+        return
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        yield None
+        return
+
+    number = 90 + os.getpid() % 100
+    server = subprocess.Popen([xvfb, f":{number}", "-screen", "0", "1280x800x24", "-nolisten", "tcp"],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        socket = f"/tmp/.X11-unix/X{number}"
+        deadline = time.monotonic() + 5
+        while not os.path.exists(socket) and server.poll() is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+        yield dict(os.environ, DISPLAY=f":{number}") if os.path.exists(socket) else None
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def first_paint(env: Dict[str, str]) -> Dict[str, float]:
+    """在新进程中启动主窗口，返回导入、创建和到第一帧绘制完成的耗时（秒）"""
+    result = subprocess.run([sys.executable, "-c", _FIRST_PAINT_SCRIPT],
+                            capture_output=True, text=True, check=True, env=env)
+    return json.loads(result.stdout.strip().splitlines()[-1])